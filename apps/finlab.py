@@ -0,0 +1,187 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from argparse import REMAINDER, ArgumentParser
+import importlib
+from pathlib import Path
+import runpy
+import sys
+import tomllib
+
+# `finlab {train,eval,baselines,data} ...`. Only the standard library is
+# imported up front and each subcommand imports what it needs, so `data`
+# and `baselines` never load torch or stable-baselines3, and neither does
+# `eval` on an exported `.npz` policy.
+
+APPS = {
+    'exec': 'apps.sb3_ppo_exec',
+    'alloc': 'apps.sb3_sac_alloc',
+}
+CONFIGS = {
+    'exec': 'experiments/exec_reward_ablation.toml',
+    'alloc': 'experiments/alloc_risk_reward.toml',
+}
+MODELS = {
+    'exec': 'exec_ppo_final.zip',
+    'alloc': 'alloc_sac_final.zip',
+}
+# `finlab data <name> ...` runs the module's own command line
+DATA = {
+    'store': 'utils.price_store',
+    'paths': 'envs.scenarios',
+    'volume': 'utils.volume_profile',
+    'export': 'agents.numpy_policy',
+}
+
+
+def _config(args):
+    with Path(args.config or CONFIGS[args.task]).open('rb') as f:
+        cfg = tomllib.load(f)
+    if getattr(args, 'models_dir', None):
+        cfg['models_dir'] = str(args.models_dir)
+    return cfg
+
+
+def _print_table(rows):
+    cols = list(rows[0])
+    print('  '.join(f'{c:>12s}' for c in cols))
+    for row in rows:
+        print(
+            '  '.join(
+                f'{v:>12.4g}' if isinstance(v, float) else f'{v!s:>12s}'
+                for v in row.values()
+            )
+        )
+
+
+def train(args):
+    cfg = _config(args)
+    if args.timesteps:
+        cfg['train']['timesteps'] = args.timesteps
+    app = importlib.import_module(APPS[args.task])
+    return app.main(cfg)
+
+
+def evaluate(args):
+    cfg = _config(args)
+    app = importlib.import_module(APPS[args.task])
+    path = (
+        args.model or Path(cfg.get('models_dir', 'models')) / MODELS[args.task]
+    )
+    n_workers = args.n_workers
+    if Path(path).suffix == '.npz':
+        from agents.numpy_policy import NumpyPolicy
+
+        # the NumPy runtime cannot be re-saved for worker processes
+        model, n_workers = NumpyPolicy(path), 1
+    else:
+        import stable_baselines3 as sb3
+
+        algo = 'PPO' if args.task == 'exec' else cfg['agent']['algo']
+        model = getattr(sb3, algo).load(path, device='cpu')
+    if args.task == 'exec':
+        stats = app.evaluate(
+            model, cfg, args.n_episodes, n_workers, args.record
+        )
+    else:
+        env = app.build_env(cfg)
+        stats = app.evaluate(
+            model, cfg, env, args.n_episodes, n_workers, args.record
+        )
+    print(stats)
+    return stats
+
+
+def baselines(args):
+    cfg = _config(args)
+    app = importlib.import_module(APPS[args.task])
+    if args.task == 'exec':
+        rows = app.baselines(
+            cfg,
+            lam=args.lam,
+            n_paths=args.n_paths,
+            volume_ticker=args.volume_ticker,
+            volume_root=args.volume_root,
+        )
+        _print_table(rows)
+        return rows
+    _, _, returns, _ = app.build_env(cfg)
+    table = app.baselines(cfg, returns)
+    print(table.to_string(index=False))
+    return table
+
+
+def data(args):
+    if args.name == 'fetch':
+        from utils.data import load_frame_yf
+
+        frame = load_frame_yf(_config(args)['data'])
+        print(f'{len(frame)} rows x {frame.shape[1]} tickers cached')
+        return frame
+    sys.argv = [f'finlab data {args.name}', *args.args]
+    runpy.run_module(DATA[args.name], run_name='__main__', alter_sys=True)
+
+
+def parser():
+    top = ArgumentParser(prog='finlab')
+    sub = top.add_subparsers(dest='command', required=True)
+
+    def task_parser(name, fn, help):
+        p = sub.add_parser(name, help=help)
+        p.add_argument('task', choices=sorted(APPS))
+        p.add_argument('--config', type=Path)
+        p.set_defaults(fn=fn)
+        return p
+
+    p = task_parser('train', train, 'train and evaluate an agent')
+    p.add_argument('--timesteps', type=int)
+    p.add_argument('--models-dir', type=Path)
+
+    p = task_parser('eval', evaluate, 'evaluate a saved model')
+    p.add_argument(
+        '--model', type=Path, help='SB3 zip or exported .npz policy'
+    )
+    p.add_argument('--models-dir', type=Path)
+    p.add_argument('--n-episodes', type=int)
+    p.add_argument('--n-workers', type=int)
+    p.add_argument(
+        '--record', type=Path, help='directory for per-chunk trajectories'
+    )
+
+    p = task_parser('baselines', baselines, 'score the config baselines')
+    p.add_argument('--lam', type=float, default=1e-6, help='AC risk aversion')
+    p.add_argument('--n-paths', type=int, default=10_000)
+    p.add_argument('--volume-ticker', help='VWAP profile from data/volume')
+    p.add_argument('--volume-root', type=Path, default=Path('data/volume'))
+
+    p = sub.add_parser('data', help='build caches, stores and path banks')
+    p.add_argument('name', choices=['fetch', *DATA])
+    p.add_argument('--config', type=Path, help='with fetch')
+    p.add_argument('args', nargs=REMAINDER)
+    p.set_defaults(fn=data, task='alloc')
+    return top
+
+
+def main(argv=None):
+    args = parser().parse_args(argv)
+    return args.fn(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -18,36 +18,221 @@
 # ==============================================================================
 
 from argparse import ArgumentParser
+from functools import partial
 from pathlib import Path
+import warnings
 
 import tomllib
-from stable_baselines3 import PPO
+
+import numpy as np
 
 from envs.exec_env import ExecutionEnv
-from eval.metrics import evaluate_exec
+from envs.lob_env import LOBExecutionEnv
+from eval.runner import episode_seeds, evaluate_exec_parallel
+from utils.profiling import configure_from_cfg
 
+# stable-baselines3 (and torch) are imported where training needs them, so
+# `env_fn` and `evaluate` stay cheap to import
+
+
+ENVS = {'linear': ExecutionEnv, 'lob': LOBExecutionEnv}
+
+
+def env_config(cfg):
+    """The `[env]` table with the top-level `[reward]` folded in.
+
+    The envs read their reward from `reward` in their own config; a
+    `reward` set inside `[env]` wins.
+
+    """
+
+    if 'reward' not in cfg:
+        return cfg['env']
+    return {'reward': cfg['reward'], **cfg['env']}
+
+
+def make_train_env(env_cfg, n_envs, vec_env='batched', seed=123):
+    """Training env; `batched` steps all lanes of a `VecExecutionEnv`.
+
+    `dummy` and `subproc` wrap one env per lane. Subprocess workers get
+    the config, and a `path_bank` is re-opened by path in each of them.
+
+    """
+
+    from stable_baselines3.common.env_util import make_vec_env
+    from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+
+    from envs.vec_exec_env import VecExecutionEnv
+
+    env_type = env_cfg.get('type', 'linear')
+    if vec_env == 'batched' and env_type == 'linear':
+        return VecExecutionEnv({**env_cfg, 'seed': seed}, n_envs)
+    return make_vec_env(
+        ENVS[env_type],
+        n_envs,
+        seed=seed,
+        env_kwargs={'config': env_cfg},
+        vec_env_cls=SubprocVecEnv if vec_env == 'subproc' else DummyVecEnv,
+    )
+
+
+def env_fn(cfg):
+    """Picklable factory of single evaluation envs."""
+
+    env_cfg = env_config(cfg)
+    return partial(ENVS[env_cfg.get('type', 'linear')], env_cfg)
+
+
+def twap_shortfalls(cfg, seeds):
+    """IS of TWAP on the mid path of each seeded evaluation episode."""
+
+    from baselines.twap_vwap import twap_schedule
+    from eval.schedule_cost import simulate_schedule_cost
 
-def main(cfg):
     env = ExecutionEnv(cfg['env'])
+    paths = []
+    for s in seeds:
+        env.reset(seed=int(s))
+        paths.append(env.path[: env.steps + 1])
+    q = twap_schedule(env.steps, env.init_inventory)
+    return simulate_schedule_cost(q, cfg['env'], paths=np.stack(paths))[0]
+
+
+def evaluate(model, cfg, n_episodes=None, n_workers=None, record=None):
+    """Eval stats with a paired test against TWAP on the linear env.
+
+    `record` is a directory to write the episodes' trajectories to.
+
+    """
+
+    n_episodes = n_episodes or cfg['eval']['n_episodes']
+    seed = cfg.get('seed', 123)
+    baseline = None
+    if cfg['env'].get('type', 'linear') == 'linear':
+        baseline = twap_shortfalls(cfg, episode_seeds(seed, n_episodes))
+    return evaluate_exec_parallel(
+        model,
+        env_fn(cfg),
+        n_episodes=n_episodes,
+        baseline=baseline,
+        seed=seed,
+        n_workers=n_workers or cfg['eval'].get('n_workers', 1),
+        record=record,
+    )
+
+
+def baselines(
+    cfg, lam=1e-6, n_paths=10_000, volume_ticker=None, volume_root=None
+):
+    """IS of the `[eval] baselines` schedules on the config's env.
+
+    Rows hold the closed-form mean and std under GBM mids and the Monte
+    Carlo ones over `n_paths` (or the config's path bank). VWAP needs an
+    intraday profile from `VolumeProfileIndex` for `volume_ticker`; it is
+    skipped with a warning without one. Unknown names raise.
+
+    """
+
+    from baselines.almgren_chriss import almgren_chriss_exact, env_ac_params
+    from baselines.twap_vwap import twap_schedule, vwap_schedule
+    from eval.schedule_cost import schedule_cost, simulate_schedule_cost
+
+    env_cfg = cfg['env']
+    if env_cfg.get('type', 'linear') != 'linear':
+        raise ValueError('schedule baselines need the linear env')
+    p = env_ac_params(env_cfg)
+    schedules = {}
+    for name in cfg['eval'].get('baselines', ()):
+        if name == 'TWAP':
+            schedules[name] = twap_schedule(p['T'], p['q0'])
+        elif name == 'AC':
+            schedules[name] = almgren_chriss_exact(
+                p['T'],
+                p['q0'],
+                lam,
+                p['sigma'],
+                p['eta'],
+                p['gamma'],
+                p['tau'],
+            )
+        elif name == 'VWAP':
+            if volume_ticker is None:
+                warnings.warn(
+                    'skipping VWAP: it needs a volume_ticker', stacklevel=2
+                )
+                continue
+            from utils.volume_profile import VolumeProfileIndex
+
+            index = VolumeProfileIndex(volume_root or 'data/volume', p['T'])
+            profile = index.profile(volume_ticker)
+            schedules[name] = vwap_schedule(profile, p['q0'])
+        else:
+            raise ValueError(f'unknown execution baseline {name!r}')
+    if not schedules:
+        raise ValueError('no execution baselines to cost')
+    names = list(schedules)
+    q = np.stack([schedules[n] for n in names])
+    exact = schedule_cost(q, env_cfg)
+    sim = simulate_schedule_cost(
+        q, env_cfg, n_paths=n_paths, seed=cfg.get('seed', 123)
+    )
+    return [
+        {
+            'baseline': name,
+            'IS_mean': float(exact['E'][i]),
+            'IS_std': float(np.sqrt(exact['V'][i])),
+            'IS_mean_mc': float(sim[i].mean()),
+            'IS_std_mc': float(sim[i].std()),
+        }
+        for i, name in enumerate(names)
+    ]
+
+
+def main(cfg):
+    from stable_baselines3 import PPO
+
+    from agents.callbacks import ProfileCallback, ThroughputCallback
+    from envs.wrappers import ProfiledVecEnv
+
+    profiler = configure_from_cfg(cfg)
+    n_envs = cfg['train'].get('n_envs', 1)
+    seed = cfg.get('seed', 123)
+    train_env = make_train_env(
+        env_config(cfg),
+        n_envs,
+        cfg['train'].get('vec_env', 'batched'),
+        seed,
+    )
+    callbacks = [ThroughputCallback()]
+    if profiler is not None:
+        train_env = ProfiledVecEnv(train_env)
+        callbacks.append(ProfileCallback('exec'))
     model = PPO(
         'MlpPolicy',
-        env,
+        train_env,
         **{k: v for k, v in cfg['agent'].items() if k != 'policy_kwargs'},
         policy_kwargs=cfg['agent'].get('policy_kwargs', {}),
+        seed=seed,
         verbose=0,
     )
-    model.learn(total_timesteps=cfg['train']['timesteps'])
-    stats = evaluate_exec(model, env, n_episodes=cfg['eval']['n_episodes'])
+    model.learn(total_timesteps=cfg['train']['timesteps'], callback=callbacks)
+    train_env.close()
+    stats = evaluate(model, cfg)
 
     model_dir = Path(cfg.get('models_dir', 'models'))
     model_path = model_dir / 'exec_ppo_final.zip'
     model.save(model_path)
+    stats.update(callbacks[0].summary())
+    if profiler is not None:
+        profiler.export('exec')
     print(stats)
+    return stats
 
 
 if __name__ == '__main__':
     parser = ArgumentParser()
     parser.add_argument('--config', type=Path, required=True)
     args = parser.parse_args()
-    cfg = tomllib.load(args.config.open('rb'))
+    with args.config.open('rb') as f:
+        cfg = tomllib.load(f)
     main(cfg)
@@ -18,56 +18,251 @@
 # ==============================================================================
 
 from argparse import ArgumentParser
+from functools import partial
+import hashlib
+import json
 from pathlib import Path
 import tomllib
 
-from stable_baselines3 import SAC, PPO
+import numpy as np
 
+from baselines.bh_mom_rev import equal_weight
 from envs.alloc_env import AllocationEnv
-from eval.metrics import evaluate_alloc
-from utils.data import load_prices_yf
+from envs.large_alloc_env import LargeUniverseAllocationEnv
+from eval.backtest import sweep
+from eval.runner import episode_seeds, evaluate_alloc_parallel
+from utils.data import load_frame_yf, load_prices_yf
+from utils.fetch import FetchError
+from utils.features import FeatureStore
+from utils.price_store import PriceStore, write_price_store
+from utils.profiling import configure_from_cfg
 
+# stable-baselines3 (and torch) are imported where training needs them, so
+# `build_env`, `evaluate` and `baselines` stay cheap to import
 
-def process(cfg):
-    prices = load_prices_yf(cfg['data'])
-    print(prices)
 
-    env = AllocationEnv(
+def load_prices(cfg):
+    data = cfg['data']
+    if 'store' in data:
+        return PriceStore(data['store'], data.get('tickers'))
+    if cfg['train'].get('vec_env') != 'subproc':
+        return load_prices_yf(data)
+    # subprocess workers map a store by path instead of unpickling prices
+    key = json.dumps([data['tickers'], data['start'], data['end']])
+    digest = hashlib.md5(key.encode()).hexdigest()
+    path = Path('data/store') / f'yf_{digest}'
+    if not (path / 'meta.json').exists():
+        write_price_store(path, load_frame_yf(data), source='yahoo')
+    return PriceStore(path)
+
+
+def make_train_env(cfg, Env, prices, env_kwargs):
+    """Training env from `[train] n_envs` and `vec_env`.
+
+    `batched` steps a `VecAllocationEnv` (plain observations only);
+    `dummy` and `subproc` wrap one seeded env per lane.
+
+    """
+
+    from stable_baselines3.common.env_util import make_vec_env
+    from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+
+    from envs.vec_alloc_env import VecAllocationEnv
+
+    n_envs = cfg['train'].get('n_envs', 1)
+    vec_env = cfg['train'].get('vec_env', 'dummy')
+    episode_len = cfg['env'].get('episode_len')
+    if vec_env == 'batched':
+        if Env is not AllocationEnv or env_kwargs['features'] is not None:
+            raise ValueError('batched training needs plain observations')
+        kwargs = {k: v for k, v in env_kwargs.items() if k != 'features'}
+        return VecAllocationEnv(
+            prices,
+            n_envs,
+            episode_len=episode_len,
+            seed=cfg.get('seed'),
+            **kwargs,
+        )
+    return make_vec_env(
+        Env,
+        n_envs,
+        seed=cfg.get('seed'),
+        env_kwargs={
+            'prices': prices,
+            'random_start': cfg['env'].get('random_start', False),
+            'episode_len': episode_len,
+            **env_kwargs,
+        },
+        vec_env_cls=SubprocVecEnv if vec_env == 'subproc' else DummyVecEnv,
+    )
+
+
+def build_env(cfg):
+    """`(Env, prices, returns, env_kwargs)` for an allocation config."""
+
+    prices = load_prices(cfg)
+    if isinstance(prices, PriceStore):
+        returns = prices.returns
+    else:
+        returns = np.log(prices[1:] / prices[:-1])
+
+    large = cfg['env'].get('large_universe', False)
+    features = None
+    if 'features' in cfg:
+        # the large-universe env never reads the N x N covariance rows
+        params = {'cov': not large, **cfg['features']}
+        features = FeatureStore.load_or_build(returns, **params)
+    env_kwargs = {
+        'features': features,
+        'window': cfg['env']['window'],
+        'rebalance_every': cfg['env']['rebalance_every'],
+        'cost_bps': cfg['data']['cost_bps'],
+        'reward_cfg': cfg['reward'],
+    }
+    Env = AllocationEnv
+    if large:
+        Env = LargeUniverseAllocationEnv
+        env_kwargs['n_factors'] = cfg['env'].get('n_factors', 8)
+        env_kwargs['shrinkage'] = cfg['env'].get('shrinkage', 0.1)
+    return Env, prices, returns, env_kwargs
+
+
+def ew_rewards(env_fn, seeds):
+    """Rewards of equal weights on each seeded evaluation episode."""
+
+    out = []
+    for s in seeds:
+        env = env_fn()
+        env.reset(seed=int(s))
+        w = equal_weight(env.action_space.shape[0])
+        rewards, done = [], False
+        while not done:
+            _, r, terminated, truncated, _ = env.step(w.copy())
+            rewards.append(float(r))
+            done = terminated or truncated
+        out.append(np.asarray(rewards))
+    return out
+
+
+def eval_env_fn(cfg, env, n_episodes=None):
+    """`(env_fn, n_episodes)` of the evaluation episodes.
+
+    With `[eval] episode_len` each seeded episode starts at a random date.
+    Without it every episode would replay the whole history from `window`,
+    so a single one is run.
+
+    """
+
+    Env, prices, _, env_kwargs = env
+    episode_len = cfg['eval'].get('episode_len')
+    if episode_len is None:
+        return partial(Env, prices, **env_kwargs), 1
+    fn = partial(
+        Env,
         prices,
+        random_start=True,
+        episode_len=episode_len,
+        **env_kwargs,
+    )
+    return fn, n_episodes or cfg['eval']['n_episodes']
+
+
+def evaluate(model, cfg, env, n_episodes=None, n_workers=None, record=None):
+    """Eval stats with a paired test against equal weights.
+
+    `record` is a directory to write the episodes' trajectories to.
+
+    """
+
+    fn, n_episodes = eval_env_fn(cfg, env, n_episodes)
+    seed = cfg.get('seed', 123)
+    stats = evaluate_alloc_parallel(
+        model,
+        fn,
+        n_episodes=n_episodes,
+        baseline=ew_rewards(fn, episode_seeds(seed, n_episodes)),
+        seed=seed,
+        n_workers=n_workers or cfg['eval'].get('n_workers', 1),
+        record=record,
+    )
+    stats['n_episodes'] = n_episodes
+    return stats
+
+
+def baselines(cfg, returns):
+    """Backtest the `[eval] baselines` on the config's returns."""
+
+    return sweep(
+        returns,
+        cfg['eval'].get('baselines', ()),
+        cost_bps=cfg['data']['cost_bps'],
         window=cfg['env']['window'],
         rebalance_every=cfg['env']['rebalance_every'],
-        cost_bps=cfg['data']['cost_bps'],
-        reward_cfg=cfg['reward'],
     )
+
+
+def process(cfg):
+    from stable_baselines3 import PPO, SAC
+
+    from agents.callbacks import ProfileCallback, ThroughputCallback
+    from agents.custom_policy import resolve_policy_kwargs
+    from envs.wrappers import ProfiledVecEnv
+
+    profiler = configure_from_cfg(cfg)
+    env = build_env(cfg)
+    Env, prices, returns, env_kwargs = env
+    print(prices)
+
+    train_env = make_train_env(cfg, Env, prices, env_kwargs)
+    callbacks = [ThroughputCallback()]
+    if profiler is not None:
+        train_env = ProfiledVecEnv(train_env)
+        callbacks.append(ProfileCallback('alloc'))
     algo = cfg['agent']['algo']
     Algo = SAC if algo == 'SAC' else PPO
+    algo_kwargs = {}
+    if Algo is SAC:
+        algo_kwargs['tau'] = cfg['agent'].get('tau', 0.005)
     model = Algo(
         'MlpPolicy',
-        env,
+        train_env,
         verbose=0,
         learning_rate=cfg['agent']['learning_rate'],
         gamma=cfg['agent']['gamma'],
+        policy_kwargs=resolve_policy_kwargs(
+            cfg['agent'].get('policy_kwargs', {}), cfg['env']['window']
+        ),
+        seed=cfg.get('seed'),
+        **algo_kwargs,
     )
-    model.learn(total_timesteps=cfg['train']['timesteps'])
-    stats = evaluate_alloc(model, env, n_episodes=cfg['eval']['n_episodes'])
+    model.learn(total_timesteps=cfg['train']['timesteps'], callback=callbacks)
+    train_env.close()
+    stats = evaluate(model, cfg, env)
+    print(baselines(cfg, returns).to_string(index=False))
 
     model_dir = Path(cfg.get('models_dir', 'models'))
     model_path = model_dir / 'alloc_sac_final.zip'
     model.save(model_path)
+    stats.update(callbacks[0].summary())
+    if profiler is not None:
+        profiler.export('alloc')
     return stats
 
 
 def main(cfg):
     try:
         stats = process(cfg)
-        print(stats)
-    except RuntimeError:
-        return 0
+    except FetchError as e:
+        # tickers that did arrive stay cached; a rerun only retries these
+        raise SystemExit(f'error: {e}') from e
+    print(stats)
+    return stats
 
 
 if __name__ == '__main__':
     parser = ArgumentParser()
     parser.add_argument('--config', type=Path, required=True)
     args = parser.parse_args()
-    cfg = tomllib.load(args.config.open('rb'))
+    with args.config.open('rb') as f:
+        cfg = tomllib.load(f)
     main(cfg)
@@ -0,0 +1,188 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import copy
+import hashlib
+import importlib
+import itertools
+import json
+import multiprocessing as mp
+import os
+from pathlib import Path
+import tomllib
+import traceback
+
+import numpy as np
+import pandas as pd
+
+APPS = {
+    'exec': ('apps.sb3_ppo_exec', 'main'),
+    'alloc': ('apps.sb3_sac_alloc', 'process'),
+}
+
+
+def set_key(cfg, dotted, value):
+    *path, last = dotted.split('.')
+    node = cfg
+    for k in path:
+        node = node.setdefault(k, {})
+    node[last] = value
+
+
+def _sample(rng, axis):
+    if isinstance(axis, dict):
+        lo, hi = axis['low'], axis['high']
+        if axis.get('log', False):
+            return float(np.exp(rng.uniform(np.log(lo), np.log(hi))))
+        if isinstance(lo, int) and isinstance(hi, int):
+            return int(rng.integers(lo, hi + 1))
+        return float(rng.uniform(lo, hi))
+    return axis[int(rng.integers(len(axis)))]
+
+
+def expand(sweep):
+    """Axis settings `{dotted.key: value}` for every run of a sweep.
+
+    `mode = "grid"` takes the product of list-valued axes; `"random"` draws
+    `n_samples` points, picking from lists or from `{low, high, log}`
+    ranges.
+
+    """
+
+    axes = sweep['axes']
+    if sweep.get('mode', 'grid') == 'grid':
+        keys = list(axes)
+        return [
+            dict(zip(keys, values))
+            for values in itertools.product(*(axes[k] for k in keys))
+        ]
+    rng = np.random.default_rng(sweep.get('seed', 0))
+    return [
+        {k: _sample(rng, v) for k, v in axes.items()}
+        for _ in range(sweep['n_samples'])
+    ]
+
+
+def config_hash(cfg):
+    blob = json.dumps(cfg, sort_keys=True, default=str).encode()
+    return hashlib.md5(blob).hexdigest()[:16]
+
+
+def _write_json(path, obj):
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(obj, indent=2, sort_keys=True, default=str))
+    os.replace(tmp, path)
+
+
+def _init_worker(slots):
+    # each worker owns one slot of cores for its whole life
+    cores = slots.get()
+    if cores and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+    import torch
+
+    torch.set_num_threads(max(len(cores), 1))
+
+
+def run_one(app, cfg, run_dir):
+    """Run one resolved config and store `result.json` in `run_dir`."""
+
+    run_dir = Path(run_dir)
+    module, fn = APPS[app]
+    cfg = copy.deepcopy(cfg)
+    cfg['models_dir'] = str(run_dir)
+    try:
+        stats = getattr(importlib.import_module(module), fn)(cfg)
+    except Exception:
+        (run_dir / 'error.txt').write_text(traceback.format_exc())
+        raise
+    _write_json(run_dir / 'result.json', stats)
+    return stats
+
+
+def main(sweep, results_dir=None, name='sweep'):
+    with Path(sweep['base']).open('rb') as f:
+        base = tomllib.load(f)
+    app = sweep['app']
+    results_dir = Path(results_dir or sweep.get('results_dir', 'results'))
+    cpus = sweep.get('cpus_per_run', 1)
+    budget = sweep.get('cpu_budget', os.cpu_count() or 1)
+    n_workers = max(budget // cpus, 1)
+
+    runs = []
+    for point in expand(sweep):
+        cfg = copy.deepcopy(base)
+        for k, v in point.items():
+            set_key(cfg, k, v)
+        run_dir = results_dir / config_hash(cfg)
+        run_dir.mkdir(parents=True, exist_ok=True)
+        _write_json(run_dir / 'config.json', cfg)
+        runs.append((point, cfg, run_dir))
+    todo = [r for r in runs if not (r[2] / 'result.json').exists()]
+    print(f'{len(runs)} runs, {len(runs) - len(todo)} already done')
+
+    if todo:
+        ctx = mp.get_context('spawn')
+        slots = ctx.Queue()
+        all_cores = sorted(
+            os.sched_getaffinity(0)
+            if hasattr(os, 'sched_getaffinity')
+            else range(budget)
+        )
+        for i in range(n_workers):
+            slots.put(set(all_cores[i * cpus : (i + 1) * cpus]))
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(slots,),
+        ) as pool:
+            futures = {
+                pool.submit(run_one, app, cfg, str(run_dir)): run_dir
+                for _, cfg, run_dir in todo
+            }
+            for f in as_completed(futures):
+                status = 'failed' if f.exception() else 'done'
+                print(f'{futures[f].name}: {status}')
+
+    rows = []
+    for point, _, run_dir in runs:
+        row = {'run': run_dir.name, **point}
+        result = run_dir / 'result.json'
+        if result.exists():
+            row.update(json.loads(result.read_text()))
+        else:
+            row['status'] = 'failed'
+        rows.append(row)
+    summary = pd.DataFrame(rows)
+    summary.to_csv(results_dir / f'{name}.csv', index=False)
+    print(summary.to_string(index=False))
+    return summary
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--sweep', type=Path, required=True)
+    parser.add_argument('--results-dir', type=Path)
+    args = parser.parse_args()
+    with args.sweep.open('rb') as f:
+        sweep = tomllib.load(f)
+    main(sweep, args.results_dir, name=args.sweep.stem)
@@ -0,0 +1,421 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from argparse import ArgumentParser
+import json
+from pathlib import Path
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from envs.alloc_env import AllocationEnv
+from envs.exec_env import ExecutionEnv
+from envs.recorder import TrajectoryRecorder
+from envs.vec_alloc_env import VecAllocationEnv
+from envs.vec_exec_env import VecExecutionEnv
+from eval.accumulators import AllocMetrics, ExecMetrics
+from eval.metrics import max_drawdown, sharpe
+from eval.runner import run_episodes
+from utils.data import PriceCache
+from utils.fetch import RateLimiter
+from utils.price_store import PriceStore, write_price_store
+
+BASELINE = Path(__file__).with_name('baseline.json')
+EXEC_CFG = {'steps': 50, 'init_inventory': 1000, 'seed': 0}
+TICKERS = ['SPY', 'QQQ', 'TLT', 'GLD', 'IWM', 'EFA', 'EEM', 'HYG']
+
+
+def synthetic_prices(n_days=2520, seed=0):
+    """Dates x tickers frame of GBM closes, identical on every run."""
+
+    rng = np.random.default_rng(seed)
+    log_ret = rng.normal(2e-4, 1e-2, size=(n_days, len(TICKERS)))
+    return pd.DataFrame(
+        100.0 * np.exp(np.cumsum(log_ret, axis=0)),
+        index=pd.bdate_range('2010-01-04', periods=n_days),
+        columns=TICKERS,
+    )
+
+
+def _series(n=1_000_000, seed=0):
+    return np.random.default_rng(seed).normal(2e-4, 1e-2, size=n)
+
+
+def _random_actions(space, shape, seed=0):
+    rng = np.random.default_rng(seed)
+    if hasattr(space, 'n'):
+        return rng.integers(space.n, size=shape)
+    return rng.random((*shape, *space.shape)).astype(np.float32)
+
+
+class FixedPolicy:
+    """Stand-in for an SB3 model: a fixed random linear policy.
+
+    Keeps torch out of the suite, so evaluation throughput tracks the
+    rollout loop, envs and metrics rather than the installed torch build.
+
+    """
+
+    def __init__(self, obs_dim, n_out, discrete, seed=0):
+        rng = np.random.default_rng(seed)
+        self.w = rng.normal(size=(obs_dim, n_out))
+        self.discrete = discrete
+
+    def predict(self, obs, deterministic=True):
+        out = np.asarray(obs).reshape(len(obs), -1) @ self.w
+        if self.discrete:
+            return out.argmax(axis=1), None
+        return 1.0 / (1.0 + np.exp(-out)), None
+
+
+# Each benchmark sets up its inputs and returns `(run, n)`: `run()` is the
+# timed workload and `n` the number of items it processes, giving a
+# throughput, or None for a plain wall time.
+
+
+def bench_exec_env(n_steps=20_000):
+    env = ExecutionEnv(EXEC_CFG)
+    actions = _random_actions(env.action_space, (n_steps,))
+
+    def run():
+        env.reset(seed=0)
+        for a in actions:
+            if env.step(a)[2]:
+                env.reset()
+
+    return run, n_steps
+
+
+def bench_alloc_env(n_steps=5_000):
+    env = AllocationEnv(synthetic_prices().to_numpy())
+    actions = _random_actions(env.action_space, (n_steps,))
+
+    def run():
+        env.reset(seed=0)
+        for a in actions:
+            if env.step(a)[2]:
+                env.reset()
+
+    return run, n_steps
+
+
+def _recorded_run(make_env, actions):
+    tmp = tempfile.TemporaryDirectory()
+
+    def run():
+        # `tmp` lives as long as this closure; chunks as in `run_episodes`
+        env = TrajectoryRecorder(
+            make_env(), Path(tmp.name) / 'run.arrow', chunk_size=1024
+        )
+        env.reset(seed=0)
+        for a in actions:
+            if env.step(a)[2]:
+                env.reset()
+        env.close()
+
+    return run, len(actions)
+
+
+def bench_exec_env_recorded(n_steps=20_000):
+    env = ExecutionEnv(EXEC_CFG)
+    actions = _random_actions(env.action_space, (n_steps,))
+    return _recorded_run(lambda: ExecutionEnv(EXEC_CFG), actions)
+
+
+def bench_alloc_env_recorded(n_steps=5_000):
+    prices = synthetic_prices().to_numpy()
+    env = AllocationEnv(prices)
+    actions = _random_actions(env.action_space, (n_steps,))
+    return _recorded_run(lambda: AllocationEnv(prices), actions)
+
+
+def _vec_run(venv, n_steps):
+    actions = _random_actions(venv.action_space, (n_steps, venv.num_envs))
+
+    def run():
+        venv.seed(0)
+        venv.reset()
+        for a in actions:
+            venv.step(a)
+
+    return run, n_steps * venv.num_envs
+
+
+def bench_exec_vec_env(n_envs=256, n_steps=200):
+    return _vec_run(VecExecutionEnv(EXEC_CFG, n_envs=n_envs), n_steps)
+
+
+def bench_alloc_vec_env(n_envs=64, n_steps=200):
+    prices = synthetic_prices().to_numpy()
+    venv = VecAllocationEnv(prices, n_envs=n_envs, episode_len=250, seed=0)
+    return _vec_run(venv, n_steps)
+
+
+def bench_eval_exec(n_episodes=256):
+    model = FixedPolicy(3, 5, discrete=True)
+
+    def env_fn():
+        return ExecutionEnv(EXEC_CFG)
+
+    def run():
+        run_episodes(model, env_fn, 'exec', n_episodes)
+
+    return run, n_episodes
+
+
+def bench_eval_alloc(n_episodes=64):
+    prices = synthetic_prices().to_numpy()
+    model = FixedPolicy(60 * len(TICKERS), len(TICKERS), discrete=False)
+
+    def env_fn():
+        return AllocationEnv(prices, random_start=True, episode_len=50)
+
+    def run():
+        run_episodes(model, env_fn, 'alloc', n_episodes)
+
+    return run, n_episodes
+
+
+def bench_metrics_sharpe_dd():
+    r = _series()
+    equity = np.exp(np.cumsum(r))
+
+    def run():
+        sharpe(r)
+        max_drawdown(equity)
+
+    return run, None
+
+
+def bench_metrics_exec_stream():
+    x = _series()
+
+    def run():
+        ExecMetrics().push(x).result()
+
+    return run, None
+
+
+def bench_metrics_alloc_stream(chunk=1_000):
+    # one push per 1000-point episode, as `run_episodes` feeds it
+    x = _series().reshape(-1, chunk)
+
+    def run():
+        acc = AllocMetrics()
+        for c in x:
+            acc.push(c, c, np.abs(c)).end_episode()
+        acc.result()
+
+    return run, None
+
+
+def _cache(frame, root):
+    def download(ticker, start, end):
+        close = frame[ticker]
+        return close[(close.index >= start) & (close.index < end)]
+
+    # no throttling: the fake downloader is local
+    limiter = RateLimiter(rate=1e9, burst=len(TICKERS))
+    return PriceCache(root=root, downloader=download, rate_limiter=limiter)
+
+
+def _load(cache, frame):
+    return cache.load(list(frame.columns), '2010-01-01', '2020-01-01')
+
+
+def bench_price_cache_cold():
+    frame = synthetic_prices()
+
+    def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            _load(_cache(frame, tmp), frame)
+
+    return run, None
+
+
+def bench_price_cache_warm():
+    frame = synthetic_prices()
+    tmp = tempfile.TemporaryDirectory()
+    _load(_cache(frame, tmp.name), frame)
+
+    def run():
+        # `tmp` lives as long as this closure
+        _load(_cache(frame, tmp.name), frame)
+
+    return run, None
+
+
+def bench_price_store_open():
+    tmp = tempfile.TemporaryDirectory()
+    write_price_store(Path(tmp.name) / 'store', synthetic_prices())
+
+    def run():
+        store = PriceStore(Path(tmp.name) / 'store', tickers=TICKERS)
+        float(store.returns.sum())
+
+    return run, None
+
+
+# name -> (setup, unit, higher is better)
+BENCHES = {
+    'exec_env': (bench_exec_env, 'steps/s', True),
+    'exec_env_recorded': (bench_exec_env_recorded, 'steps/s', True),
+    'exec_vec_env': (bench_exec_vec_env, 'steps/s', True),
+    'alloc_env': (bench_alloc_env, 'steps/s', True),
+    'alloc_env_recorded': (bench_alloc_env_recorded, 'steps/s', True),
+    'alloc_vec_env': (bench_alloc_vec_env, 'steps/s', True),
+    'eval_exec': (bench_eval_exec, 'episodes/s', True),
+    'eval_alloc': (bench_eval_alloc, 'episodes/s', True),
+    'metrics_sharpe_dd_1e6': (bench_metrics_sharpe_dd, 's', False),
+    'metrics_exec_stream_1e6': (bench_metrics_exec_stream, 's', False),
+    'metrics_alloc_stream_1e6': (bench_metrics_alloc_stream, 's', False),
+    'price_cache_cold': (bench_price_cache_cold, 's', False),
+    'price_cache_warm': (bench_price_cache_warm, 's', False),
+    'price_store_open': (bench_price_store_open, 's', False),
+}
+
+
+def measure(name, repeat=3):
+    """Best-of-`repeat` result of one benchmark plus its peak memory.
+
+    Peak memory comes from one extra, untimed run under tracemalloc
+    (NumPy reports its buffers there too), so tracing does not slow the
+    timed runs.
+
+    """
+
+    setup, unit, higher = BENCHES[name]
+    run, n = setup()
+    run()  # warm-up: imports, page cache, first-touch allocations
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'value': n / best if n else best,
+        'unit': unit,
+        'higher_is_better': higher,
+        'peak_mb': peak / 2**20,
+    }
+
+
+def compare(results, baseline, tolerance=0.25):
+    """Benchmarks more than `tolerance` worse than `baseline`.
+
+    Throughputs regress when they drop below `(1 - tolerance)` of the
+    baseline; wall times and peak memory when they exceed `(1 + tolerance)`
+    of it. Benchmarks missing from either side are skipped.
+
+    """
+
+    out = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if res['higher_is_better']:
+            slow = res['value'] < base['value'] * (1 - tolerance)
+        else:
+            slow = res['value'] > base['value'] * (1 + tolerance)
+        if slow:
+            out.append((name, 'value', base['value'], res['value']))
+        if res['peak_mb'] > base['peak_mb'] * (1 + tolerance) + 1.0:
+            out.append((name, 'peak_mb', base['peak_mb'], res['peak_mb']))
+    return out
+
+
+def main(names=None, repeat=3, baseline=BASELINE, tolerance=0.25, save=False):
+    baseline = Path(baseline)
+    if not save and not baseline.exists():
+        # a missing baseline would make the check pass vacuously
+        raise SystemExit(
+            f'error: no baseline at {baseline}; record one with --save'
+        )
+    results = {}
+    for name in names or BENCHES:
+        results[name] = res = measure(name, repeat)
+        print(
+            f'{name:28s} {res["value"]:14.4g} {res["unit"]:11s}'
+            f' peak {res["peak_mb"]:8.1f} MB'
+        )
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss /= 2**20 if sys.platform == 'darwin' else 2**10
+    print(f'max RSS {rss:.0f} MB')
+    doc = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'max_rss_mb': rss,
+        },
+        'results': results,
+    }
+
+    regressions = []
+    if baseline.exists():
+        old = json.loads(baseline.read_text())['results']
+        regressions = compare(results, old, tolerance)
+        for name, field, was, now in regressions:
+            print(f'REGRESSION {name} {field}: {was:.4g} -> {now:.4g}')
+        if not regressions:
+            print(f'no regressions beyond {tolerance:.0%} vs {baseline}')
+    if save:
+        if baseline.exists():
+            # keep baseline entries for benchmarks not run this time
+            merged = json.loads(baseline.read_text())
+            merged['meta'] = doc['meta']
+            merged['results'].update(results)
+            doc = merged
+        baseline.write_text(json.dumps(doc, indent=2, sort_keys=True) + '\n')
+        print(f'baseline written to {baseline}')
+    return results, regressions
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument(
+        'names', nargs='*', default=list(BENCHES), metavar='name'
+    )
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--save', action='store_true')
+    args = parser.parse_args()
+    unknown = sorted(set(args.names) - set(BENCHES))
+    if unknown:
+        parser.error(
+            f'unknown benchmarks {unknown}; choose from {list(BENCHES)}'
+        )
+    _, regressions = main(
+        args.names, args.repeat, args.baseline, args.tolerance, args.save
+    )
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,148 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import cProfile
+import time
+import tracemalloc
+
+from stable_baselines3.common.callbacks import BaseCallback
+
+from utils.profiling import PROFILER
+
+
+class ThroughputCallback(BaseCallback):
+    """Split wall time into rollout collection and policy updates.
+
+    Time between `rollout_start` and `rollout_end` is env stepping plus
+    action sampling; time from one `rollout_end` to the next
+    `rollout_start` is spent in `train`. Env steps per second are counted
+    over rollout time only.
+
+    """
+
+    def __init__(self, verbose=0):
+        super().__init__(verbose)
+        self.rollout_time = 0.0
+        self.update_time = 0.0
+        self._mark = None
+        self._steps0 = 0
+
+    def _on_training_start(self):
+        self._steps0 = self.num_timesteps
+        self._start = time.perf_counter()
+
+    def _on_rollout_start(self):
+        now = time.perf_counter()
+        if self._mark is not None:
+            self.update_time += now - self._mark
+        self._mark = now
+
+    def _on_rollout_end(self):
+        now = time.perf_counter()
+        self.rollout_time += now - self._mark
+        self._mark = now
+        self.logger.record('time/env_steps_per_s', self.steps_per_s)
+        self.logger.record('time/rollout_s', self.rollout_time)
+        self.logger.record('time/update_s', self.update_time)
+
+    def _on_step(self):
+        return True
+
+    def _on_training_end(self):
+        if self._mark is not None:
+            self.update_time += time.perf_counter() - self._mark
+            self._mark = None
+        self.total_time = time.perf_counter() - self._start
+        print(
+            f'{self.num_timesteps - self._steps0} env steps in '
+            f'{self.total_time:.1f}s: {self.steps_per_s:.0f} env steps/s, '
+            f'rollout {self.rollout_time:.1f}s, update {self.update_time:.1f}s'
+        )
+
+    @property
+    def steps_per_s(self):
+        steps = self.num_timesteps - self._steps0
+        return steps / self.rollout_time if self.rollout_time else 0.0
+
+    def summary(self):
+        return {
+            'env_steps_per_s': self.steps_per_s,
+            'rollout_s': self.rollout_time,
+            'update_s': self.update_time,
+        }
+
+
+class ProfileCallback(BaseCallback):
+    """Feed rollout/update spans to `PROFILER` and take sampled snapshots.
+
+    Every `PROFILER.cprofile_every`-th rollout, one rollout + update cycle
+    runs under cProfile and is dumped as `.prof`; every
+    `tracemalloc_every`-th rollout a tracemalloc snapshot is written. The
+    caller exports the profiler's stats and trace, e.g. after evaluation.
+
+    """
+
+    def __init__(self, prefix='train', verbose=0):
+        super().__init__(verbose)
+        self.prefix = prefix
+        self.n_rollouts = 0
+        self._mark = None
+        self._cprofile = None
+
+    def _on_training_start(self):
+        PROFILER.out_dir.mkdir(parents=True, exist_ok=True)
+        if PROFILER.tracemalloc_every and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _phase(self, name):
+        now = time.perf_counter_ns()
+        if self._mark is not None:
+            PROFILER.record(name, self._mark, now - self._mark)
+        self._mark = now
+
+    def _on_rollout_start(self):
+        self._phase('learn.update')
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(
+                PROFILER.out_dir / f'{self.prefix}.{self.n_rollouts}.prof'
+            )
+            self._cprofile = None
+        self.n_rollouts += 1
+        every = PROFILER.cprofile_every
+        if every and self.n_rollouts % every == 0:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def _on_rollout_end(self):
+        self._phase('learn.rollout')
+        every = PROFILER.tracemalloc_every
+        if every and self.n_rollouts % every == 0:
+            tracemalloc.take_snapshot().dump(
+                PROFILER.out_dir / f'{self.prefix}.{self.n_rollouts}.mem'
+            )
+
+    def _on_step(self):
+        return True
+
+    def _on_training_end(self):
+        self._phase('learn.update')
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile = None
@@ -18,7 +18,12 @@
 # ==============================================================================
 
 from stable_baselines3.common.torch_layers import BaseFeaturesExtractor
+import torch
 import torch.nn as nn
+import torch.nn.functional as F
+
+from utils.features import FeatureStore
+from utils.profiling import profiled
 
 
 class RiskAwareExtractor(BaseFeaturesExtractor):
@@ -39,5 +44,161 @@ class RiskAwareExtractor(BaseFeaturesExtractor):
             nn.ReLU(),
         )
 
+    @profiled()
     def forward(self, x):
         return self.net(x)
+
+
+class AssetSetExtractor(BaseFeaturesExtractor):
+    """Weight-shared extractor for (N, F) per-asset observations.
+
+    A shared MLP embeds every asset row, the embeddings are mean- and
+    max-pooled into a market context, and a second shared MLP scores each
+    asset from its embedding and the context. With `pool` (the default)
+    the per-asset outputs are mean- and max-pooled again into
+    `2 * out_dim` features, so neither the extractor nor the policy MLP
+    grows with N; only SB3's final action layer (`net_arch[-1] x N`)
+    does. `pool=False` returns the `N * out_dim` per-asset outputs, which
+    makes the first policy layer grow with N.
+
+    """
+
+    def __init__(self, observation_space, hidden_dim=64, out_dim=4, pool=True):
+        n_assets, n_feats = observation_space.shape
+        features_dim = 2 * out_dim if pool else n_assets * out_dim
+        super().__init__(observation_space, features_dim)
+        self.pool = pool
+        self.phi = nn.Sequential(
+            nn.Linear(n_feats, hidden_dim),
+            nn.ReLU(),
+            nn.Linear(hidden_dim, hidden_dim),
+            nn.ReLU(),
+        )
+        self.rho = nn.Sequential(
+            nn.Linear(3 * hidden_dim, hidden_dim),
+            nn.ReLU(),
+            nn.Linear(hidden_dim, out_dim),
+        )
+
+    @profiled()
+    def forward(self, x):
+        e = self.phi(x)
+        ctx = torch.cat([e.mean(dim=1), e.amax(dim=1)], dim=-1)
+        ctx = ctx.unsqueeze(1).expand(-1, e.shape[1], -1)
+        out = self.rho(torch.cat([e, ctx], dim=-1))
+        if self.pool:
+            return torch.cat([out.mean(dim=1), out.amax(dim=1)], dim=-1)
+        return out.flatten(1)
+
+
+class TemporalConvExtractor(BaseFeaturesExtractor):
+    """Causal conv encoder over each asset's return window.
+
+    For (window [+ feature rows], N) observations as `AllocationEnv` emits.
+    Every asset's window is cut into `patch`-day tokens ending at the
+    latest return, then `n_layers` causal convs with kernel and stride 2
+    merge neighbouring tokens, halving the sequence each time. The convs
+    are written as reshapes plus `nn.Linear` on the channel axis, much
+    faster on CPU than `nn.Conv1d` with this few channels, and share their
+    weights over assets. The last token and the time-mean summarize each
+    asset. Rows past `window` are `FeatureStore` rows: the `n_fields`
+    per-asset fields are appended as static inputs, and an N x N
+    covariance block after them is reduced to each asset's variance and
+    mean covariance. Embeddings are then pooled across assets as in
+    `AssetSetExtractor`, so the parameter count does not depend on N or
+    the window and the cost per pass is linear in both, unlike the
+    window * N * 256 first layer of `RiskAwareExtractor`.
+
+    `window` must be the env's window; `resolve_policy_kwargs` fills it
+    in from the config.
+
+    """
+
+    def __init__(
+        self,
+        observation_space,
+        window=None,
+        patch=5,
+        channels=16,
+        n_layers=2,
+        hidden_dim=32,
+        out_dim=4,
+    ):
+        n_rows, n_assets = observation_space.shape
+        super().__init__(observation_space, n_assets * out_dim)
+        if window is None:
+            raise ValueError('TemporalConvExtractor needs the env window')
+        n_fields = len(FeatureStore.FIELDS)
+        extra = n_rows - window
+        if extra not in (0, n_fields, n_fields + n_assets):
+            raise ValueError(
+                f'{extra} rows past window {window}: expected none or '
+                f'FeatureStore rows ({n_fields}, or {n_fields + n_assets} '
+                'with the covariance)'
+            )
+        self.window = window
+        self.n_fields = n_fields if extra else 0
+        self.cov = extra == n_fields + n_assets
+        self.patch = patch
+        self.embed = nn.Linear(patch, channels)
+        self.merges = nn.ModuleList(
+            nn.Linear(2 * channels, channels) for _ in range(n_layers)
+        )
+        self.phi = nn.Sequential(
+            nn.Linear(2 * channels + self.n_fields + 2 * self.cov, hidden_dim),
+            nn.ReLU(),
+        )
+        self.rho = nn.Sequential(
+            nn.Linear(3 * hidden_dim, hidden_dim),
+            nn.ReLU(),
+            nn.Linear(hidden_dim, out_dim),
+        )
+
+    @profiled()
+    def forward(self, x):
+        # (B, N, tokens, patch): left-pad so the last token ends at t - 1
+        seq = x[:, : self.window].transpose(1, 2)
+        if self.window % self.patch:
+            seq = F.pad(seq, (-self.window % self.patch, 0))
+        h = self.embed(seq.unflatten(-1, (-1, self.patch)))
+        for merge in self.merges:
+            if h.shape[2] % 2:
+                h = F.pad(h, (0, 0, 1, 0))
+            h = F.relu(merge(h.unflatten(2, (-1, 2)).flatten(-2)))
+        parts = [h[:, :, -1], h.mean(dim=2)]
+        end = self.window + self.n_fields
+        if self.n_fields:
+            parts.append(x[:, self.window : end].transpose(1, 2))
+        if self.cov:
+            cov = x[:, end:]
+            parts.append(torch.diagonal(cov, dim1=1, dim2=2).unsqueeze(-1))
+            parts.append(cov.mean(dim=1).unsqueeze(-1))
+        e = self.phi(torch.cat(parts, dim=-1))
+        ctx = torch.cat([e.mean(dim=1), e.amax(dim=1)], dim=-1)
+        ctx = ctx.unsqueeze(1).expand(-1, e.shape[1], -1)
+        return self.rho(torch.cat([e, ctx], dim=-1)).flatten(1)
+
+
+EXTRACTORS = {
+    'RiskAwareExtractor': RiskAwareExtractor,
+    'AssetSetExtractor': AssetSetExtractor,
+    'TemporalConvExtractor': TemporalConvExtractor,
+}
+
+
+def resolve_policy_kwargs(policy_kwargs, window=None):
+    """Map a `features_extractor_class` name from a TOML config to a class.
+
+    `TemporalConvExtractor` gets the env's `window` unless it sets one.
+
+    """
+
+    kwargs = dict(policy_kwargs)
+    name = kwargs.get('features_extractor_class')
+    if isinstance(name, str):
+        kwargs['features_extractor_class'] = EXTRACTORS[name]
+    if kwargs.get('features_extractor_class') is TemporalConvExtractor:
+        extractor_kwargs = dict(kwargs.get('features_extractor_kwargs', {}))
+        extractor_kwargs.setdefault('window', window)
+        kwargs['features_extractor_kwargs'] = extractor_kwargs
+    return kwargs
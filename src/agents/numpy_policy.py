@@ -0,0 +1,259 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from argparse import ArgumentParser
+import json
+from pathlib import Path
+
+import numpy as np
+
+# torch and stable-baselines3 are only imported by the export side; loading
+# and running an exported policy needs NumPy alone
+
+
+def _layers(modules):
+    """(op, weight, bias) for a chain of Linear and activation modules."""
+
+    import torch.nn as nn
+
+    ops = []
+    for m in modules:
+        if isinstance(m, nn.Sequential):
+            ops += _layers(m)
+        elif isinstance(m, nn.Linear):
+            w = m.weight.detach().cpu().numpy().T
+            b = m.bias.detach().cpu().numpy()
+            ops.append(('linear', w, b))
+        elif isinstance(m, nn.Tanh):
+            ops.append(('tanh', None, None))
+        elif isinstance(m, nn.ReLU):
+            ops.append(('relu', None, None))
+        elif not isinstance(m, (nn.Flatten, nn.Identity)):
+            raise TypeError(f'cannot export layer {type(m).__name__}')
+    return ops
+
+
+def _extractor(ext):
+    from stable_baselines3.common.torch_layers import FlattenExtractor
+
+    from agents.custom_policy import RiskAwareExtractor
+
+    if isinstance(ext, FlattenExtractor):
+        return []
+    if isinstance(ext, RiskAwareExtractor):
+        return _layers([ext.net])
+    raise TypeError(f'cannot export extractor {type(ext).__name__}')
+
+
+def export_policy(model, path, vec_normalize=None):
+    """Write the deterministic actor of an SB3 model to a `.npz`.
+
+    Supports on-policy models with Discrete or Box actions (PPO, A2C) and
+    SAC, with flat Box observations and the flatten or
+    `RiskAwareExtractor` feature extractors. `vec_normalize` is an
+    optional `VecNormalize` whose observation statistics are baked in.
+
+    """
+
+    from gymnasium import spaces
+
+    policy = model.policy
+    if hasattr(policy, 'actor'):
+        # SAC: tanh-squashed Gaussian mean, rescaled to the action bounds
+        actor = policy.actor
+        ops = _extractor(actor.features_extractor)
+        ops += _layers([actor.latent_pi, actor.mu])
+        action = 'squash'
+    else:
+        ops = _extractor(policy.pi_features_extractor)
+        ops += _layers([policy.mlp_extractor.policy_net, policy.action_net])
+        if isinstance(model.action_space, spaces.Discrete):
+            action = 'argmax'
+        elif isinstance(model.action_space, spaces.Box):
+            action = 'clip'
+        else:
+            raise TypeError(f'cannot export {model.action_space}')
+
+    if not ops or ops[0][0] != 'linear':
+        raise ValueError('policy must start with a linear layer')
+    arrays = {}
+    for i, (_, w, b) in enumerate(op for op in ops if op[0] == 'linear'):
+        arrays[f'W{i}'] = np.ascontiguousarray(w, dtype=np.float32)
+        arrays[f'b{i}'] = np.ascontiguousarray(b, dtype=np.float32)
+    if action != 'argmax':
+        arrays['low'] = model.action_space.low.astype(np.float32)
+        arrays['high'] = model.action_space.high.astype(np.float32)
+    meta = {
+        'ops': [op for op, _, _ in ops],
+        'action': action,
+        'obs_shape': list(model.observation_space.shape),
+        'normalize': vec_normalize is not None and vec_normalize.norm_obs,
+    }
+    if meta['normalize']:
+        rms = vec_normalize.obs_rms
+        # flat, like the observations `NumpyPolicy` normalizes
+        arrays['obs_mean'] = rms.mean.astype(np.float64).ravel()
+        arrays['obs_std'] = np.sqrt(rms.var + vec_normalize.epsilon).ravel()
+        meta['clip_obs'] = float(vec_normalize.clip_obs)
+    arrays['meta'] = np.array(json.dumps(meta))
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+    return path
+
+
+def _relu(x, out):
+    return np.maximum(x, 0.0, out=out)
+
+
+ACTIVATIONS = {'tanh': np.tanh, 'relu': _relu}
+
+
+class NumpyPolicy:
+    """Deterministic policy forward pass in pure NumPy.
+
+    Loads a `.npz` written by `export_policy`. Activations live in buffers
+    allocated once, one set for single observations and one for batches
+    of up to `max_batch` (grown on demand), and every layer writes into
+    them with `out=`. `predict` mirrors `model.predict(obs,
+    deterministic=True)`, so it drops into `evaluate_exec` and the runner.
+
+    """
+
+    def __init__(self, path, max_batch=256):
+        with np.load(path) as f:
+            arrays = {k: f[k] for k in f.files}
+        meta = json.loads(str(arrays.pop('meta')))
+        self.ops = meta['ops']
+        self.action = meta['action']
+        self.obs_shape = tuple(meta['obs_shape'])
+        self.obs_dim = int(np.prod(self.obs_shape))
+        n = sum(op == 'linear' for op in self.ops)
+        self.weights = [(arrays[f'W{i}'], arrays[f'b{i}']) for i in range(n)]
+        # one (weight, bias, activation) step per linear layer
+        acts = []
+        for op in self.ops:
+            if op == 'linear':
+                acts.append(None)
+            else:
+                acts[-1] = ACTIVATIONS[op]
+        self.plan = [(w, b, a) for (w, b), a in zip(self.weights, acts)]
+        self.low = arrays.get('low')
+        self.high = arrays.get('high')
+        self.normalize = meta['normalize']
+        if self.normalize:
+            self.obs_mean = arrays['obs_mean']
+            self.obs_std = arrays['obs_std']
+            self.clip_obs = meta['clip_obs']
+        self._single = self._buffers(())
+        self._batch = self._buffers((max_batch,))
+        self.max_batch = max_batch
+
+    def _buffers(self, lead):
+        norm = np.empty((*lead, self.obs_dim)) if self.normalize else None
+        outs = [
+            np.empty((*lead, w.shape[1]), np.float32) for w, _ in self.weights
+        ]
+        return norm, outs
+
+    def _preprocess(self, x, norm):
+        if self.normalize:
+            # VecNormalize works in float64 before SB3 casts to float32
+            np.subtract(x, self.obs_mean, out=norm)
+            norm /= self.obs_std
+            np.clip(norm, -self.clip_obs, self.clip_obs, out=norm)
+            x = norm
+        return np.asarray(x, dtype=np.float32)
+
+    def forward(self, obs):
+        """Raw actor output: logits, Gaussian mean or pre-tanh mean."""
+
+        obs = np.asarray(obs)
+        if obs.shape == self.obs_shape:
+            norm, outs = self._single
+            h = self._preprocess(obs.reshape(self.obs_dim), norm)
+        else:
+            n = len(obs)
+            if n > self.max_batch:
+                self._batch = self._buffers((n,))
+                self.max_batch = n
+            norm, outs = self._batch
+            norm = None if norm is None else norm[:n]
+            outs = [o[:n] for o in outs]
+            h = self._preprocess(obs.reshape(n, self.obs_dim), norm)
+        for (w, b, act), out in zip(self.plan, outs):
+            np.dot(h, w, out=out)
+            np.add(out, b, out=out)
+            if act is not None:
+                act(out, out=out)
+            h = out
+        return h
+
+    def predict(self, obs, state=None, episode_start=None, deterministic=True):
+        if not deterministic:
+            raise ValueError('NumpyPolicy only runs the deterministic actor')
+        h = self.forward(obs)
+        if self.action == 'argmax':
+            return h.argmax(axis=-1), None
+        if self.action == 'clip':
+            return np.clip(h, self.low, self.high), None
+        return self.low + 0.5 * (np.tanh(h) + 1.0) * (
+            self.high - self.low
+        ), None
+
+
+ALGOS = ('PPO', 'A2C', 'SAC')
+
+
+def main(model_path, out=None, algo='PPO', vec_normalize=None, n_check=1000):
+    import pickle
+
+    import stable_baselines3 as sb3
+
+    model = getattr(sb3, algo).load(model_path, device='cpu')
+    norm = None
+    if vec_normalize is not None:
+        # `VecNormalize.load` wants a venv; only the statistics are needed
+        with open(vec_normalize, 'rb') as f:
+            norm = pickle.load(f)
+    out = out or Path(model_path).with_suffix('.npz')
+    export_policy(model, out, norm)
+    policy = NumpyPolicy(out)
+
+    # compare on observations drawn from N(0, 1), the same batch for both
+    rng = np.random.default_rng(0)
+    obs = rng.normal(size=(n_check, *policy.obs_shape)).astype(np.float32)
+    ref = obs if norm is None else norm.normalize_obs(obs)
+    expected, _ = model.predict(ref, deterministic=True)
+    got, _ = policy.predict(obs)
+    if policy.action == 'argmax':
+        diff = f'{(got != expected).mean():.2%} actions differ'
+    else:
+        diff = f'max abs diff {np.abs(got - expected).max():.2e}'
+    print(f'wrote {out}: {diff} over {n_check} observations')
+    return out
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('model', type=Path)
+    parser.add_argument('--out', type=Path)
+    parser.add_argument('--algo', choices=ALGOS, default='PPO')
+    parser.add_argument('--vec-normalize', type=Path)
+    args = parser.parse_args()
+    main(args.model, args.out, args.algo, args.vec_normalize)
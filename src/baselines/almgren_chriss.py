@@ -17,23 +17,158 @@
 # with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
 # ==============================================================================
 
+from functools import lru_cache
+
 import numpy as np
 
 
+def env_ac_params(config, mid0=100.0):
+    """AC parameters matching an `ExecutionEnv` config.
+
+    The env buys at `mid * (1 + impact_coeff * q / q0)`, i.e. a linear
+    temporary impact cost of `eta * q / tau` per share with
+    `eta = mid0 * impact_coeff * tau / q0`; price volatility is
+    `mid0 * gbm_sigma` per unit time. `perm_impact_coeff` (as in
+    `MultiAssetExecutionEnv`) maps to `gamma` the same way. With
+    `gbm_mu = 0`, `ac_cost` then equals `schedule_cost`'s expected IS for
+    any AC schedule; the variances agree to first order in `gbm_sigma^2`
+    (arithmetic vs geometric mids).
+
+    """
+
+    q0 = config.get('init_inventory', 1000)
+    tau = config.get('dt', 1.0)
+    return {
+        'T': config.get('steps', 50),
+        'q0': q0,
+        'sigma': mid0 * config.get('gbm_sigma', 0.02),
+        'eta': mid0 * config.get('impact_coeff', 2e-3) * tau / q0,
+        'gamma': mid0 * config.get('perm_impact_coeff', 0.0) / q0,
+        'fee': config.get('fee_per_share', 0.0001),
+        'tau': tau,
+    }
+
+
+def _eta_tilde(eta, gamma, tau):
+    eta_t = eta - 0.5 * gamma * tau
+    if np.any(eta_t <= 0):
+        raise ValueError('need eta > gamma * tau / 2')
+    return eta_t
+
+
+def ac_trajectory(T, q0, lam=1e-6, sigma=0.2, eta=1e-6, gamma=0.0, tau=1.0):
+    """Exact discrete Almgren-Chriss holdings `x_0 = q0, ..., x_T = 0`.
+
+    `x_j = q0 * sinh(kappa (T - j) tau) / sinh(kappa T tau)` with
+    `cosh(kappa tau) = 1 + lam sigma^2 tau^2 / (2 eta~)` and
+    `eta~ = eta - gamma tau / 2`. All parameters broadcast; the result is
+    (T + 1,) + broadcast shape. `lam = 0` gives TWAP.
+
+    """
+
+    q0, lam, sigma, eta, gamma = np.broadcast_arrays(
+        *(
+            np.asarray(v, dtype=np.float64)
+            for v in (q0, lam, sigma, eta, gamma)
+        )
+    )
+    eta_t = _eta_tilde(eta, gamma, tau)
+    kappa = np.arccosh(1 + lam * sigma**2 * tau**2 / (2 * eta_t)) / tau
+    j = np.arange(T + 1, dtype=np.float64).reshape((-1,) + (1,) * q0.ndim)
+    a = kappa * (T - j) * tau
+    b = kappa * T * tau
+    # sinh(a) / sinh(b) without overflow; the linear limit as kappa -> 0
+    small = b < 1e-9
+    b_safe = np.where(small, 1.0, b)
+    ratio = np.exp(a - b_safe) * np.expm1(-2 * a) / np.expm1(-2 * b_safe)
+    ratio = np.where(small, (T - j) / T, ratio)
+    return q0 * ratio
+
+
+def almgren_chriss_exact(
+    T, q0, lam=1e-6, sigma=0.2, eta=1e-6, gamma=0.0, tau=1.0
+):
+    """Per-step shares `x_{j-1} - x_j` of the exact AC trajectory."""
+
+    return -np.diff(ac_trajectory(T, q0, lam, sigma, eta, gamma, tau), axis=0)
+
+
+def ac_cost(T, q0, lam=1e-6, sigma=0.2, eta=1e-6, gamma=0.0, fee=0.0, tau=1.0):
+    """Expected shortfall and its variance of the optimal AC schedule.
+
+    `E = gamma q0^2 / 2 + fee q0 + eta~ / tau * sum n_k^2` and
+    `V = sigma^2 tau * sum x_k^2`, each with the broadcast shape of the
+    parameters.
+
+    """
+
+    x = ac_trajectory(T, q0, lam, sigma, eta, gamma, tau)
+    n = -np.diff(x, axis=0)
+    q0, sigma, eta, gamma = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (x[0], sigma, eta, gamma))
+    )
+    eta_t = _eta_tilde(eta, gamma, tau)
+    E = 0.5 * gamma * q0**2 + fee * q0 + eta_t / tau * (n**2).sum(axis=0)
+    V = sigma**2 * tau * (x[1:] ** 2).sum(axis=0)
+    return E, V
+
+
+def _key(v):
+    v = np.asarray(v, dtype=np.float64)
+    return v.shape, tuple(v.ravel().tolist())
+
+
+def _unkey(key):
+    shape, values = key
+    return np.array(values).reshape(shape)
+
+
+@lru_cache(maxsize=64)
+def _frontier(T, q0, lam, sigma, eta, gamma, fee, tau):
+    lam, sigma, eta = _unkey(lam), _unkey(sigma), _unkey(eta)
+    E, V = ac_cost(T, q0, lam, sigma, eta, gamma, fee, tau)
+    out = {
+        'lam': np.broadcast_to(lam, E.shape),
+        'E': E,
+        'V': V,
+        'schedule': almgren_chriss_exact(T, q0, lam, sigma, eta, gamma, tau),
+    }
+    for v in out.values():
+        v.flags.writeable = False
+    return out
+
+
+def efficient_frontier(
+    T, q0, lam, sigma=0.2, eta=1e-6, gamma=0.0, fee=0.0, tau=1.0
+):
+    """Expected cost vs variance over arrays of `lam`, `sigma`, `eta`.
+
+    One vectorized solve for every parameter combination; results are
+    LRU-cached by value and returned as read-only arrays: `lam`, `E`,
+    `V` and the (T,) + shape `schedule`.
+
+    """
+
+    return _frontier(
+        T,
+        float(q0),
+        _key(lam),
+        _key(sigma),
+        _key(eta),
+        float(gamma),
+        float(fee),
+        float(tau),
+    )
+
+
 def almgren_chriss_linear(T, q0, lam=1e-6, sigma=0.2, eta=1e-6):
     """Almgren-Chriss linear price impact model.
 
-    Simplified AC schedule for linear temp impact and variance penalty
+    Optimal AC schedule for linear temp impact and variance penalty
     `lam * sigma^2`. Returns per-step shares to execute that sum to q0.
+    With per-asset arrays for `q0`, `sigma` or `eta` the schedule is
+    (T, n_assets), one column per asset.
 
     """
 
-    # In discrete-time with linear temp impact, optimal schedule is close to
-    # uniform, with slight front-loading increasing with risk aversion.
-
-    base = q0 / T
-    tilt = np.linspace(1.0, 0.5, T)  # crude tilt
-    tilt /= tilt.sum()
-    alpha = np.clip(lam * sigma**2 / max(eta, 1e-12), 0.0, 1.0)
-    sched = (1 - alpha) * np.full(T, base) + alpha * q0 * tilt
-    return sched * (q0 / sched.sum())
+    return almgren_chriss_exact(T, q0, lam, sigma, eta)
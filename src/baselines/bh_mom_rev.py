@@ -32,19 +32,42 @@ def buy_and_hold(w0=None, N=None):
     return equal_weight(N) if w0 is None else w0
 
 
-def momentum_signal(returns, lookback=60):
-    """Momentum signal."""
+def long_only_weights(mu):
+    """Normalized positive part of `mu` along the last axis.
+
+    Rows with no positive entry fall back to equal weight.
+
+    """
 
-    mu = returns[-lookback:].mean(axis=0)
     w = np.maximum(mu, 0.0)
-    s = w.sum()
-    return w / s if s > 1e-8 else equal_weight(returns.shape[1])
+    s = w.sum(axis=-1, keepdims=True)
+    ew = equal_weight(w.shape[-1])
+    return np.where(s > 1e-8, w / np.where(s > 1e-8, s, 1.0), ew)
+
+
+def momentum_signal(returns, lookback=60, features=None, t=None):
+    """Momentum signal.
+
+    With a `FeatureStore` the precomputed weights at env time `t` are
+    returned instead of recomputing the lookback mean.
+
+    """
+
+    if features is not None:
+        return features.momentum[t - 1]
+    mu = returns[-lookback:].mean(axis=0)
+    return long_only_weights(mu)
+
+
+def reverse_signal(returns, lookback=5, features=None, t=None):
+    """Reverse momentum signal.
 
+    With a `FeatureStore` the precomputed weights at env time `t` are
+    returned instead of recomputing the lookback mean.
 
-def reverse_signal(returns, lookback=5):
-    """Reverse momentum signal."""
+    """
 
+    if features is not None:
+        return features.reversal[t - 1]
     mu = returns[-lookback:].mean(axis=0)
-    w = np.maximum(-mu, 0.0)
-    s = w.sum()
-    return w / s if s > 1e-8 else equal_weight(returns.shape[1])
+    return long_only_weights(-mu)
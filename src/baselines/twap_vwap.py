@@ -21,15 +21,28 @@ import numpy as np
 
 
 def twap_schedule(T, q0):
-    """Time-weighted average price schedule."""
+    """Time-weighted average price schedule.
+
+    `q0` may be an (n_assets,) array, giving a (T, n_assets) schedule.
+
+    """
 
     # equal slices each step
-    return np.full(T, q0 / T)
+    q0 = np.asarray(q0, dtype=np.float64)
+    return np.full((T,) + q0.shape, q0 / T)
 
 
 def vwap_schedule(vol_profile, q0):
-    """Volume-weighted average price schedule."""
+    """Volume-weighted average price schedule.
+
+    `vol_profile` is (T,) or per-asset (T, n_assets); with an array `q0`
+    the result is a (T, n_assets) schedule.
+
+    """
 
     vol = np.array(vol_profile, dtype=np.float32)
-    vol /= vol.sum()
+    vol /= vol.sum(axis=0)
+    q0 = np.asarray(q0)
+    if vol.ndim == 1 and q0.ndim == 1:
+        vol = vol[:, None]
     return q0 * vol
@@ -21,6 +21,8 @@ import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
 
+from utils.price_store import PriceStore
+
 
 class AllocationEnv(gym.Env):
     """Allocation environment for a multi-asset portfolio."""
@@ -32,13 +34,30 @@ class AllocationEnv(gym.Env):
         rebalance_every=5,
         cost_bps=2.0,
         reward_cfg=None,
+        random_start=False,
+        episode_len=None,
+        seed=None,
+        features=None,
     ):
-        self.prices = prices
-        self.returns = np.log(prices[1:] / prices[:-1])
+        if isinstance(prices, PriceStore):
+            # memory-mapped, shared with every other env on the same store
+            self.prices = prices.prices
+            self.returns = prices.returns
+            self.obs_returns = prices.returns32
+        else:
+            self.prices = prices
+            self.returns = np.log(prices[1:] / prices[:-1])
+            # observations are read-only float32 views, cast once up front
+            self.obs_returns = self.returns.astype(np.float32)
+            self.obs_returns.flags.writeable = False
         self.T, self.N = self.returns.shape
         self.window = window
         self.k = rebalance_every
         self.cost = cost_bps * 1e-4
+        self.random_start = random_start
+        self.episode_len = episode_len
+        self.rng = np.random.default_rng(seed)
+        self.features = features
         self.reward_cfg = reward_cfg or {
             'type': 'ret_minus_lambda_vol',
             'lambda_vol': 5.0e-2,
@@ -49,19 +68,41 @@ class AllocationEnv(gym.Env):
         self.observation_space = spaces.Box(
             low=-np.inf,
             high=np.inf,
-            shape=(self.window + 1, self.N),
+            shape=(
+                self.window + (features.n_rows if features else 0),
+                self.N,
+            ),
             dtype=np.float32,
         )
         self.reset()
 
     def reset(self, seed=None, options=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
         self.t = self.window
+        if self.random_start:
+            span = self.k * (self.episode_len or 1)
+            self.t = int(
+                self.rng.integers(
+                    self.window, max(self.T - span, self.window) + 1
+                )
+            )
+        self.t_end = (
+            self.T
+            if self.episode_len is None
+            else min(self.T, self.t + self.k * self.episode_len)
+        )
         self.w = np.ones(self.N) / self.N
         self.equity = 1.0
         return self._observe(), {}
 
     def _observe(self):
-        return self.returns[self.t - self.window : self.t]
+        t = min(self.t, self.T)
+        obs = self.obs_returns[t - self.window : t]
+        if self.features is not None:
+            # feature rows at t only see returns up to t - 1, like obs
+            obs = np.concatenate([obs, self.features.observation(t)])
+        return obs
 
     def _reward(self, seg_ret, ret_seg):
         if self.reward_cfg['type'] == 'ret_minus_lambda_vol':
@@ -87,7 +128,7 @@ class AllocationEnv(gym.Env):
         self.equity *= np.exp(seg_ret) * (1 - tc)
         self.w = a
         self.t += self.k
-        terminated = self.t >= self.T
+        terminated = self.t >= self.t_end
         reward = self._reward(seg_ret, ret_seg)
         return (
             self._observe(),
@@ -21,9 +21,25 @@ import numpy as np
 import gymnasium as gym
 from gymnasium import spaces
 
+from envs.scenarios import bank_from_env_cfg, sample_path
+
 
 class ExecutionEnv(gym.Env):
-    """Execution environment for a single asset."""
+    """Execution environment for a single asset.
+
+    A buy program for `init_inventory` shares, like every execution env
+    here: child orders fill above the mid at `mid * (1 + impact * q / q0)`,
+    implementation shortfall is `paid - mid0 * q0` and the terminal reward
+    is `-IS`, so impact is always a cost. Shares left at the horizon are
+    bought at the impacted mid. `is_plus_inv_pen` also charges a running
+    `inv_penalty * inv**2` every step on the shares still to buy after
+    that step's child order.
+
+    Mids follow a path drawn at every reset: from the `path_bank` when
+    one is configured, else a fresh GBM path with `gbm_mu`, `gbm_sigma`
+    and `dt` from the env's generator.
+
+    """
 
     metadata = {'render.modes': []}
 
@@ -38,6 +54,9 @@ class ExecutionEnv(gym.Env):
         self.sigma = config.get('gbm_sigma', 0.02)
         self.dt = config.get('dt', 1.0)
         self.rng = np.random.default_rng(config.get('seed', 123))
+        self.bank = bank_from_env_cfg(config)
+        if self.bank is not None and self.bank.steps < self.steps:
+            raise ValueError('path bank is shorter than the episode')
         self.reward_cfg = config.get(
             'reward', {'type': 'is_only', 'inv_penalty': 0.0}
         )
@@ -49,9 +68,22 @@ class ExecutionEnv(gym.Env):
         self.reset()
 
     def reset(self, seed=None, options=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
         self.t = 0
         self.inv = self.init_inventory
-        self.mid = 100.0
+        if self.bank is not None:
+            self.path = self.bank[self.rng.integers(len(self.bank))]
+        else:
+            self.path = sample_path(
+                self.rng,
+                'gbm',
+                self.steps,
+                dt=self.dt,
+                mu=self.mu,
+                sigma=self.sigma,
+            )
+        self.mid = float(self.path[0])
         self.mid_hist = [self.mid]
         self.cash = 0.0
         self.done = False
@@ -61,30 +93,29 @@ class ExecutionEnv(gym.Env):
         frac = self.action_fracs[int(action)]
         qty = min(self.inv, int(np.round(frac * self.inv)))
         trade_price = self.mid * (
-            1 - self.impact * (qty / max(self.init_inventory, 1))
+            1 + self.impact * (qty / max(self.init_inventory, 1))
         )
         cost = qty * (trade_price + self.fee)
         self.cash -= cost
         self.inv -= qty
-        self.mid_hist.append(self.mid)
         self.t += 1
+        self.mid = float(self.path[self.t])
+        self.mid_hist.append(self.mid)
         terminated = self.t >= self.steps or self.inv == 0
         reward = 0.0
+        if self.reward_cfg['type'] == 'is_plus_inv_pen':
+            reward -= self.reward_cfg.get('inv_penalty', 0.0) * self.inv**2
         if terminated:
             if self.inv > 0:
                 liq_price = self.mid * (
-                    1 - self.impact * (self.inv / max(self.init_inventory, 1))
+                    1 + self.impact * (self.inv / max(self.init_inventory, 1))
                 )
                 self.cash -= self.inv * (liq_price + self.fee)
                 self.inv = 0
             ideal = self.mid_hist[0] * self.init_inventory
             paid = -self.cash
             ishort = paid - ideal
-            reward = -ishort
-            if self.reward_cfg['type'] == 'is_plus_inv_pen':
-                reward += self.reward_cfg.get('inv_penalty', 0.0) * (
-                    self.inv**2
-                )
+            reward -= ishort
         return self._observe(), reward, terminated, False, {}
 
     def _observe(self):
@@ -0,0 +1,129 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from gymnasium import spaces
+import numpy as np
+
+from envs.alloc_env import AllocationEnv
+
+
+class LargeUniverseAllocationEnv(AllocationEnv):
+    """Allocation environment with a compressed (N, F) observation.
+
+    Instead of the raw (window, N) return block each asset gets a row of
+    summary features over the window (mean, vol, last return, cumulative
+    return) plus its loadings on the top `n_factors` principal components
+    of a shrinkage covariance estimate. Window sums are updated as the
+    window slides and the factors are refined from the previous ones by
+    subspace iteration. The covariance is only ever applied as
+    `R.T @ (R @ v)` with the (window, N) return block `R`, so a step costs
+    O(window N k) and no N x N matrix is formed, at reset either (the
+    factors start from a thin SVD of the centered block).
+
+    With `features`, the per-asset rows of the `FeatureStore`
+    (`FeatureStore.FIELDS`) are appended as extra columns; its N x N
+    EWMA covariance rows are left out.
+
+    """
+
+    N_SUMMARY = 4
+
+    def __init__(self, prices, n_factors=8, shrinkage=0.1, **kwargs):
+        self.n_factors = n_factors
+        self.shrinkage = shrinkage
+        self._stat_t = None
+        features = kwargs.get('features')
+        self.n_feature_cols = 0 if features is None else len(features.FIELDS)
+        super().__init__(prices, **kwargs)
+        self.observation_space = spaces.Box(
+            low=-np.inf,
+            high=np.inf,
+            shape=(
+                self.N,
+                self.N_SUMMARY + n_factors + self.n_feature_cols,
+            ),
+            dtype=np.float32,
+        )
+
+    def _rebuild(self, t):
+        self._block = block = self.returns[t - self.window : t]
+        if self.n_factors > min(block.shape):
+            raise ValueError('n_factors must be <= min(window, n_assets)')
+        self._s1 = block.sum(axis=0)
+        self._s2 = np.einsum('ij,ij->j', block, block)
+        # right singular vectors of the centered block are the sample
+        # covariance eigenvectors; two subspace steps move them to the
+        # shrinkage estimate
+        _, _, vt = np.linalg.svd(
+            block - self._s1 / self.window, full_matrices=False
+        )
+        self._vecs = vt[: self.n_factors].T.copy()
+        for _ in range(2):
+            self._vecs, _ = np.linalg.qr(self._cov_dot(self._vecs))
+
+    def _slide(self, t0, t1):
+        new = self.returns[t0:t1]
+        old = self.returns[t0 - self.window : t1 - self.window]
+        self._block = self.returns[t1 - self.window : t1]
+        self._s1 += new.sum(axis=0) - old.sum(axis=0)
+        self._s2 += np.einsum('ij,ij->j', new, new)
+        self._s2 -= np.einsum('ij,ij->j', old, old)
+        # one subspace-iteration step warm-started from the last factors
+        self._vecs, _ = np.linalg.qr(self._cov_dot(self._vecs))
+
+    def _var(self):
+        mean = self._s1 / self.window
+        return np.maximum(self._s2 / self.window - mean**2, 0.0)
+
+    def _cov_dot(self, v):
+        # shrinkage covariance times v through the (window, N) block
+        mean = self._s1 / self.window
+        cv = self._block.T @ (self._block @ v) / self.window
+        cv -= np.outer(mean, mean @ v)
+        return (1 - self.shrinkage) * cv + self.shrinkage * (
+            self._var()[:, None] * v
+        )
+
+    def _observe(self):
+        t = min(self.t, self.T)
+        if self._stat_t is None or not 0 <= t - self._stat_t < self.window:
+            self._rebuild(t)
+        elif t != self._stat_t:
+            self._slide(self._stat_t, t)
+        self._stat_t = t
+
+        mean = self._s1 / self.window
+        var = self._var()
+        # orient each factor so loadings sum positive, eigvecs are +/-
+        vecs = self._vecs * np.where(self._vecs.sum(axis=0) < 0, -1.0, 1.0)
+        lam = (self._cov_dot(vecs) * vecs).sum(axis=0)
+        k = self.N_SUMMARY + self.n_factors
+        obs = np.empty((self.N, k + self.n_feature_cols), dtype=np.float32)
+        obs[:, 0] = mean
+        obs[:, 1] = np.sqrt(var)
+        obs[:, 2] = self.returns[t - 1]
+        obs[:, 3] = self._s1
+        obs[:, self.N_SUMMARY : k] = vecs * np.sqrt(np.maximum(lam, 0.0))
+        if self.n_feature_cols:
+            obs[:, k:] = self.features.observation(t)[: self.n_feature_cols].T
+        return obs
+
+    def reset(self, seed=None, options=None):
+        self._stat_t = None
+        return super().reset(seed=seed, options=options)
@@ -0,0 +1,349 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import numpy as np
+import gymnasium as gym
+from gymnasium import spaces
+
+
+class OrderBook:
+    """Price-level limit order book on a fixed tick grid.
+
+    Depth per level is kept in two preallocated int64 arrays and the best
+    bid/ask are tracked as indices, so the touch is an O(1) lookup. Market
+    orders walk the book with a cumulative sum over the opposite side.
+
+    """
+
+    def __init__(self, mid0=100.0, tick=0.01, n_levels=4096):
+        self.tick = tick
+        self.n_levels = n_levels
+        self.center = n_levels // 2
+        self.p0 = mid0 - self.center * tick
+        self.bid = np.zeros(n_levels, dtype=np.int64)
+        self.ask = np.zeros(n_levels, dtype=np.int64)
+        self.best_bid = -1
+        self.best_ask = n_levels
+
+    def price(self, level):
+        return self.p0 + level * self.tick
+
+    def seed_book(self, depth, n_levels):
+        """Fill `n_levels` levels per side around the center."""
+
+        c = self.center
+        self.bid[:] = 0
+        self.ask[:] = 0
+        self.bid[c - n_levels : c] = depth
+        self.ask[c + 1 : c + 1 + n_levels] = depth
+        self.best_bid = c - 1
+        self.best_ask = c + 1
+
+    @property
+    def mid(self):
+        # fall back to one tick off the surviving side if the other is empty
+        bid, ask = self.best_bid, self.best_ask
+        if bid < 0:
+            bid = ask - 1
+        if ask >= self.n_levels:
+            ask = bid + 1
+        return 0.5 * (self.price(bid) + self.price(ask))
+
+    def _next_bid(self, start):
+        nz = np.flatnonzero(self.bid[: start + 1])
+        return nz[-1] if len(nz) else -1
+
+    def _next_ask(self, start):
+        nz = np.flatnonzero(self.ask[start:])
+        return start + nz[0] if len(nz) else self.n_levels
+
+    @staticmethod
+    def _walk(side, qty, price):
+        # grow the window geometrically, most orders clear in a few levels
+        n = min(len(side), 32)
+        while True:
+            cum = np.cumsum(side[:n])
+            if cum[-1] >= qty or n == len(side):
+                break
+            n = min(len(side), 4 * n)
+        j = int(np.searchsorted(cum, qty))
+        if j >= n:
+            j, qty = n - 1, int(cum[-1])
+        prev = int(cum[j - 1]) if j > 0 else 0
+        px = price(np.arange(j + 1))
+        notional = float(side[:j] @ px[:j]) + (qty - prev) * px[j]
+        side[:j] = 0
+        side[j] -= qty - prev
+        return qty, notional, j
+
+    def market_buy(self, qty):
+        """Walk the ask side for `qty` shares; return (filled, notional)."""
+
+        if qty <= 0 or self.best_ask >= self.n_levels:
+            return 0, 0.0
+        b = self.best_ask
+        qty, notional, j = self._walk(
+            self.ask[b:], qty, lambda k: self.price(b + k)
+        )
+        self.best_ask = self._next_ask(b + j)
+        return qty, notional
+
+    def market_sell(self, qty):
+        """Walk the bid side for `qty` shares; return (filled, notional)."""
+
+        if qty <= 0 or self.best_bid < 0:
+            return 0, 0.0
+        b = self.best_bid
+        qty, notional, j = self._walk(
+            self.bid[b::-1], qty, lambda k: self.price(b - k)
+        )
+        self.best_bid = self._next_bid(b - j)
+        return qty, notional
+
+    def add_bids(self, levels, size):
+        levels = levels[(levels >= 0) & (levels < self.best_ask)]
+        levels = levels[levels < self.n_levels]
+        if len(levels):
+            self.bid += np.bincount(levels, minlength=self.n_levels) * size
+            self.best_bid = max(self.best_bid, int(levels.max()))
+
+    def add_asks(self, levels, size):
+        levels = levels[(levels < self.n_levels) & (levels > self.best_bid)]
+        if len(levels):
+            self.ask += np.bincount(levels, minlength=self.n_levels) * size
+            self.best_ask = min(self.best_ask, int(levels.min()))
+
+    def cancel(self, rng, prob, size, window=256):
+        """Cancel each resting order near the touch with probability `prob`.
+
+        Cancellation proportional to queue size keeps the book depth
+        stationary. Returns the number of cancelled orders.
+
+        """
+
+        n = 0
+        if self.best_bid >= 0:
+            lo = max(self.best_bid - window + 1, 0)
+            sub = self.bid[lo : self.best_bid + 1]
+            k = rng.binomial(sub // size, prob)
+            sub -= k * size
+            n += int(k.sum())
+            if self.bid[self.best_bid] == 0:
+                self.best_bid = self._next_bid(self.best_bid)
+        if self.best_ask < self.n_levels:
+            sub = self.ask[self.best_ask : self.best_ask + window]
+            k = rng.binomial(sub // size, prob)
+            sub -= k * size
+            n += int(k.sum())
+            if self.ask[self.best_ask] == 0:
+                self.best_ask = self._next_ask(self.best_ask)
+        return n
+
+    def recenter(self):
+        """Shift the grid so the touch sits back at the center level."""
+
+        shift = (self.best_bid + self.best_ask) // 2 - self.center
+        if shift == 0:
+            return
+        for side in (self.bid, self.ask):
+            side[:] = np.roll(side, -shift)
+            if shift > 0:
+                side[-shift:] = 0
+            else:
+                side[:-shift] = 0
+        self.p0 += shift * self.tick
+        self.best_bid = self._next_bid(self.n_levels - 1)
+        self.best_ask = self._next_ask(0)
+
+
+class OrderFlow:
+    """Zero-intelligence background flow applied to an `OrderBook`.
+
+    Each call draws `events` limit and market orders, split evenly by side,
+    places limit orders a geometric number of ticks behind the opposite
+    touch, and cancels resting orders at rate `cancel_prob`. Every event
+    type is applied in one batched update.
+
+    The defaults let market orders (30% of events) outpace the limit
+    orders joining the touch, so queues there deplete and the mid walks:
+    about a third of a tick per call with a spread of 2-3 ticks, and an
+    order book that stays around 400 shares deep at the touch.
+
+    """
+
+    def __init__(
+        self,
+        rng,
+        events=200,
+        order_size=10,
+        limit_rate=0.6,
+        market_rate=0.3,
+        cancel_prob=0.1,
+        depth_decay=0.3,
+    ):
+        self.rng = rng
+        self.events = events
+        self.order_size = order_size
+        rates = np.repeat([limit_rate, market_rate], 2)
+        self.p = rates / rates.sum()
+        self.cancel_prob = cancel_prob
+        self.depth_decay = depth_decay
+
+    def apply(self, book):
+        n = self.rng.multinomial(self.events, self.p)
+        size = self.order_size
+        d = self.rng.geometric(self.depth_decay, size=n[0] + n[1])
+        book.add_bids(book.best_ask - d[: n[0]], size)
+        book.add_asks(book.best_bid + d[n[0] :], size)
+        book.market_buy(int(n[2]) * size)
+        book.market_sell(int(n[3]) * size)
+        cancelled = book.cancel(self.rng, self.cancel_prob, size)
+        return self.events + cancelled
+
+
+class LOBExecutionEnv(gym.Env):
+    """Execution environment against a simulated limit order book.
+
+    Drop-in for `ExecutionEnv`: the same buy program, actions,
+    observations and cash / IS bookkeeping, but child orders are market
+    buys that walk the ask side instead of paying a linear temporary
+    impact. Shares the book cannot fill by the end of the episode are
+    bought at the final mid plus `unfilled_cost_bps`, so they count in IS
+    under every reward. `is_plus_inv_pen` charges the same running
+    `inv_penalty * inv**2` as `ExecutionEnv`, plus one on the square of
+    the unfilled shares. The terminal `info['unfilled']` holds their
+    number.
+
+    """
+
+    metadata = {'render.modes': []}
+
+    def __init__(self, config):
+        super().__init__()
+        self.config = config
+        self.steps = config.get('steps', 50)
+        self.init_inventory = config.get('init_inventory', 1000)
+        self.fee = config.get('fee_per_share', 0.0001)
+        self.tick = config.get('tick', 0.01)
+        self.n_levels = config.get('n_levels', 4096)
+        self.init_depth = config.get('init_depth', 100)
+        self.init_levels = config.get('init_levels', 50)
+        self.unfilled_cost = config.get('unfilled_cost_bps', 100.0) * 1e-4
+        self.rng = np.random.default_rng(config.get('seed', 123))
+        self.flow_cfg = config.get('flow', {})
+        self.reward_cfg = config.get(
+            'reward', {'type': 'is_only', 'inv_penalty': 0.0}
+        )
+        self.action_fracs = np.array([0.0, 0.05, 0.1, 0.2, 0.4])
+        self.action_space = spaces.Discrete(len(self.action_fracs))
+        self.observation_space = spaces.Box(
+            low=-np.inf, high=np.inf, shape=(3,), dtype=np.float32
+        )
+        self.reset()
+
+    def reset(self, seed=None, options=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.book = OrderBook(100.0, self.tick, self.n_levels)
+        self.book.seed_book(self.init_depth, self.init_levels)
+        self.flow = OrderFlow(self.rng, **self.flow_cfg)
+        self.t = 0
+        self.inv = self.init_inventory
+        self.mid = self.book.mid
+        self.mid_hist = [self.mid]
+        self.cash = 0.0
+        self.done = False
+        return self._observe(), {}
+
+    def _buy(self, qty):
+        filled, notional = self.book.market_buy(qty)
+        self.cash -= notional + filled * self.fee
+        self.inv -= filled
+        return filled
+
+    def _advance(self, qty):
+        self._buy(qty)
+        self.flow.apply(self.book)
+        if abs(self.book.best_bid - self.book.center) > self.n_levels // 4:
+            self.book.recenter()
+        self.mid = self.book.mid
+        self.mid_hist.append(self.mid)
+        self.t += 1
+        terminated = self.t >= self.steps or self.inv == 0
+        reward = 0.0
+        info = {}
+        penalty = 0.0
+        if self.reward_cfg['type'] == 'is_plus_inv_pen':
+            penalty = self.reward_cfg.get('inv_penalty', 0.0)
+        reward -= penalty * self.inv**2
+        if terminated:
+            while self.inv > 0 and self._buy(self.inv) > 0:
+                pass
+            # the ask side ran dry: buy the rest off-book at a markup
+            unfilled = self.inv
+            price = self.mid * (1 + self.unfilled_cost)
+            self.cash -= unfilled * (price + self.fee)
+            self.inv = 0
+            ideal = self.mid_hist[0] * self.init_inventory
+            paid = -self.cash
+            reward -= paid - ideal + penalty * unfilled**2
+            info['unfilled'] = unfilled
+        return self._observe(), reward, terminated, False, info
+
+    def step(self, action):
+        frac = self.action_fracs[int(action)]
+        qty = min(self.inv, int(np.round(frac * self.inv)))
+        return self._advance(qty)
+
+    def run_schedule(self, schedule, seed=None):
+        """Execute a share schedule (e.g. TWAP/VWAP/AC) for one episode.
+
+        Fractional shares are rounded on the cumulative schedule so the
+        integer child orders still sum to `init_inventory`.
+
+        """
+
+        self.reset(seed=seed)
+        cum = np.round(np.cumsum(schedule)).astype(np.int64)
+        qtys = np.diff(cum, prepend=0)
+        done = False
+        for qty in qtys[: self.steps]:
+            _, _, done, _, info = self._advance(min(self.inv, int(qty)))
+            if done:
+                break
+        while not done:
+            _, _, done, _, info = self._advance(0)
+        paid = -self.cash
+        ideal = self.mid_hist[0] * self.init_inventory
+        return {
+            'IS': paid - ideal,
+            'paid': paid,
+            'ideal': ideal,
+            'unfilled': info['unfilled'],
+        }
+
+    def _observe(self):
+        tfrac = self.t / self.steps
+        rem = self.inv / max(self.init_inventory, 1)
+        last_ret = (
+            0.0
+            if len(self.mid_hist) < 2
+            else np.log(self.mid_hist[-1] / self.mid_hist[-2])
+        )
+        return np.array([tfrac, rem, last_ret], dtype=np.float32)
@@ -0,0 +1,178 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import numpy as np
+import gymnasium as gym
+from gymnasium import spaces
+
+
+def impact_matrix(diag, cross, n):
+    """Cross-impact matrix with `diag` on the diagonal.
+
+    Off-diagonal entries are `cross * sqrt(diag_i * diag_j)`, so `cross`
+    plays the role of a correlation between the assets' impact.
+
+    """
+
+    d = np.broadcast_to(np.asarray(diag, dtype=np.float64), (n,))
+    m = cross * np.sqrt(np.outer(d, d))
+    np.fill_diagonal(m, d)
+    return m
+
+
+class MultiAssetExecutionEnv(gym.Env):
+    """Basket buy program with linear cross-impact.
+
+    Same side and sign as `ExecutionEnv`: inventories, mids and cash are
+    (n_assets,) arrays, a trade vector `q` fills above the mid at
+    `mid * (1 + L @ (q / q0))` where `L` is the temporary cross-impact
+    matrix, and pushes mids up by the permanent matrix `G` the same way.
+    Fees are charged per share and per asset; `info['IS']` is
+    `paid - mid0 * q0` per asset and the terminal reward its negated sum.
+
+    """
+
+    metadata = {'render.modes': []}
+
+    def __init__(self, config):
+        super().__init__()
+        self.config = config
+        n = self.n_assets = config.get('n_assets', 10)
+        self.steps = config.get('steps', 50)
+        self.init_inventory = np.broadcast_to(
+            np.asarray(config.get('init_inventory', 1000), dtype=np.int64),
+            (n,),
+        ).copy()
+        self.fee = np.broadcast_to(
+            np.asarray(config.get('fee_per_share', 0.0001)), (n,)
+        )
+        temp_impact = config.get('impact_matrix')
+        if temp_impact is None:
+            temp_impact = impact_matrix(
+                config.get('impact_coeff', 2e-3),
+                config.get('cross_impact', 0.0),
+                n,
+            )
+        self.temp_impact = np.asarray(temp_impact, dtype=np.float64)
+        if self.temp_impact.shape != (n, n):
+            raise ValueError(f'impact_matrix must be ({n}, {n})')
+        self.perm_impact = impact_matrix(
+            config.get('perm_impact_coeff', 0.0),
+            config.get('cross_impact', 0.0),
+            n,
+        )
+        self.mu = config.get('gbm_mu', 0.00)
+        self.sigma = np.broadcast_to(
+            np.asarray(config.get('gbm_sigma', 0.02)), (n,)
+        )
+        self.corr = config.get('gbm_corr', 0.0)
+        self.dt = config.get('dt', 1.0)
+        cov = np.full((n, n), self.corr)
+        np.fill_diagonal(cov, 1.0)
+        self.chol = np.linalg.cholesky(cov) * self.sigma[:, None]
+        self.rng = np.random.default_rng(config.get('seed', 123))
+        self.action_type = config.get('action_type', 'discrete')
+        self.action_fracs = np.array([0.0, 0.05, 0.1, 0.2, 0.4])
+        if self.action_type == 'discrete':
+            self.action_space = spaces.MultiDiscrete(
+                np.full(n, len(self.action_fracs))
+            )
+        else:
+            self.action_space = spaces.Box(
+                low=0.0, high=1.0, shape=(n,), dtype=np.float32
+            )
+        self.observation_space = spaces.Box(
+            low=-np.inf, high=np.inf, shape=(1 + 2 * n,), dtype=np.float32
+        )
+        self._q0 = np.maximum(self.init_inventory, 1).astype(np.float64)
+        self.reset()
+
+    def reset(self, seed=None, options=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        n = self.n_assets
+        self.t = 0
+        self.inv = self.init_inventory.copy()
+        self.mid = np.full(n, 100.0)
+        self.mid0 = self.mid.copy()
+        self.last_ret = np.zeros(n)
+        self.cash = np.zeros(n)
+        return self._observe(), {}
+
+    def _fracs(self, action):
+        if self.action_type == 'discrete':
+            return self.action_fracs[np.asarray(action, dtype=np.int64)]
+        return np.clip(np.asarray(action, dtype=np.float64), 0.0, 1.0)
+
+    def _trade(self, qty):
+        x = qty / self._q0
+        price = self.mid * (1 + self.temp_impact @ x)
+        self.cash -= qty * (price + self.fee)
+        self.inv -= qty
+        return x
+
+    def _advance(self, qty):
+        x = self._trade(qty)
+        z = self.rng.standard_normal(self.n_assets)
+        drift = (self.mu - 0.5 * self.sigma**2) * self.dt
+        log_ret = drift + np.sqrt(self.dt) * (self.chol @ z)
+        mid = self.mid * np.exp(log_ret) * (1 + self.perm_impact @ x)
+        self.last_ret = np.log(mid / self.mid)
+        self.mid = mid
+        self.t += 1
+        terminated = self.t >= self.steps or not self.inv.any()
+        reward = 0.0
+        info = {}
+        if terminated:
+            self._trade(self.inv.copy())
+            ishort = -self.cash - self.mid0 * self.init_inventory
+            reward = -ishort.sum()
+            info['IS'] = ishort
+        return self._observe(), float(reward), terminated, False, info
+
+    def step(self, action):
+        frac = self._fracs(action)
+        qty = np.minimum(self.inv, np.round(frac * self.inv).astype(np.int64))
+        return self._advance(qty)
+
+    def run_schedule(self, schedule, seed=None):
+        """Execute a (steps, n_assets) share schedule for one episode.
+
+        Fractional shares are rounded on the cumulative schedule per asset
+        so the child orders still sum to each asset's initial inventory.
+        Returns the per-asset implementation shortfall.
+
+        """
+
+        self.reset(seed=seed)
+        cum = np.round(np.cumsum(schedule, axis=0)).astype(np.int64)
+        qtys = np.diff(cum, axis=0, prepend=0)
+        done, t, info = False, 0, {}
+        while not done:
+            qty = qtys[t] if t < len(qtys) else np.zeros_like(self.inv)
+            _, _, done, _, info = self._advance(np.minimum(self.inv, qty))
+            t += 1
+        return info['IS']
+
+    def _observe(self):
+        obs = np.empty(1 + 2 * self.n_assets, dtype=np.float32)
+        obs[0] = self.t / self.steps
+        obs[1 : 1 + self.n_assets] = self.inv / self._q0
+        obs[1 + self.n_assets :] = self.last_ret
+        return obs
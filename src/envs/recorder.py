@@ -0,0 +1,249 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from operator import attrgetter
+import json
+from pathlib import Path
+
+import gymnasium as gym
+import numpy as np
+import pyarrow as pa
+
+# column name -> env attribute read after every step; array-valued
+# attributes become fixed-size list columns
+ATTRS = {
+    'exec': {'inventory': 'inv', 'cash': 'cash', 'mid': 'mid'},
+    'alloc': {'weights': 'w', 'equity': 'equity'},
+}
+INFO_KEYS = {'exec': (), 'alloc': ('turnover',)}
+IPC_SUFFIXES = ('.arrow', '.ipc', '.feather')
+
+
+def _column(buf):
+    if buf.ndim == 1:
+        return pa.array(buf)
+    return pa.FixedSizeListArray.from_arrays(
+        pa.array(buf.reshape(-1)), buf.shape[1]
+    )
+
+
+class TrajectoryWriter:
+    """A Parquet or Arrow IPC file that recorders append tables to.
+
+    The file is opened on the first table and every later one must share
+    its schema. Several recorders of one env kind may write to the same
+    writer; each flush lands as one row group / record batch.
+
+    """
+
+    def __init__(self, path, obs_shape):
+        self.path = Path(path)
+        self.obs_shape = obs_shape
+        self._writer = None
+
+    def write(self, table):
+        if self._writer is None:
+            self._open(table.schema)
+        self._writer.write_table(table)
+
+    def _open(self, schema):
+        schema = schema.with_metadata(
+            {'obs_shape': json.dumps(list(self.obs_shape))}
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.suffix in IPC_SUFFIXES:
+            self._writer = pa.ipc.new_file(str(self.path), schema)
+        else:
+            import pyarrow.parquet as pq
+
+            # dictionary-encoding the float columns costs more than
+            # snappy and rarely pays off; keep it for the index columns
+            self._writer = pq.ParquetWriter(
+                str(self.path), schema, use_dictionary=['episode', 'step']
+            )
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class TrajectoryRecorder(gym.Wrapper):
+    """Record every step of an env into columns on disk.
+
+    Each row holds `episode` and `step` indices, the observation the
+    action was taken on (flattened), the action, the reward, env
+    attributes read after the step (`ATTRS`, e.g. inventory and cash or
+    portfolio weights and equity) and `info` keys such as turnover.
+
+    Each step stores one flat tuple (the observation, action, reward,
+    `info` and the attributes from a single `attrgetter` call) in a
+    preallocated slot list, and episode/step indices are derived from
+    the reset positions. Observations, actions and array attributes are
+    kept by reference until the flush, so the env must not modify them
+    in place (the envs here return fresh arrays every step). Full chunks
+    are written as one Parquet row group, or one Arrow IPC record batch
+    when `path` ends in `.arrow`/`.ipc`/`.feather` (faster to write, and
+    polars memory-maps it).
+
+    With 1024-row IPC chunks as in `run_episodes`, recording costs about
+    1.7 us per `ExecutionEnv` step (+30% over a 5.5 us step) and 4-5 us
+    per `AllocationEnv` step with 8 assets and a 60-day window (+15-25%);
+    see `exec_env_recorded` and `alloc_env_recorded` in
+    `benchmarks/bench.py`. Writing scalars into preallocated numpy
+    columns instead is slower per step. Call `close()` to flush the last
+    chunk.
+
+    `path` may also be a shared `TrajectoryWriter`, which `close()` leaves
+    open, and episodes are numbered from `first_episode`; `run_episodes`
+    uses both to write one file per chunk of episodes.
+
+    Other attributes are forwarded to the wrapped env, so the recorder
+    can stand in for it in `evaluate_exec` and `evaluate_alloc`.
+
+    """
+
+    def __init__(
+        self,
+        env,
+        path,
+        kind=None,
+        chunk_size=8192,
+        attrs=None,
+        info_keys=None,
+        first_episode=0,
+    ):
+        super().__init__(env)
+        if kind is None:
+            kind = 'exec' if hasattr(env.unwrapped, 'inv') else 'alloc'
+        self.chunk_size = chunk_size
+        attrs = ATTRS[kind] if attrs is None else attrs
+        self.attr_names = list(attrs)
+        # one C call returning every attribute; a 1-tuple for one name
+        getter = attrgetter(*attrs.values())
+        self._get = getter if len(attrs) > 1 else lambda e: (getter(e),)
+        self.info_keys = tuple(
+            INFO_KEYS[kind] if info_keys is None else info_keys
+        )
+        self.obs_shape = env.observation_space.shape
+        self._owns_writer = not isinstance(path, TrajectoryWriter)
+        if self._owns_writer:
+            path = TrajectoryWriter(path, self.obs_shape)
+        self.writer = path
+        self.path = path.path
+        self.episode = first_episode - 1
+        self.n = 0
+        self.rows = 0
+        self._unwrapped = env.unwrapped
+        self._slots = [None] * chunk_size
+        # rows of this chunk where an episode began; episode and step
+        # columns are derived from them when the chunk is flushed
+        self._starts = []
+        self._chunk_episode = first_episode - 1
+        self._chunk_step = 0
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name == 'env':
+            raise AttributeError(name)
+        return getattr(self.env, name)
+
+    def reset(self, **kwargs):
+        obs, info = self.env.reset(**kwargs)
+        self.episode += 1
+        self._starts.append(self.n)
+        self._last_obs = obs
+        return obs, info
+
+    def step(self, action):
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        n = self.n
+        self._slots[n] = (self._last_obs, action, reward, info) + self._get(
+            self._unwrapped
+        )
+        self._last_obs = obs
+        self.n = n = n + 1
+        if n == self.chunk_size:
+            self.flush()
+        return obs, reward, terminated, truncated, info
+
+    def _index(self, n):
+        starts = np.array(self._starts, dtype=np.int64)
+        rows = np.arange(n)
+        # resets up to each row, and the row its episode began at
+        k = np.searchsorted(starts, rows, side='right')
+        origin = np.concatenate([[-self._chunk_step], starts])
+        return self._chunk_episode + k, rows - origin[k]
+
+    def _table(self, n, episode, step):
+        obs, action, reward, infos, *values = zip(*self._slots[:n])
+        cols = {
+            'episode': _column(episode),
+            'step': _column(step),
+            'obs': _column(np.asarray(obs, dtype=np.float32).reshape(n, -1)),
+            'action': _column(np.asarray(action)),
+            'reward': _column(np.array(reward, dtype=np.float64)),
+        }
+        for key in self.info_keys:
+            cols[key] = _column(
+                np.array([info.get(key, np.nan) for info in infos])
+            )
+        for name, column in zip(self.attr_names, values):
+            cols[name] = _column(np.asarray(column))
+        return pa.table(cols)
+
+    def flush(self):
+        """Write the buffered rows as one row group / record batch."""
+
+        if not self.n:
+            return
+        episode, step = self._index(self.n)
+        self.writer.write(self._table(self.n, episode, step))
+        self.rows += self.n
+        # a reset after the last step starts the next chunk
+        self._starts = [0 for s in self._starts if s == self.n]
+        self._chunk_episode = self.episode - len(self._starts)
+        self._chunk_step = int(step[-1]) + 1
+        self._slots[: self.n] = [None] * self.n
+        self.n = 0
+
+    def close(self):
+        self.flush()
+        if self._owns_writer:
+            self.writer.close()
+        return self.env.close()
+
+
+def load_trajectories(path):
+    """Lazy polars frame over a recording; IPC files are memory-mapped.
+
+    `path` may be a directory of per-chunk files from `run_episodes`,
+    which are scanned together; sort by `episode` and `step` for the
+    step order.
+
+    """
+
+    import polars as pl
+
+    path = Path(path)
+    files = sorted(path.iterdir()) if path.is_dir() else [path]
+    if not files:
+        raise FileNotFoundError(f'no recordings in {path}')
+    if files[0].suffix in IPC_SUFFIXES:
+        return pl.scan_ipc(files)
+    return pl.scan_parquet(files)
@@ -0,0 +1,289 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from argparse import ArgumentParser
+import hashlib
+import json
+import os
+from pathlib import Path
+import time
+
+import numpy as np
+
+
+def _gbm(rng, n, steps, dt, mu=0.0, sigma=0.02):
+    z = rng.standard_normal((n, steps))
+    log_ret = (mu - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * z
+    return log_ret
+
+
+def _garch(rng, n, steps, dt, mu=0.0, sigma=0.02, alpha=0.08, beta=0.9):
+    # sigma is the unconditional per-step vol, omega follows from it
+    z = rng.standard_normal((n, steps))
+    omega = sigma**2 * (1.0 - alpha - beta)
+    var = np.full(n, sigma**2)
+    log_ret = np.empty((n, steps))
+    for t in range(steps):
+        eps = np.sqrt(var * dt) * z[:, t]
+        log_ret[:, t] = (mu - 0.5 * var) * dt + eps
+        var = omega + alpha * eps**2 / dt + beta * var
+    return log_ret
+
+
+def _jump(
+    rng,
+    n,
+    steps,
+    dt,
+    mu=0.0,
+    sigma=0.02,
+    jump_rate=0.05,
+    jump_mu=-0.01,
+    jump_sigma=0.03,
+):
+    # Merton jump-diffusion, compensated so jumps do not shift the drift
+    z = rng.standard_normal((n, steps))
+    k = rng.poisson(jump_rate * dt, size=(n, steps))
+    zj = rng.standard_normal((n, steps))
+    jumps = k * jump_mu + np.sqrt(k) * jump_sigma * zj
+    comp = jump_rate * (np.exp(jump_mu + 0.5 * jump_sigma**2) - 1.0)
+    drift = (mu - 0.5 * sigma**2 - comp) * dt
+    return drift + sigma * np.sqrt(dt) * z + jumps
+
+
+def _regime(
+    rng,
+    n,
+    steps,
+    dt,
+    mu=0.0,
+    sigma=0.02,
+    sigma_high=0.05,
+    p_up=0.02,
+    p_down=0.1,
+):
+    # two-state Markov chain: calm (sigma) and stressed (sigma_high)
+    z = rng.standard_normal((n, steps))
+    u = rng.random((n, steps))
+    state = np.zeros(n, dtype=bool)
+    vol = np.empty((n, steps))
+    for t in range(steps):
+        vol[:, t] = np.where(state, sigma_high, sigma)
+        state = np.where(state, u[:, t] >= p_down, u[:, t] < p_up)
+    return (mu - 0.5 * vol**2) * dt + vol * np.sqrt(dt) * z
+
+
+MODELS = {
+    'gbm': _gbm,
+    'garch': _garch,
+    'jump': _jump,
+    'regime': _regime,
+}
+
+
+def sample_path(rng, model, steps, mid0=100.0, dt=1.0, **params):
+    """One mid path of shape (steps + 1,) drawn from `rng`."""
+
+    path = np.empty(steps + 1)
+    path[0] = mid0
+    np.cumsum(MODELS[model](rng, 1, steps, dt, **params)[0], out=path[1:])
+    np.exp(path[1:], out=path[1:])
+    path[1:] *= mid0
+    return path
+
+
+def _block(model, block, block_size, steps, seed, mid0, dt, params):
+    ss = np.random.SeedSequence(seed, spawn_key=(block,))
+    rng = np.random.default_rng(ss)
+    log_ret = MODELS[model](rng, block_size, steps, dt, **params)
+    paths = np.empty((block_size, steps + 1))
+    paths[:, 0] = mid0
+    np.cumsum(log_ret, axis=1, out=paths[:, 1:])
+    np.exp(paths[:, 1:], out=paths[:, 1:])
+    paths[:, 1:] *= mid0
+    return paths
+
+
+def generate_paths(
+    model,
+    n_paths,
+    steps,
+    seed=123,
+    start=0,
+    block_size=1024,
+    mid0=100.0,
+    dt=1.0,
+    **params,
+):
+    """Generate mid-price paths of shape (n_paths, steps + 1).
+
+    Path `i` is drawn from the RNG stream of block `i // block_size`, so
+    `generate_paths(..., n_paths=1, start=i)` recreates it exactly without
+    generating the rest of the bank. Column 0 is the arrival price `mid0`.
+
+    """
+
+    if model not in MODELS:
+        raise ValueError(f'unknown scenario model: {model}')
+    out = np.empty((n_paths, steps + 1))
+    first, last = start // block_size, (start + n_paths - 1) // block_size
+    for b in range(first, last + 1):
+        block = _block(model, b, block_size, steps, seed, mid0, dt, params)
+        lo = max(start, b * block_size)
+        hi = min(start + n_paths, (b + 1) * block_size)
+        out[lo - start : hi - start] = block[
+            lo - b * block_size : hi - b * block_size
+        ]
+    return out
+
+
+def _meta_path(path):
+    return Path(path).with_suffix('.json')
+
+
+def _fingerprint(paths):
+    # first and last path identify a bank's contents without reading it all
+    h = hashlib.sha1(np.ascontiguousarray(paths[0]).tobytes())
+    h.update(np.ascontiguousarray(paths[-1]).tobytes())
+    return h.hexdigest()
+
+
+class PathBank:
+    """Read-only, memory-mapped bank of pre-generated mid-price paths.
+
+    The array is opened with `mmap_mode='r'` so every process reading the
+    same file shares the page cache. Pickling only carries the file name,
+    which keeps subprocess workers from copying the paths. The `.json`
+    meta carries a fingerprint of the array, so a reader racing a rewrite
+    retries until it holds a matching pair.
+
+    """
+
+    def __init__(self, path, retries=20):
+        self.path = Path(path)
+        for _ in range(retries):
+            self.meta = json.loads(_meta_path(self.path).read_text())
+            self.paths = np.load(self.path, mmap_mode='r')
+            expected = self.meta.get('fingerprint')
+            if expected is None or expected == _fingerprint(self.paths):
+                return
+            time.sleep(0.05)
+        raise ValueError(f'{self.path} does not match its meta')
+
+    def __len__(self):
+        return self.paths.shape[0]
+
+    def __getitem__(self, idx):
+        return self.paths[idx]
+
+    @property
+    def steps(self):
+        return self.paths.shape[1] - 1
+
+    def __getstate__(self):
+        return {'path': str(self.path)}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    @classmethod
+    def write(
+        cls,
+        path,
+        model,
+        n_paths,
+        steps,
+        seed=123,
+        block_size=1024,
+        mid0=100.0,
+        dt=1.0,
+        **params,
+    ):
+        """Generate a bank block by block and write it atomically."""
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        arr = np.lib.format.open_memmap(
+            tmp, mode='w+', dtype=np.float64, shape=(n_paths, steps + 1)
+        )
+        for lo in range(0, n_paths, block_size):
+            n = min(block_size, n_paths - lo)
+            arr[lo : lo + n] = generate_paths(
+                model,
+                n,
+                steps,
+                seed=seed,
+                start=lo,
+                block_size=block_size,
+                mid0=mid0,
+                dt=dt,
+                **params,
+            )
+        arr.flush()
+        fingerprint = _fingerprint(arr)
+        del arr
+        meta = {
+            'model': model,
+            'n_paths': n_paths,
+            'steps': steps,
+            'seed': seed,
+            'block_size': block_size,
+            'mid0': mid0,
+            'dt': dt,
+            'params': params,
+            'fingerprint': fingerprint,
+        }
+        # meta first: whoever sees the new array also sees its meta, and
+        # a reader pairing new meta with the old array retries
+        tmp_meta = tmp.with_suffix('.json')
+        tmp_meta.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp_meta, _meta_path(path))
+        os.replace(tmp, path)
+        return cls(path)
+
+
+def bank_from_env_cfg(cfg):
+    """Open the bank named by `path_bank` in an env config, if any."""
+
+    bank = cfg.get('path_bank')
+    return None if bank is None else PathBank(bank)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--out', type=Path, required=True)
+    parser.add_argument('--model', choices=sorted(MODELS), default='gbm')
+    parser.add_argument('--n-paths', type=int, default=100_000)
+    parser.add_argument('--steps', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=123)
+    parser.add_argument('--sigma', type=float, default=0.02)
+    parser.add_argument('--mu', type=float, default=0.0)
+    parser.add_argument('--dt', type=float, default=1.0)
+    args = parser.parse_args()
+    PathBank.write(
+        args.out,
+        args.model,
+        args.n_paths,
+        args.steps,
+        seed=args.seed,
+        dt=args.dt,
+        mu=args.mu,
+        sigma=args.sigma,
+    )
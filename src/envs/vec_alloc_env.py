@@ -0,0 +1,173 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import numpy as np
+from gymnasium import spaces
+from numpy.lib.stride_tricks import sliding_window_view
+from stable_baselines3.common.vec_env import VecEnv
+
+from utils.price_store import PriceStore
+
+
+class VecAllocationEnv(VecEnv):
+    """Batched `AllocationEnv` stepping many start offsets in lockstep.
+
+    Every lane runs `episode_len` rebalances from its own start date.
+    Observation windows and rebalance segments are strided views into one
+    shared returns array, and segment returns for all lanes come out of a
+    single einsum.
+
+    """
+
+    metadata = {'render_modes': []}
+    render_mode = None
+
+    def __init__(
+        self,
+        prices,
+        n_envs=64,
+        window=60,
+        rebalance_every=5,
+        cost_bps=2.0,
+        reward_cfg=None,
+        episode_len=None,
+        seed=None,
+    ):
+        if isinstance(prices, PriceStore):
+            self.prices = prices.prices
+            self.returns = prices.returns
+            obs_returns = prices.returns32
+        else:
+            self.prices = prices
+            self.returns = np.log(prices[1:] / prices[:-1])
+            obs_returns = self.returns.astype(np.float32)
+        self.T, self.N = self.returns.shape
+        self.window = window
+        self.k = rebalance_every
+        self.cost = cost_bps * 1e-4
+        self.reward_cfg = reward_cfg or {
+            'type': 'ret_minus_lambda_vol',
+            'lambda_vol': 5.0e-2,
+        }
+        self.episode_len = episode_len or (self.T - window) // self.k
+        if window + self.k * self.episode_len > self.T:
+            raise ValueError('episode_len does not fit in the price history')
+        self.rng = np.random.default_rng(seed)
+
+        # (T - window + 1, N, window) and (T - k + 1, N, k) read-only views
+        self._windows = sliding_window_view(obs_returns, window, axis=0)
+        self._segments = sliding_window_view(self.returns, self.k, axis=0)
+
+        super().__init__(
+            n_envs,
+            spaces.Box(
+                low=-np.inf,
+                high=np.inf,
+                shape=(self.window, self.N),
+                dtype=np.float32,
+            ),
+            spaces.Box(low=0.0, high=1.0, shape=(self.N,), dtype=np.float32),
+        )
+        n = self.num_envs
+        self.t = np.zeros(n, dtype=np.int64)
+        self.n_steps = np.zeros(n, dtype=np.int64)
+        self.w = np.zeros((n, self.N))
+        self.equity = np.zeros(n)
+        self._actions = np.zeros((n, self.N))
+        self._reset_lanes(np.ones(n, dtype=bool))
+
+    def _reset_lanes(self, mask):
+        hi = self.T - self.k * self.episode_len
+        self.t[mask] = self.rng.integers(self.window, hi + 1, size=mask.sum())
+        self.n_steps[mask] = 0
+        self.w[mask] = 1.0 / self.N
+        self.equity[mask] = 1.0
+
+    def _observe(self):
+        return self._windows[self.t - self.window].transpose(0, 2, 1)
+
+    def _reward(self, seg_ret, port):
+        if self.reward_cfg['type'] == 'ret_minus_lambda_vol':
+            vol = np.sqrt(port.var(axis=1) + 1e-12)
+            return seg_ret - self.reward_cfg['lambda_vol'] * vol
+        elif self.reward_cfg['type'] == 'sharpe_proxy':
+            mean = port.mean(axis=1)
+            std = np.sqrt(port.var(axis=1) + 1e-12)
+            return mean / (std + 1e-6)
+        return seg_ret
+
+    def reset(self):
+        if self._seeds[0] is not None:
+            self.rng = np.random.default_rng(self._seeds[0])
+        self._reset_lanes(np.ones(self.num_envs, dtype=bool))
+        self._reset_seeds()
+        self._reset_options()
+        return self._observe()
+
+    def step_async(self, actions):
+        self._actions = np.asarray(actions, dtype=np.float64).reshape(
+            self.num_envs, self.N
+        )
+
+    def step_wait(self):
+        a = np.maximum(self._actions, 0.0)
+        a /= np.clip(a.sum(axis=1, keepdims=True), 1e-6, None)
+
+        # transaction costs on turnover
+        turnover = np.abs(a - self.w).sum(axis=1)
+        tc = self.cost * turnover
+
+        # per-period returns under the old and the new weights, (2, B, k)
+        segs = self._segments[self.t]
+        port = np.einsum('bnk,wbn->wbk', segs, np.stack([self.w, a]))
+        seg_ret = port[0].sum(axis=1)
+        self.equity *= np.exp(seg_ret) * (1 - tc)
+        self.w = a
+        self.t += self.k
+        self.n_steps += 1
+        dones = self.n_steps >= self.episode_len
+        rewards = self._reward(seg_ret, port[1]).astype(np.float32)
+
+        obs = self._observe()
+        infos = [{'turnover': x} for x in turnover.tolist()]
+        if dones.any():
+            for i in np.flatnonzero(dones):
+                infos[i]['terminal_observation'] = obs[i].copy()
+                infos[i]['TimeLimit.truncated'] = False
+            self._reset_lanes(dones)
+            obs = obs.copy()
+            obs[dones] = self._observe()[dones]
+        return obs, rewards, dones, infos
+
+    def close(self):
+        pass
+
+    def get_attr(self, attr_name, indices=None):
+        value = getattr(self, attr_name)
+        return [value for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **kwargs):
+        result = getattr(self, method_name)(*method_args, **kwargs)
+        return [result for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
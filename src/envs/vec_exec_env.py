@@ -0,0 +1,175 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+
+from envs.scenarios import bank_from_env_cfg, sample_path
+
+
+class VecExecutionEnv(VecEnv):
+    """Batched execution environment stepping `n_envs` episodes at once.
+
+    Mirrors `ExecutionEnv` lane by lane: state is held in arrays of shape
+    (n_envs,) and finished lanes are reset automatically, with the last
+    observation stored in `info['terminal_observation']` as SB3 expects.
+    Lane `i` draws from its own generator, seeded with `seed + i` (or the
+    `i`-th `seed()` value), like an `ExecutionEnv` with that seed.
+
+    """
+
+    metadata = {'render_modes': []}
+    render_mode = None
+
+    def __init__(self, config, n_envs=256):
+        self.config = config
+        self.steps = config.get('steps', 50)
+        self.init_inventory = config.get('init_inventory', 1000)
+        self.fee = config.get('fee_per_share', 0.0001)
+        self.impact = config.get('impact_coeff', 2e-3)
+        self.mu = config.get('gbm_mu', 0.00)
+        self.sigma = config.get('gbm_sigma', 0.02)
+        self.dt = config.get('dt', 1.0)
+        self.reward_cfg = config.get(
+            'reward', {'type': 'is_only', 'inv_penalty': 0.0}
+        )
+        seed = config.get('seed', 123)
+        self.rngs = [np.random.default_rng(seed + i) for i in range(n_envs)]
+        self.bank = bank_from_env_cfg(config)
+        if self.bank is not None and self.bank.steps < self.steps:
+            raise ValueError('path bank is shorter than the episode')
+        self.action_fracs = np.array([0.0, 0.05, 0.1, 0.2, 0.4])
+        super().__init__(
+            n_envs,
+            spaces.Box(low=-np.inf, high=np.inf, shape=(3,), dtype=np.float32),
+            spaces.Discrete(len(self.action_fracs)),
+        )
+
+        n = self.num_envs
+        self.t = np.zeros(n, dtype=np.int64)
+        self.inv = np.zeros(n, dtype=np.int64)
+        self.mid = np.zeros(n)
+        self.mid0 = np.zeros(n)
+        self.path_idx = np.zeros(n, dtype=np.int64)
+        self.paths = (
+            None if self.bank is not None else np.zeros((n, self.steps + 1))
+        )
+        self.last_ret = np.zeros(n)
+        self.cash = np.zeros(n)
+        self._obs = np.zeros((n, 3), dtype=np.float32)
+        self._actions = np.zeros(n, dtype=np.int64)
+        self._reset_lanes(np.ones(n, dtype=bool))
+
+    def _reset_lanes(self, mask):
+        self.t[mask] = 0
+        self.inv[mask] = self.init_inventory
+        if self.bank is not None:
+            for i in np.flatnonzero(mask):
+                self.path_idx[i] = self.rngs[i].integers(len(self.bank))
+            self.mid[mask] = self.bank.paths[self.path_idx[mask], 0]
+        else:
+            for i in np.flatnonzero(mask):
+                self.paths[i] = sample_path(
+                    self.rngs[i],
+                    'gbm',
+                    self.steps,
+                    dt=self.dt,
+                    mu=self.mu,
+                    sigma=self.sigma,
+                )
+            self.mid[mask] = self.paths[mask, 0]
+        self.mid0[mask] = self.mid[mask]
+        self.last_ret[mask] = 0.0
+        self.cash[mask] = 0.0
+
+    def _observe(self):
+        obs = self._obs
+        obs[:, 0] = self.t / self.steps
+        obs[:, 1] = self.inv / max(self.init_inventory, 1)
+        obs[:, 2] = self.last_ret
+        return obs.copy()
+
+    def reset(self):
+        for i, seed in enumerate(self._seeds):
+            if seed is not None:
+                self.rngs[i] = np.random.default_rng(seed)
+        self._reset_lanes(np.ones(self.num_envs, dtype=bool))
+        self._reset_seeds()
+        self._reset_options()
+        return self._observe()
+
+    def step_async(self, actions):
+        self._actions = np.asarray(actions).reshape(self.num_envs)
+
+    def step_wait(self):
+        denom = max(self.init_inventory, 1)
+        frac = self.action_fracs[self._actions.astype(np.int64)]
+        qty = np.minimum(self.inv, np.round(frac * self.inv).astype(np.int64))
+        trade_price = self.mid * (1 + self.impact * (qty / denom))
+        self.cash -= qty * (trade_price + self.fee)
+        self.inv -= qty
+        self.t += 1
+        if self.bank is not None:
+            mid = self.bank.paths[self.path_idx, self.t]
+        else:
+            mid = self.paths[np.arange(self.num_envs), self.t]
+        self.last_ret = np.log(mid / self.mid)
+        self.mid = mid
+        dones = (self.t >= self.steps) | (self.inv == 0)
+
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        if self.reward_cfg['type'] == 'is_plus_inv_pen':
+            rewards -= self.reward_cfg.get('inv_penalty', 0.0) * self.inv**2
+        if dones.any():
+            # buy what is left at the impacted mid
+            liq = dones & (self.inv > 0)
+            liq_price = self.mid * (1 + self.impact * (self.inv / denom))
+            self.cash -= np.where(liq, self.inv * (liq_price + self.fee), 0.0)
+            self.inv[dones] = 0
+            ideal = self.mid0 * self.init_inventory
+            ishort = -self.cash - ideal
+            rewards[dones] -= ishort[dones]
+
+        obs = self._observe()
+        infos = [{} for _ in range(self.num_envs)]
+        if dones.any():
+            for i in np.flatnonzero(dones):
+                infos[i]['terminal_observation'] = obs[i].copy()
+                infos[i]['TimeLimit.truncated'] = False
+            self._reset_lanes(dones)
+            obs[dones] = self._observe()[dones]
+        return obs, rewards, dones, infos
+
+    def close(self):
+        pass
+
+    def get_attr(self, attr_name, indices=None):
+        value = getattr(self, attr_name)
+        return [value for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **kwargs):
+        result = getattr(self, method_name)(*method_args, **kwargs)
+        return [result for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
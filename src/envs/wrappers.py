@@ -0,0 +1,49 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import time
+
+from stable_baselines3.common.vec_env import VecEnvWrapper
+
+from utils.profiling import PROFILER
+
+
+class ProfiledVecEnv(VecEnvWrapper):
+    """Record batched `step_wait` latency of a VecEnv in `PROFILER`.
+
+    With `SubprocVecEnv` this is the wait for the slowest worker.
+
+    """
+
+    def __init__(self, venv, name=None):
+        super().__init__(venv)
+        self.name = name or type(venv).__name__
+
+    def reset(self):
+        t0 = time.perf_counter_ns()
+        obs = self.venv.reset()
+        PROFILER.record(f'{self.name}.reset', t0, time.perf_counter_ns() - t0)
+        return obs
+
+    def step_wait(self):
+        t0 = time.perf_counter_ns()
+        out = self.venv.step_wait()
+        PROFILER.record(f'{self.name}.step', t0, time.perf_counter_ns() - t0)
+        PROFILER.count(f'{self.name}.steps', self.num_envs)
+        return out
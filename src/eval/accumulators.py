@@ -0,0 +1,306 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import math
+
+import numpy as np
+
+
+class Moments:
+    """Welford running mean and (population) variance.
+
+    `merge` uses Chan et al.'s pairwise update, so statistics pushed into
+    separate accumulators combine to those of the concatenated stream.
+
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, x):
+        x = np.asarray(x, dtype=np.float64).ravel()
+        if x.size == 1:
+            self.n += 1
+            delta = x[0] - self.mean
+            self.mean += delta / self.n
+            self.m2 += delta * (x[0] - self.mean)
+        elif x.size:
+            batch = Moments()
+            batch.n = x.size
+            batch.mean = float(x.mean())
+            batch.m2 = float(((x - batch.mean) ** 2).sum())
+            self.merge(batch)
+        return self
+
+    def merge(self, other):
+        n = self.n + other.n
+        if n == 0:
+            return self
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta**2 * self.n * other.n / n
+        self.n = n
+        return self
+
+    @property
+    def var(self):
+        return self.m2 / self.n if self.n else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.var)
+
+    @property
+    def total(self):
+        return self.mean * self.n
+
+
+class Drawdown:
+    """Running peak and max drawdown of an equity curve fed log returns.
+
+    Kept in log space as (total, peak, trough, drawdown) relative to the
+    start of the stream; `merge(other)` appends `other`'s stream after
+    this one.
+
+    """
+
+    def __init__(self):
+        self.total = 0.0
+        self.peak = 0.0
+        self.trough = 0.0
+        self.dd = 0.0
+
+    def push(self, log_ret):
+        x = np.asarray(log_ret, dtype=np.float64).ravel()
+        if not x.size:
+            return self
+        path = self.total + np.cumsum(x)
+        peak = np.maximum(np.maximum.accumulate(path), self.peak)
+        self.dd = max(self.dd, float((peak - path).max()))
+        self.peak = float(peak[-1])
+        self.trough = min(self.trough, float(path.min()))
+        self.total = float(path[-1])
+        return self
+
+    def merge(self, other):
+        self.dd = max(self.dd, other.dd, self.peak - self.total - other.trough)
+        self.peak = max(self.peak, self.total + other.peak)
+        self.trough = min(self.trough, self.total + other.trough)
+        self.total += other.total
+        return self
+
+    @property
+    def value(self):
+        """Max drawdown as in `max_drawdown`, a fraction <= 0."""
+
+        return math.expm1(-self.dd)
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with relative accuracy `alpha`.
+
+    Values fall into logarithmic buckets `gamma^(i-1) < |x| <= gamma^i`
+    (DDSketch), separately for each sign. Merging adds bucket counts, so
+    it is exact, and memory grows only with the log of the value range.
+
+    """
+
+    def __init__(self, alpha=0.01):
+        self.alpha = alpha
+        self.log_gamma = math.log((1 + alpha) / (1 - alpha))
+        self.pos = {}
+        self.neg = {}
+        self.zeros = 0
+        self.n = 0
+
+    def _add(self, store, x):
+        idx, counts = np.unique(
+            np.ceil(np.log(x) / self.log_gamma).astype(np.int64),
+            return_counts=True,
+        )
+        for i, c in zip(idx.tolist(), counts.tolist()):
+            store[i] = store.get(i, 0) + c
+
+    def push(self, x):
+        x = np.asarray(x, dtype=np.float64).ravel()
+        self.n += x.size
+        self._add(self.pos, x[x > 0])
+        self._add(self.neg, -x[x < 0])
+        self.zeros += int((x == 0).sum())
+        return self
+
+    def merge(self, other):
+        for mine, theirs in ((self.pos, other.pos), (self.neg, other.neg)):
+            for i, c in theirs.items():
+                mine[i] = mine.get(i, 0) + c
+        self.zeros += other.zeros
+        self.n += other.n
+        return self
+
+    def state(self):
+        """Bucket counts as a JSON-ready dict, see `from_state`."""
+
+        return {
+            'alpha': self.alpha,
+            'pos': self.pos,
+            'neg': self.neg,
+            'zeros': self.zeros,
+            'n': self.n,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        sketch = cls(state['alpha'])
+        # JSON turns the bucket indices into strings
+        sketch.pos = {int(i): c for i, c in state['pos'].items()}
+        sketch.neg = {int(i): c for i, c in state['neg'].items()}
+        sketch.zeros = state['zeros']
+        sketch.n = state['n']
+        return sketch
+
+    def _value(self, i):
+        gamma = math.exp(self.log_gamma)
+        return 2 * gamma**i / (gamma + 1)
+
+    def quantile(self, q):
+        if not self.n:
+            return float('nan')
+        rank = q * (self.n - 1)
+        seen = 0
+        for i in sorted(self.neg, reverse=True):
+            seen += self.neg[i]
+            if seen > rank:
+                return -self._value(i)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for i in sorted(self.pos):
+            seen += self.pos[i]
+            if seen > rank:
+                return self._value(i)
+        return self._value(max(self.pos))
+
+
+def vwap_price(mids, volume=None):
+    """Volume-weighted mid over an episode; uniform volume gives TWAP."""
+
+    mids = np.asarray(mids, dtype=np.float64)
+    if volume is None:
+        return float(mids.mean())
+    volume = np.asarray(volume, dtype=np.float64)
+    return float((mids * volume).sum() / volume.sum())
+
+
+class ExecMetrics:
+    """IS moments and tail quantiles plus slippage vs VWAP, per episode."""
+
+    QUANTILES = (0.05, 0.5, 0.95)
+
+    def __init__(self, alpha=0.01):
+        self.shortfall = Moments()
+        self.tails = QuantileSketch(alpha)
+        self.slippage = Moments()
+
+    def push(self, ishort, avg_price=None, vwap=None):
+        self.shortfall.push(ishort)
+        self.tails.push(ishort)
+        if avg_price is not None:
+            self.slippage.push((avg_price - vwap) / vwap * 1e4)
+        return self
+
+    def merge(self, other):
+        self.shortfall.merge(other.shortfall)
+        self.tails.merge(other.tails)
+        self.slippage.merge(other.slippage)
+        return self
+
+    def result(self):
+        out = {
+            'IS_mean': float(self.shortfall.mean),
+            'IS_std': float(self.shortfall.std),
+        }
+        for q in self.QUANTILES:
+            out[f'IS_p{round(q * 100):02d}'] = self.tails.quantile(q)
+        if self.slippage.n:
+            out['slippage_vwap_bps'] = float(self.slippage.mean)
+        return out
+
+
+class AllocMetrics:
+    """Reward Sharpe and drawdown plus annualized return, vol and turnover.
+
+    `push` takes one rebalance: the env reward, the portfolio log return
+    (from `env.equity`) and the turnover from `info`. Sharpe and MaxDD are
+    computed on rewards, like `evaluate_alloc`; MaxDD is the worst over
+    finished episodes and the running one. With `keep_rewards`, `episodes`
+    also holds the reward series of every finished episode, for bootstrap
+    CIs.
+
+    """
+
+    def __init__(self, periods_per_year=252 / 5, keep_rewards=False):
+        self.periods_per_year = periods_per_year
+        self.rewards = Moments()
+        self.returns = Moments()
+        self.turnover = Moments()
+        self.drawdown = Drawdown()
+        self.worst = 0.0
+        self.episodes = [] if keep_rewards else None
+        self._running = []
+
+    def push(self, reward, log_ret=None, turnover=None):
+        self.rewards.push(reward)
+        self.drawdown.push(reward)
+        if self.episodes is not None:
+            self._running.append(np.asarray(reward, np.float64).ravel())
+        if log_ret is not None:
+            self.returns.push(log_ret)
+        if turnover is not None:
+            self.turnover.push(turnover)
+        return self
+
+    def end_episode(self):
+        self.worst = min(self.worst, self.drawdown.value)
+        self.drawdown = Drawdown()
+        if self.episodes is not None:
+            self.episodes.append(np.concatenate(self._running or [[]]))
+            self._running = []
+        return self
+
+    def merge(self, other):
+        self.rewards.merge(other.rewards)
+        self.returns.merge(other.returns)
+        self.turnover.merge(other.turnover)
+        self.drawdown.merge(other.drawdown)
+        self.worst = min(self.worst, other.worst)
+        if self.episodes is not None and other.episodes is not None:
+            self.episodes.extend(other.episodes)
+        return self
+
+    def result(self, eps=1e-8):
+        ppy = self.periods_per_year
+        return {
+            'Sharpe': float(self.rewards.mean / (self.rewards.std + eps)),
+            'MaxDD': float(min(self.worst, self.drawdown.value)),
+            'ann_return': float(math.expm1(self.returns.mean * ppy)),
+            'ann_vol': float(self.returns.std * math.sqrt(ppy)),
+            'turnover': float(self.turnover.mean),
+        }
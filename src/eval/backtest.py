@@ -0,0 +1,195 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from functools import partial
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from baselines.bh_mom_rev import equal_weight, long_only_weights
+
+
+def rebalance_times(T, window=60, rebalance_every=5):
+    """Env times `t` at which `AllocationEnv` rebalances."""
+
+    return np.arange(window, T, rebalance_every)
+
+
+def _cumsum(returns):
+    c = np.zeros((len(returns) + 1, returns.shape[1]))
+    np.cumsum(returns, axis=0, out=c[1:])
+    return c
+
+
+def _trailing_mean(returns, times, lookbacks):
+    # mean of returns[t - lb : t] for every lookback and time, (L, R, N)
+    c = _cumsum(returns)
+    lb = np.asarray(lookbacks).reshape(-1, 1)
+    lo = np.maximum(times - lb, 0)
+    return (c[times] - c[lo]) / (times - lo)[..., None]
+
+
+def ew_weights(returns, times):
+    """`equal_weight(N)` at every rebalance, (R, N)."""
+
+    N = returns.shape[1]
+    return np.broadcast_to(equal_weight(N), (len(times), N))
+
+
+def bh_weights(returns, times, w0=None):
+    """`buy_and_hold(w0)` at every rebalance, (R, N)."""
+
+    if w0 is None:
+        return ew_weights(returns, times)
+    return np.broadcast_to(np.asarray(w0), (len(times), returns.shape[1]))
+
+
+def momentum_weights(returns, times, lookback=60):
+    """`momentum_signal(returns[:t], lookback)` at every `t`, (L, R, N)."""
+
+    return long_only_weights(_trailing_mean(returns, times, lookback))
+
+
+def reversal_weights(returns, times, lookback=5):
+    """`reverse_signal(returns[:t], lookback)` at every `t`, (L, R, N)."""
+
+    return long_only_weights(-_trailing_mean(returns, times, lookback))
+
+
+SIGNALS = {
+    'EW': ew_weights,
+    'BH': bh_weights,
+    'MOM': momentum_weights,
+    'REV': reversal_weights,
+}
+
+
+def backtest(returns, weights, window=60, rebalance_every=5, cost_bps=2.0):
+    """Walk-forward backtest with `AllocationEnv` accounting.
+
+    `weights` is a (..., T, N) target-weight matrix whose row `t` is the
+    action taken at env time `t`, or a signal `f(returns, times)` giving
+    (..., R, N) weights at the rebalance times. `cost_bps` may be an
+    array; it becomes the axis just before the rebalance axis. As in the
+    env, the weights held over `returns[t : t + k]` are the previous
+    target (equal weight at the start) and every rebalance is charged
+    `cost * turnover`.
+
+    Returns a dict of arrays: `times` (R,), `turnover` (..., R),
+    `log_ret` (..., C, R) net log returns and `equity` (..., C, R + 1).
+
+    """
+
+    returns = np.asarray(returns, dtype=np.float64)
+    T, N = returns.shape
+    times = rebalance_times(T, window, rebalance_every)
+    if callable(weights):
+        w = weights(returns, times)
+    else:
+        w = np.asarray(weights)[..., times, :]
+    w = np.maximum(w, 0.0)
+    w = w / np.clip(w.sum(axis=-1, keepdims=True), 1e-6, None)
+
+    prev = np.empty_like(w)
+    prev[..., 0, :] = equal_weight(N)
+    prev[..., 1:, :] = w[..., :-1, :]
+    turnover = np.abs(w - prev).sum(axis=-1)
+
+    c = _cumsum(returns)
+    seg = c[np.minimum(times + rebalance_every, T)] - c[times]
+    gross = (prev * seg).sum(axis=-1)
+
+    cost = np.asarray(cost_bps, dtype=np.float64) * 1e-4
+    if cost.ndim:
+        cost = cost[:, None]
+        gross, turnover_c = gross[..., None, :], turnover[..., None, :]
+    else:
+        turnover_c = turnover
+    log_ret = gross + np.log1p(-cost * turnover_c)
+    equity = np.exp(
+        np.concatenate(
+            [np.zeros(log_ret.shape[:-1] + (1,)), np.cumsum(log_ret, -1)],
+            axis=-1,
+        )
+    )
+    return {
+        'times': times,
+        'turnover': turnover,
+        'log_ret': log_ret,
+        'equity': equity,
+    }
+
+
+def summarize(result, eps=1e-8):
+    """Per-run Sharpe (per rebalance), max drawdown, final equity, turnover."""
+
+    r, eq = result['log_ret'], result['equity']
+    peak = np.maximum.accumulate(eq, axis=-1)
+    turnover = result['turnover'].mean(axis=-1)
+    if turnover.ndim < r.ndim - 1:
+        turnover = turnover[..., None]
+    return {
+        'Sharpe': r.mean(axis=-1) / (r.std(axis=-1) + eps),
+        'MaxDD': ((eq - peak) / peak).min(axis=-1),
+        'final': eq[..., -1],
+        'turnover': np.broadcast_to(turnover, r.shape[:-1]),
+    }
+
+
+def _stacked(signal):
+    return lambda returns, times: signal(returns, times)[None]
+
+
+def sweep(
+    returns,
+    baselines=('EW', 'BH', 'MOM', 'REV'),
+    lookbacks=None,
+    cost_bps=(2.0,),
+    window=60,
+    rebalance_every=5,
+):
+    """Backtest every baseline over a grid of lookbacks and costs.
+
+    `lookbacks` maps `MOM`/`REV` to a list of lookbacks (defaults 60 and
+    5, as in `bh_mom_rev`); each signal is evaluated for all lookbacks
+    and all costs in one `backtest` call. Returns one row per
+    (baseline, lookback, cost_bps).
+
+    """
+
+    lookbacks = {'MOM': [60], 'REV': [5], **(lookbacks or {})}
+    cost_bps = np.atleast_1d(np.asarray(cost_bps, dtype=np.float64))
+    rows = []
+    for name in baselines:
+        lbs = lookbacks.get(name, [None])
+        if lbs == [None]:
+            grid = _stacked(SIGNALS[name])
+        else:
+            grid = partial(SIGNALS[name], lookback=lbs)
+        stats = summarize(
+            backtest(returns, grid, window, rebalance_every, cost_bps)
+        )
+        for (i, lb), (j, cost) in itertools.product(
+            enumerate(lbs), enumerate(cost_bps)
+        ):
+            row = {'baseline': name, 'lookback': lb, 'cost_bps': cost}
+            row.update({k: float(v[i, j]) for k, v in stats.items()})
+            rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,138 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import numpy as np
+
+
+def _iid(rng, B, T, block_size):
+    return rng.integers(0, T, size=(B, T))
+
+
+def _block(rng, B, T, block_size):
+    # circular moving blocks of fixed length
+    n_blocks = -(-T // block_size)
+    starts = rng.integers(0, T, size=(B, n_blocks, 1))
+    idx = (starts + np.arange(block_size)) % T
+    return idx.reshape(B, -1)[:, :T]
+
+
+def _stationary(rng, B, T, block_size):
+    # Politis-Romano: geometric block lengths with mean `block_size`
+    t = np.arange(T)
+    new = rng.random((B, T)) < 1.0 / block_size
+    new[:, 0] = True
+    first = np.maximum.accumulate(np.where(new, t, 0), axis=1)
+    starts = rng.integers(0, T, size=(B, T))
+    starts = np.take_along_axis(starts, first, axis=1)
+    return (starts + t - first) % T
+
+
+METHODS = {'iid': _iid, 'block': _block, 'stationary': _stationary}
+
+
+def _mean(x):
+    return x.mean(axis=-1)
+
+
+def _std(x):
+    return x.std(axis=-1)
+
+
+def _sharpe(x, eps=1e-8):
+    return x.mean(axis=-1) / (x.std(axis=-1) + eps)
+
+
+def _max_drawdown(x):
+    # `max_drawdown` of the equity curve exp(cumsum(x)) started at 1
+    path = np.cumsum(x, axis=-1)
+    peak = np.maximum(np.maximum.accumulate(path, axis=-1), 0.0)
+    return np.expm1(-(peak - path).max(axis=-1))
+
+
+STATS = {
+    'mean': _mean,
+    'std': _std,
+    'sharpe': _sharpe,
+    'max_drawdown': _max_drawdown,
+}
+
+
+def replicates(
+    x,
+    stats=('mean', 'std'),
+    n_boot=2000,
+    method='iid',
+    block_size=10,
+    seed=123,
+    max_elems=2**22,
+):
+    """Bootstrap replicates `{stat: (n_boot,)}` of a 1-D series `x`.
+
+    Resampled series are built as (chunk, T) index arrays, at most
+    `max_elems` entries at a time, and every statistic is one reduction
+    over the chunk. `x` may also be (k, T), e.g. an agent and a baseline
+    series resampled with the same indices, giving (n_boot, k) replicates.
+
+    """
+
+    x = np.asarray(x, dtype=np.float64)
+    T = x.shape[-1]
+    rng = np.random.default_rng(seed)
+    chunk = max(1, max_elems // x.size)
+    out = {s: [] for s in stats}
+    for lo in range(0, n_boot, chunk):
+        idx = METHODS[method](rng, min(chunk, n_boot - lo), T, block_size)
+        sample = x[..., idx]
+        if x.ndim > 1:
+            sample = np.moveaxis(sample, 0, -2)
+        for s in stats:
+            out[s].append(STATS[s](sample))
+    return {s: np.concatenate(v) for s, v in out.items()}
+
+
+def confidence_interval(x, stat='mean', alpha=0.05, **kwargs):
+    """Percentile CI `(estimate, lo, hi)` for one statistic of `x`."""
+
+    x = np.asarray(x, dtype=np.float64)
+    reps = replicates(x, (stat,), **kwargs)[stat]
+    lo, hi = np.quantile(reps, [alpha / 2, 1 - alpha / 2])
+    return float(STATS[stat](x)), float(lo), float(hi)
+
+
+def paired_test(agent, baseline, stat='mean', alpha=0.05, **kwargs):
+    """Bootstrap test of `stat(agent) - stat(baseline)`.
+
+    Both series are resampled with the same indices (pair episodes by seed
+    or returns by date). Returns the observed difference, its percentile
+    CI and a two-sided p-value for a zero difference.
+
+    """
+
+    x = np.stack([np.asarray(agent), np.asarray(baseline)]).astype(float)
+    reps = replicates(x, (stat,), **kwargs)[stat]
+    diff = reps[:, 0] - reps[:, 1]
+    lo, hi = np.quantile(diff, [alpha / 2, 1 - alpha / 2])
+    p = 2 * min((diff <= 0).mean(), (diff >= 0).mean())
+    obs = STATS[stat](x)
+    return {
+        'diff': float(obs[0] - obs[1]),
+        'lo': float(lo),
+        'hi': float(hi),
+        'p_value': float(min(p, 1.0)),
+    }
@@ -19,6 +19,9 @@
 
 import numpy as np
 
+from eval.accumulators import AllocMetrics, ExecMetrics, vwap_price
+from utils.profiling import profiled
+
 
 def implementation_shortfall(paid, ideal):
     return paid - ideal
@@ -37,34 +40,36 @@ def max_drawdown(equity_curve):
 
 
 def evaluate_exec(model, env, n_episodes=20):
-    is_list = []
+    metrics = ExecMetrics()
+    predict = profiled('model.predict')(model.predict)
     for _ in range(n_episodes):
         obs, _ = env.reset()
         done = False
         cash0 = env.mid_hist[0] * env.init_inventory
         while not done:
-            action, _ = model.predict(obs, deterministic=True)
+            action, _ = predict(obs, deterministic=True)
             obs, rew, done, _, _ = env.step(action)
         paid = -env.cash
         ideal = cash0
         ishort = implementation_shortfall(paid, ideal)
-        is_list.append(ishort)
-    return {
-        'IS_mean': float(np.mean(is_list)),
-        'IS_std': float(np.std(is_list)),
-    }
+        metrics.push(
+            ishort, paid / env.init_inventory, vwap_price(env.mid_hist)
+        )
+    return metrics.result()
 
 
 def evaluate_alloc(model, env, n_episodes=5):
-    # episodic eval by rolling windows
-    rets = []
+    # episodic eval by rolling windows, streamed into constant memory
+    metrics = AllocMetrics(periods_per_year=252 / env.k)
+    predict = profiled('model.predict')(model.predict)
     for _ in range(n_episodes):
         obs, _ = env.reset()
         done = False
-        eq = [1.0]
+        eq = env.equity
         while not done:
-            action, _ = model.predict(obs, deterministic=True)
+            action, _ = predict(obs, deterministic=True)
             obs, r, done, _, info = env.step(action)
-            eq.append(eq[-1] * np.exp(r))
-            rets.append(r)
-    return {'Sharpe': float(sharpe(rets)), 'MaxDD': float(max_drawdown(eq))}
+            metrics.push(r, np.log(env.equity / eq), info.get('turnover'))
+            eq = env.equity
+        metrics.end_episode()
+    return metrics.result()
@@ -0,0 +1,289 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from concurrent.futures import ProcessPoolExecutor
+import math
+import multiprocessing as mp
+import os
+from pathlib import Path
+import tempfile
+
+import numpy as np
+
+from eval.accumulators import AllocMetrics, ExecMetrics, vwap_price
+from eval.bootstrap import confidence_interval, paired_test, replicates
+from eval.metrics import implementation_shortfall
+from utils.profiling import profiled
+
+
+def episode_seeds(seed, n_episodes):
+    """Per-episode reset seeds, fixed by `seed` alone."""
+
+    return np.random.SeedSequence(seed).generate_state(n_episodes).tolist()
+
+
+class _ExecEpisode:
+    def __init__(self, env):
+        self.metrics = ExecMetrics()
+
+    def step(self, env, reward, info):
+        pass
+
+    def end(self, env):
+        paid = -env.cash
+        ideal = env.mid_hist[0] * env.init_inventory
+        return self.metrics.push(
+            implementation_shortfall(paid, ideal),
+            paid / env.init_inventory,
+            vwap_price(env.mid_hist),
+        )
+
+
+class _AllocEpisode:
+    def __init__(self, env):
+        self.metrics = AllocMetrics(252 / env.k, keep_rewards=True)
+        self.equity = env.equity
+
+    def step(self, env, reward, info):
+        log_ret = math.log(env.equity / self.equity)
+        self.metrics.push(reward, log_ret, info.get('turnover'))
+        self.equity = env.equity
+
+    def end(self, env):
+        return self.metrics.end_episode()
+
+
+EPISODES = {'exec': _ExecEpisode, 'alloc': _AllocEpisode}
+
+
+def run_chunk(model, env_fn, kind, seeds, record=None, first_episode=0):
+    """Run one episode per seed in lockstep with batched `predict` calls.
+
+    Returns one metrics accumulator per episode, fed as the episode runs.
+    With `record`, every step is also written to that file by a
+    `TrajectoryRecorder` per episode, numbered from `first_episode`.
+
+    """
+
+    envs = [env_fn() for _ in seeds]
+    writer = None
+    if record is not None:
+        from envs.recorder import TrajectoryRecorder, TrajectoryWriter
+
+        writer = TrajectoryWriter(record, envs[0].observation_space.shape)
+        # one buffer per live episode, so keep them short
+        envs = [
+            TrajectoryRecorder(
+                env, writer, kind, chunk_size=1024, first_episode=j
+            )
+            for j, env in enumerate(envs, first_episode)
+        ]
+    obs = [env.reset(seed=int(s))[0] for env, s in zip(envs, seeds)]
+    episodes = [EPISODES[kind](env) for env in envs]
+    results = [None] * len(envs)
+    active = list(range(len(envs)))
+    predict = profiled('model.predict')(model.predict)
+    while active:
+        actions, _ = predict(
+            np.stack([obs[i] for i in active]), deterministic=True
+        )
+        running = []
+        for i, action in zip(active, actions):
+            obs[i], r, terminated, truncated, info = envs[i].step(action)
+            episodes[i].step(envs[i], float(r), info)
+            if terminated or truncated:
+                results[i] = episodes[i].end(envs[i])
+                if writer is not None:
+                    envs[i].close()
+            else:
+                running.append(i)
+        active = running
+    if writer is not None:
+        writer.close()
+    return results
+
+
+def _init_worker():
+    import torch
+
+    torch.set_num_threads(1)
+
+
+_MODELS = {}
+
+
+def _run_saved(algo, path, *args):
+    # one load per worker process, not per chunk
+    if path not in _MODELS:
+        _MODELS[path] = algo.load(path, device='cpu')
+    return run_chunk(_MODELS[path], *args)
+
+
+def run_episodes(
+    model,
+    env_fn,
+    kind,
+    n_episodes,
+    seed=123,
+    n_workers=1,
+    batch_size=64,
+    record=None,
+):
+    """Per-episode metric accumulators in episode order.
+
+    Seeds are split into fixed chunks of `batch_size` episodes, so each
+    chunk sees the same batched forward passes whichever process runs it
+    and the merged results do not depend on `n_workers`. Workers load a
+    saved copy of `model` and a fresh env per episode from `env_fn`,
+    which must be picklable (e.g. a `functools.partial` of the env class).
+
+    `record` is a directory that receives every step of chunk `i` in
+    `chunk_{i:05d}.arrow`, with episodes numbered in seed order; read it
+    back with `load_trajectories(record)`.
+
+    """
+
+    seeds = episode_seeds(seed, n_episodes)
+    starts = range(0, n_episodes, batch_size)
+    chunks = [
+        (
+            seeds[i : i + batch_size],
+            None if record is None else Path(record) / f'chunk_{c:05d}.arrow',
+            i,
+        )
+        for c, i in enumerate(starts)
+    ]
+    if n_workers <= 1:
+        out = [run_chunk(model, env_fn, kind, *c) for c in chunks]
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'model.zip')
+            model.save(path)
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=mp.get_context('spawn'),
+                initializer=_init_worker,
+            ) as pool:
+                futures = [
+                    pool.submit(
+                        _run_saved, type(model), path, env_fn, kind, *c
+                    )
+                    for c in chunks
+                ]
+                out = [f.result() for f in futures]
+    return [r for chunk in out for r in chunk]
+
+
+def _merge(results):
+    # fixed episode order, so the float sums do not depend on n_workers
+    acc = results[0]
+    for r in results[1:]:
+        acc.merge(r)
+    return acc.result()
+
+
+def _paired(name, agent, baseline, stat, seed, **kwargs):
+    test = paired_test(agent, baseline, stat, seed=seed, **kwargs)
+    return {
+        f'{name}_diff': test['diff'],
+        f'{name}_diff_lo': test['lo'],
+        f'{name}_diff_hi': test['hi'],
+        f'{name}_p_value': test['p_value'],
+    }
+
+
+def evaluate_exec_parallel(
+    model, env_fn, n_episodes=20, baseline=None, **kwargs
+):
+    """`evaluate_exec` over seeded episodes spread across processes.
+
+    Adds a 95% bootstrap CI of the mean IS over episodes. `baseline` is
+    the IS of a baseline on the same episodes (one per `episode_seeds`
+    seed); the paired test of the mean IS difference is added as
+    `IS_diff*` and `IS_p_value`.
+
+    """
+
+    seed = kwargs.get('seed', 123)
+    res = run_episodes(model, env_fn, 'exec', n_episodes, **kwargs)
+    shortfalls = [r.shortfall.mean for r in res]
+    stats = _merge(res)
+    _, stats['IS_mean_lo'], stats['IS_mean_hi'] = confidence_interval(
+        shortfalls, 'mean', seed=seed
+    )
+    if baseline is not None:
+        stats.update(_paired('IS', shortfalls, baseline, 'mean', seed))
+    return stats
+
+
+def _alloc_intervals(series, seed, alpha=0.05, eps=1e-8):
+    # stationary bootstrap within each episode, pooled like `AllocMetrics`:
+    # Sharpe over all rewards, MaxDD the worst episode
+    reps = [
+        replicates(
+            x, ('mean', 'std', 'max_drawdown'), method='stationary', seed=s
+        )
+        for x, s in zip(series, episode_seeds(seed, len(series)))
+    ]
+    n = np.array([len(x) for x in series], dtype=np.float64)[:, None]
+    mean = np.stack([r['mean'] for r in reps])
+    sq = np.stack([r['std'] ** 2 + r['mean'] ** 2 for r in reps])
+    mu = (n * mean).sum(axis=0) / n.sum()
+    var = np.maximum((n * sq).sum(axis=0) / n.sum() - mu**2, 0.0)
+    boot = {
+        'Sharpe': mu / (np.sqrt(var) + eps),
+        'MaxDD': np.stack([r['max_drawdown'] for r in reps]).min(axis=0),
+    }
+    out = {}
+    for name, r in boot.items():
+        lo, hi = np.quantile(r, [alpha / 2, 1 - alpha / 2])
+        out[f'{name}_lo'], out[f'{name}_hi'] = float(lo), float(hi)
+    return out
+
+
+def evaluate_alloc_parallel(
+    model, env_fn, n_episodes=5, baseline=None, **kwargs
+):
+    """`evaluate_alloc` over seeded episodes spread across processes.
+
+    Adds 95% stationary-bootstrap CIs of Sharpe and MaxDD, resampling
+    rewards within each episode. `baseline` holds a baseline's reward
+    series on the same episodes (one per `episode_seeds` seed); the paired
+    test of the Sharpe difference, resampling both by date, is added as
+    `Sharpe_diff*` and `Sharpe_p_value`.
+
+    """
+
+    seed = kwargs.get('seed', 123)
+    res = run_episodes(model, env_fn, 'alloc', n_episodes, **kwargs)
+    series = [x for r in res for x in r.episodes]
+    stats = _merge(res)
+    stats.update(_alloc_intervals(series, seed))
+    if baseline is not None:
+        stats.update(
+            _paired(
+                'Sharpe',
+                np.concatenate(series),
+                np.concatenate(baseline),
+                'sharpe',
+                seed,
+                method='stationary',
+            )
+        )
+    return stats
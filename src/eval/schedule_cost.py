@@ -0,0 +1,106 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import numpy as np
+
+from envs.scenarios import bank_from_env_cfg, generate_paths
+
+
+def schedule_weights(schedules, config):
+    """Per-mid coefficients `c` with `IS = c @ mids + fee * q0 - mid0 * q0`.
+
+    `schedules` is (steps,) or (K, steps) shares traded at each step.
+    Following `ExecutionEnv.step`, shares `q` at step `k` fill at
+    `mid_k * (1 + impact * q / q0)` and whatever is left after the last
+    step is bought the same way at `mid_steps`. Returns (K, steps + 1).
+
+    """
+
+    q0 = config.get('init_inventory', 1000)
+    impact = config.get('impact_coeff', 2e-3) / max(q0, 1)
+    q = np.atleast_2d(np.asarray(schedules, dtype=np.float64))
+    if q.shape[1] != config.get('steps', 50):
+        raise ValueError('schedules must have one column per env step')
+    rest = q0 - q.sum(axis=1, keepdims=True)
+    if np.any(rest < -1e-9 * q0):
+        raise ValueError('schedule buys more than init_inventory')
+    q = np.concatenate([q, np.maximum(rest, 0.0)], axis=1)
+    return q * (1 + impact * q)
+
+
+def schedule_cost(schedules, config, mid0=100.0):
+    """Closed-form mean and variance of IS under the env's GBM mids.
+
+    Mids follow `mid_k = mid0 * exp(sum of log returns)` with drift
+    `gbm_mu` and vol `gbm_sigma` as in `scenarios._gbm`, so
+    `E[mid_k] = mid0 e^{mu k dt}` and
+    `Cov(mid_j, mid_k) = E[mid_j] E[mid_k] (e^{sigma^2 min(j, k) dt} - 1)`.
+    Returns `{'E': (K,), 'V': (K,)}`.
+
+    """
+
+    steps = config.get('steps', 50)
+    q0 = config.get('init_inventory', 1000)
+    fee = config.get('fee_per_share', 0.0001)
+    mu = config.get('gbm_mu', 0.0)
+    sigma = config.get('gbm_sigma', 0.02)
+    dt = config.get('dt', 1.0)
+    c = schedule_weights(schedules, config)
+    k = np.arange(steps + 1)
+    mean = mid0 * np.exp(mu * k * dt)
+    cov = np.outer(mean, mean) * np.expm1(
+        sigma**2 * np.minimum.outer(k, k) * dt
+    )
+    return {
+        'E': c @ mean + (fee - mid0) * q0,
+        'V': np.einsum('ij,jk,ik->i', c, cov, c),
+    }
+
+
+def simulate_schedule_cost(
+    schedules, config, n_paths=10_000, seed=123, paths=None, mid0=100.0
+):
+    """Monte Carlo IS of every schedule on every path, (K, n_paths).
+
+    Paths come from `paths` if given, else the config's `path_bank`, else
+    fresh GBM paths from `generate_paths`. The whole batch is one matmul.
+
+    """
+
+    steps = config.get('steps', 50)
+    if paths is None:
+        bank = bank_from_env_cfg(config)
+        if bank is not None:
+            paths = bank.paths[:n_paths, : steps + 1]
+        else:
+            paths = generate_paths(
+                'gbm',
+                n_paths,
+                steps,
+                seed=seed,
+                mid0=mid0,
+                dt=config.get('dt', 1.0),
+                mu=config.get('gbm_mu', 0.0),
+                sigma=config.get('gbm_sigma', 0.02),
+            )
+    paths = np.asarray(paths, dtype=np.float64)[:, : steps + 1]
+    q0 = config.get('init_inventory', 1000)
+    fee = config.get('fee_per_share', 0.0001)
+    c = schedule_weights(schedules, config)
+    return c @ paths.T + (fee * q0 - paths[:, 0] * q0)
@@ -17,51 +17,213 @@
 # with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
 # ==============================================================================
 
+import fcntl
+import json
 import os
-import time
-import hashlib
+from contextlib import contextmanager
 
 import pandas as pd
-import yfinance as yf
 
+from utils.fetch import FetchError, RateLimiter, YFinanceSource, fetch_many
+from utils.profiling import profiled
 
-def _cache_path(cfg):
-    key = f'{",".join(cfg["tickers"])}|{cfg["start"]}|{cfg["end"]}'
-    h = hashlib.md5(key.encode()).hexdigest()
-    os.makedirs('data/cache', exist_ok=True)
-    return f'data/cache/prices_{h}.parquet'
 
+@contextmanager
+def _locked(path):
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
 
-def load_prices_yf(cfg, max_retries=6):
-    cache = _cache_path(cfg)
-    if os.path.exists(cache):
-        return pd.read_parquet(cache).values
 
-    delay = 1.0
-    for i in range(max_retries):
-        try:
-            df = yf.download(
-                cfg['tickers'],
-                start=cfg['start'],
-                end=cfg['end'],
-                progress=False,
-                group_by='ticker',
-                auto_adjust=True,
-            )
-            # Normalize to Adj Close-like wide frame
-            if isinstance(df.columns, pd.MultiIndex):
-                df = df.xs('Adj Close', axis=1, level=1, drop_level=False)
-                df.columns = [c[0] for c in df.columns]
-            elif 'Adj Close' in df.columns:
-                df = df[['Adj Close']]
-            df = df.dropna()
-            df.to_parquet(cache)
-            return df.values
-        except Exception as e:
-            if 'Rate limited' in str(e) or 'Too Many Requests' in str(e):
-                time.sleep(delay)
-                delay *= 2.0
-            else:
-                raise
-    # ultimate fallback: short window to reduce calls
-    raise RuntimeError('Yahoo rate-limited after retries')
+def _atomic_write(path, write):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _write_json(path, obj):
+    with open(path, 'w') as f:
+        json.dump(obj, f)
+
+
+def _merge(ranges):
+    out = []
+    for s, e in sorted(ranges):
+        if out and s <= out[-1][1]:
+            out[-1][1] = max(out[-1][1], e)
+        else:
+            out.append([s, e])
+    return out
+
+
+class PriceCache:
+    """Per-ticker price cache partitioned by year.
+
+    Each ticker lives in `<root>/<ticker>/` as one Parquet file per year
+    plus a `_coverage.json` listing the [start, end) date ranges already
+    fetched. Only uncovered ranges are downloaded. Writers hold a per-ticker
+    `flock` and replace files atomically, so several processes can share
+    the cache and readers never see a partial file.
+
+    `downloader(ticker, start, end)` returns a date-indexed Series of
+    closes; it defaults to a `YFinanceSource`, and tests can pass a local
+    fake instead. Sources with a keep-alive `client` are closed by
+    `close()`.
+    Missing tickers are fetched concurrently, each retried on its own with
+    exponential `backoff` and throttled by a shared `rate_limiter`.
+
+    """
+
+    def __init__(
+        self,
+        root='data/cache/prices',
+        downloader=None,
+        max_workers=8,
+        max_retries=6,
+        backoff=0.5,
+        rate_limiter=None,
+    ):
+        self.root = root
+        self.downloader = downloader or YFinanceSource()
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_limiter = rate_limiter or RateLimiter(rate=2.0, burst=4)
+
+    def close(self):
+        """Close the downloader's keep-alive connections, if it has any."""
+
+        client = getattr(self.downloader, 'client', None)
+        if client is not None:
+            client.close()
+
+    def _dir(self, ticker):
+        d = os.path.join(self.root, ticker)
+        os.makedirs(d, exist_ok=True)
+        return d
+
+    def coverage(self, ticker):
+        path = os.path.join(self._dir(ticker), '_coverage.json')
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            try:
+                return json.load(f)
+            except ValueError:
+                # an unreadable manifest only costs a refetch of the range
+                return []
+
+    def missing(self, ticker, start, end):
+        """Sub-ranges of [start, end) not yet in the cache."""
+
+        gaps, cur = [], start
+        for s, e in self.coverage(ticker):
+            if e <= cur:
+                continue
+            if s >= end:
+                break
+            if s > cur:
+                gaps.append((cur, s))
+            cur = max(cur, e)
+        if cur < end:
+            gaps.append((cur, end))
+        return gaps
+
+    def _write(self, ticker, series):
+        d = self._dir(ticker)
+        for year, part in series.groupby(series.index.year):
+            path = os.path.join(d, f'{year}.parquet')
+            frame = part.rename('close').to_frame()
+            if os.path.exists(path):
+                old = pd.read_parquet(path)
+                frame = frame.combine_first(old)
+            _atomic_write(path, frame.sort_index().to_parquet)
+
+    def update(self, ticker, start, end):
+        """Download whatever part of [start, end) is missing."""
+
+        d = self._dir(ticker)
+        with _locked(os.path.join(d, '.lock')):
+            # today's bar may still change, never mark it as covered
+            today = pd.Timestamp.today().strftime('%Y-%m-%d')
+            fetched = []
+            for s, e in self.missing(ticker, start, end):
+                series = self.downloader(ticker, s, e)
+                if len(series):
+                    self._write(ticker, series)
+                if s < min(e, today):
+                    fetched.append([s, min(e, today)])
+            if fetched:
+                cov = _merge(self.coverage(ticker) + fetched)
+                path = os.path.join(d, '_coverage.json')
+                _atomic_write(path, lambda p: _write_json(p, cov))
+
+    def read(self, ticker, start, end):
+        d = self._dir(ticker)
+        years = range(pd.Timestamp(start).year, pd.Timestamp(end).year + 1)
+        paths = [os.path.join(d, f'{y}.parquet') for y in years]
+        parts = [pd.read_parquet(p) for p in paths if os.path.exists(p)]
+        if not parts:
+            return pd.Series(dtype=float, name=ticker)
+        close = pd.concat(parts)['close']
+        close = close[(close.index >= start) & (close.index < end)]
+        return close.rename(ticker)
+
+    def update_many(self, tickers, start, end):
+        """Update tickers concurrently; return {ticker: error} failures."""
+
+        def update(ticker, s, e):
+            self.update(ticker, s, e)
+
+        stale = [t for t in tickers if self.missing(t, start, end)]
+        _, failed = fetch_many(
+            update,
+            stale,
+            start,
+            end,
+            max_workers=self.max_workers,
+            max_retries=self.max_retries,
+            backoff=self.backoff,
+            rate_limiter=self.rate_limiter,
+        )
+        return failed
+
+    @profiled('PriceCache.load')
+    def load(self, tickers, start, end):
+        """Wide frame of closes, fetching only what is missing.
+
+        Tickers that fetched fine stay cached; if any failed a `FetchError`
+        naming them is raised so a rerun only retries those.
+
+        """
+
+        failed = self.update_many(tickers, start, end)
+        if failed:
+            raise FetchError(failed)
+        return pd.concat(
+            [self.read(t, start, end) for t in tickers], axis=1
+        ).dropna()
+
+
+def load_frame_yf(cfg, max_retries=6, cache=None):
+    """Wide close frame for a `[data]` config through the price cache."""
+
+    own = cache is None
+    if own:
+        cache = PriceCache(
+            max_workers=cfg.get('max_workers', 8), max_retries=max_retries
+        )
+    try:
+        df = cache.load(cfg['tickers'], cfg['start'], cfg['end'])
+    finally:
+        if own:
+            cache.close()
+    return df
+
+
+@profiled()
+def load_prices_yf(cfg, max_retries=6, cache=None):
+    return load_frame_yf(cfg, max_retries, cache).values
@@ -17,17 +17,39 @@
 # with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
 # ==============================================================================
 
+import warnings
+
 import pandas as pd
-import pandas_datareader.data as web
+
+from utils.fetch import RateLimiter, StooqSource, fetch_many
 
 
-def load_prices_stooq(tickers, start, end):
+def load_prices_stooq(
+    tickers, start, end, max_workers=8, rate=5.0, source=None
+):
     # Stooq delivers daily data and is light for demos
-    frames = []
-    for t in tickers:
-        df = web.DataReader(t, 'stooq', start=start, end=end)[
-            ['Close']
-        ].rename(columns={'Close': t})
-        frames.append(df)
+    own = source is None
+    source = source or StooqSource()
+    try:
+        ok, failed = fetch_many(
+            source,
+            tickers,
+            start,
+            end,
+            max_workers=max_workers,
+            rate_limiter=RateLimiter(rate=rate, burst=max_workers),
+        )
+    finally:
+        if own:
+            source.client.close()
+    if failed:
+        warnings.warn(
+            f'stooq: {len(failed)} ticker(s) failed: {failed}', stacklevel=2
+        )
+    if not ok:
+        return pd.DataFrame()
+    # keep the caller's ticker order for the tickers that did arrive
+    frames = [ok[t] for t in tickers if t in ok]
     out = pd.concat(frames, axis=1).sort_index().dropna()
+    out.attrs['failed'] = failed
     return out
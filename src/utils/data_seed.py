@@ -17,11 +17,22 @@
 # with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
 # ==============================================================================
 
+import os
 
 import pandas as pd
 
+from utils.price_store import PriceStore, frame_from_csv, write_price_store
+
+SEED_CSV = 'data/seed/spy_qqq_tlt_gld.csv'
+
 
 def load_prices_seed():
-    return pd.read_csv(
-        'data/seed/spy_qqq_tlt_gld.csv', index_col=0, parse_dates=True
-    )
+    return pd.read_csv(SEED_CSV, index_col=0, parse_dates=True)
+
+
+def open_seed_store(path='data/store/seed'):
+    """Memory-mapped seed prices, converted from the CSV on first use."""
+
+    if not os.path.exists(os.path.join(path, 'meta.json')):
+        write_price_store(path, frame_from_csv(SEED_CSV), source=SEED_CSV)
+    return PriceStore(path)
@@ -0,0 +1,169 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from baselines.bh_mom_rev import long_only_weights
+
+
+def rolling_mean(x, lookback):
+    """Trailing mean over up to `lookback` rows ending at each row."""
+
+    c = np.cumsum(x, axis=0)
+    out = c.copy()
+    out[lookback:] -= c[:-lookback]
+    n = np.minimum(np.arange(1, len(x) + 1), lookback)
+    return out / n.reshape((-1,) + (1,) * (x.ndim - 1))
+
+
+def rolling_std(x, lookback):
+    """Trailing population std over up to `lookback` rows."""
+
+    mean = rolling_mean(x, lookback)
+    sq = rolling_mean(x * x, lookback)
+    return np.sqrt(np.maximum(sq - mean * mean, 0.0))
+
+
+def ewma_cov(x, lam=0.94, out=None):
+    """EWMA covariance `C_t = lam * C_{t-1} + (1 - lam) * x_t x_t'`.
+
+    `C_{-1} = x_0 x_0'`. The recursion runs in place on one float64
+    (N, N) state and each step is written straight to `out`, which may be
+    any (T, N, N) array, e.g. a float32 slice of `FeatureStore.rows`.
+    Writing the output is what the time goes into, so blocked or
+    cumulative-sum forms are no faster.
+
+    """
+
+    T, N = x.shape
+    if out is None:
+        out = np.empty((T, N, N))
+    cov = np.outer(x[0], x[0])
+    step = np.empty_like(cov)
+    scaled = np.sqrt(1 - lam) * x
+    for t in range(T):
+        cov *= lam
+        np.outer(scaled[t], scaled[t], out=step)
+        cov += step
+        out[t] = cov
+    return out
+
+
+def _cache_path(returns, params, cache_dir):
+    h = hashlib.md5(returns.tobytes())
+    h.update(str((returns.shape, returns.dtype.str)).encode())
+    h.update(json.dumps(params, sort_keys=True).encode())
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, f'features_{h.hexdigest()}.npz')
+
+
+class FeatureStore:
+    """Precomputed rolling features for a (T, N) log-return history.
+
+    Row `t` of every array only uses returns up to and including `t`, so
+    at env time `t` (observation `returns[t - window : t]`) the matching
+    features are row `t - 1`. Momentum and reversal weights equal
+    `momentum_signal(returns[: t + 1])` / `reverse_signal(...)`.
+
+    Only the float32 `rows` the envs read are kept, (T, 5 + N, N) with
+    the EWMA covariance or (T, 5, N) with `cov = False`; the named fields
+    are views into them.
+
+    """
+
+    FIELDS = ('mom_mean', 'rev_mean', 'vol', 'momentum', 'reversal')
+    DEFAULTS = {
+        'mom_lookback': 60,
+        'rev_lookback': 5,
+        'vol_lookback': 20,
+        'ewma_lambda': 0.94,
+        'cov': True,
+    }
+
+    def __init__(self, rows, params):
+        self.params = params
+        self.rows = rows
+        self.rows.flags.writeable = False
+        self.T, _, self.N = rows.shape
+        for i, f in enumerate(self.FIELDS):
+            setattr(self, f, rows[:, i])
+        if params['cov']:
+            self.cov = rows[:, len(self.FIELDS) :]
+
+    @property
+    def n_rows(self):
+        return self.rows.shape[1]
+
+    @classmethod
+    def resolve(cls, **params):
+        """`params` over `DEFAULTS`; unknown names raise `TypeError`."""
+
+        unknown = sorted(set(params) - set(cls.DEFAULTS))
+        if unknown:
+            raise TypeError(f'unknown feature params: {unknown}')
+        return {**cls.DEFAULTS, **params}
+
+    @classmethod
+    def build(cls, returns, **params):
+        params = cls.resolve(**params)
+        T, N = returns.shape
+        n_fields = len(cls.FIELDS)
+        rows = np.empty(
+            (T, n_fields + (N if params['cov'] else 0), N), dtype=np.float32
+        )
+        mom_mean = rolling_mean(returns, params['mom_lookback'])
+        rev_mean = rolling_mean(returns, params['rev_lookback'])
+        rows[:, 0] = mom_mean
+        rows[:, 1] = rev_mean
+        rows[:, 2] = rolling_std(returns, params['vol_lookback'])
+        rows[:, 3] = long_only_weights(mom_mean)
+        rows[:, 4] = long_only_weights(-rev_mean)
+        if params['cov']:
+            ewma_cov(returns, params['ewma_lambda'], out=rows[:, n_fields:])
+        return cls(rows, params)
+
+    @classmethod
+    def load_or_build(cls, returns, cache_dir='data/cache', **params):
+        """Build the store once per (data, params) and cache it as npz.
+
+        The key hashes the resolved params, so spelling out a default
+        hits the same file as leaving it out.
+
+        """
+
+        returns = np.ascontiguousarray(returns, dtype=np.float64)
+        params = cls.resolve(**params)
+        path = _cache_path(returns, params, cache_dir)
+        if os.path.exists(path):
+            with np.load(path) as f:
+                return cls(f['rows'], json.loads(str(f['params'])))
+        store = cls.build(returns, **params)
+        tmp = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez(tmp, params=json.dumps(store.params), rows=store.rows)
+        os.replace(tmp, path)
+        return store
+
+    def observation(self, t):
+        """(n_rows, N) float32 feature rows for env time `t`."""
+
+        return self.rows[t - 1]
@@ -0,0 +1,227 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import http.client
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+import pandas as pd
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+# what a source may raise for one ticker: network and HTTP failures
+# (`HTTPStatusError` is an OSError) and malformed or empty payloads
+FETCH_ERRORS = (
+    OSError,
+    http.client.HTTPException,
+    ValueError,
+    KeyError,
+    IndexError,
+    TypeError,
+)
+
+
+class FetchError(Exception):
+    """One or more tickers could not be fetched; `failed` maps them."""
+
+    def __init__(self, failed):
+        self.failed = failed
+        detail = ', '.join(f'{t}: {e}' for t, e in sorted(failed.items()))
+        super().__init__(f'failed to fetch {len(failed)} ticker(s): {detail}')
+
+
+class HTTPStatusError(IOError):
+    def __init__(self, status, url):
+        self.status = status
+        super().__init__(f'HTTP {status} for {url}')
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` requests per second."""
+
+    def __init__(self, rate=5.0, burst=5):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.burst, self.tokens + (now - self.stamp) * self.rate
+                )
+                self.stamp = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HttpClient:
+    """Minimal keep-alive HTTP client with one connection per thread/host."""
+
+    def __init__(self, timeout=10.0, headers=None):
+        self.timeout = timeout
+        self.headers = headers or {'User-Agent': 'rl-finlab'}
+        self._local = threading.local()
+        self._all = []
+        self._lock = threading.Lock()
+
+    def _conn(self, scheme, netloc):
+        conns = self._local.__dict__.setdefault('conns', {})
+        key = (scheme, netloc)
+        if key not in conns:
+            cls = (
+                http.client.HTTPSConnection
+                if scheme == 'https'
+                else http.client.HTTPConnection
+            )
+            conns[key] = cls(netloc, timeout=self.timeout)
+            with self._lock:
+                self._all.append(conns[key])
+        return conns[key]
+
+    def close(self):
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+
+    def get(self, url):
+        parts = urlsplit(url)
+        path = parts.path + (f'?{parts.query}' if parts.query else '')
+        conn = self._conn(parts.scheme, parts.netloc)
+        try:
+            conn.request('GET', path, headers=self.headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.HTTPException, OSError):
+            # stale keep-alive socket, reconnect on the next attempt
+            conn.close()
+            raise
+        if resp.status != 200:
+            raise HTTPStatusError(resp.status, url)
+        return body.decode()
+
+
+def is_retryable(exc):
+    if isinstance(exc, HTTPStatusError):
+        return exc.status in RETRY_STATUS
+    if isinstance(
+        exc, (ConnectionError, TimeoutError, http.client.HTTPException)
+    ):
+        return True
+    msg = str(exc)
+    return 'Rate limited' in msg or 'Too Many Requests' in msg
+
+
+class StooqSource:
+    """Daily closes from Stooq's CSV download endpoint."""
+
+    def __init__(self, base_url='https://stooq.com/q/d/l/', client=None):
+        self.base_url = base_url
+        self.client = client or HttpClient()
+
+    def __call__(self, ticker, start, end):
+        query = urlencode(
+            {
+                's': ticker.lower(),
+                'd1': pd.Timestamp(start).strftime('%Y%m%d'),
+                'd2': pd.Timestamp(end).strftime('%Y%m%d'),
+                'i': 'd',
+            }
+        )
+        text = self.client.get(f'{self.base_url}?{query}')
+        if not text.startswith('Date'):
+            raise ValueError(f'no data for {ticker}')
+        df = pd.read_csv(io.StringIO(text), index_col='Date', parse_dates=True)
+        return df['Close'].rename(ticker)
+
+
+class YFinanceSource:
+    """Daily adjusted closes through `yfinance`, one ticker per call.
+
+    yfinance raises its own exception types; they are re-raised as
+    `OSError`s so `fetch_many` retries its rate limits and reports the
+    other failures per ticker.
+
+    """
+
+    def __call__(self, ticker, start, end):
+        import yfinance as yf
+
+        try:
+            df = yf.Ticker(ticker).history(
+                start=start, end=end, auto_adjust=True, raise_errors=True
+            )
+        except yf.exceptions.YFException as e:
+            raise OSError(f'{type(e).__name__}: {e}') from e
+        if df.empty:
+            raise ValueError(f'no data for {ticker}')
+        close = df['Close'].dropna()
+        close.index = close.index.tz_localize(None).normalize()
+        return close.rename(ticker)
+
+
+def fetch_many(
+    fetch_one,
+    tickers,
+    start,
+    end,
+    max_workers=8,
+    max_retries=4,
+    backoff=0.5,
+    rate_limiter=None,
+):
+    """Fetch tickers concurrently; return ({ticker: series}, {ticker: err}).
+
+    Each ticker is retried on its own with exponential backoff, so one
+    rate-limited symbol only delays its own worker. Every request first
+    takes a token from `rate_limiter`. Only `FETCH_ERRORS` count as a
+    failed ticker; anything else is a bug and propagates.
+
+    """
+
+    def run(ticker):
+        delay = backoff
+        for attempt in range(max_retries):
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            try:
+                return ticker, fetch_one(ticker, start, end), None
+            except FETCH_ERRORS as e:
+                if not is_retryable(e) or attempt == max_retries - 1:
+                    return ticker, None, f'{type(e).__name__}: {e}'
+                time.sleep(delay)
+                delay *= 2.0
+
+    ok, failed = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for ticker, series, err in pool.map(run, tickers):
+            if err is None:
+                ok[ticker] = series
+            else:
+                failed[ticker] = err
+    return ok, failed
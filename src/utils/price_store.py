@@ -0,0 +1,159 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from argparse import ArgumentParser
+import glob
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FILES = {
+    'prices': 'prices.npy',
+    'returns': 'log_returns.npy',
+    'returns32': 'log_returns_f32.npy',
+}
+
+
+def write_price_store(path, frame, source=None):
+    """Write a wide (dates x tickers) price frame as a price store.
+
+    The store is a directory with prices, log returns and float32 log
+    returns as `.npy` arrays plus a `meta.json` sidecar holding tickers and
+    dates. Everything is written to a temp directory and renamed into
+    place, so readers never see a half-written store.
+
+    """
+
+    path = Path(path)
+    frame = frame.sort_index().dropna()
+    prices = np.ascontiguousarray(frame.to_numpy(dtype=np.float64))
+    returns = np.log(prices[1:] / prices[:-1])
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp.mkdir(parents=True, exist_ok=True)
+    np.save(tmp / FILES['prices'], prices)
+    np.save(tmp / FILES['returns'], returns)
+    np.save(tmp / FILES['returns32'], returns.astype(np.float32))
+    meta = {
+        'tickers': [str(c) for c in frame.columns],
+        'dates': [d.strftime('%Y-%m-%d') for d in pd.to_datetime(frame.index)],
+        'source': source,
+    }
+    (tmp / 'meta.json').write_text(json.dumps(meta))
+    if path.exists():
+        old = path.with_name(f'.{path.name}.{os.getpid()}.old')
+        os.replace(path, old)
+        os.replace(tmp, path)
+        for f in old.iterdir():
+            f.unlink()
+        old.rmdir()
+    else:
+        os.replace(tmp, path)
+    return PriceStore(path)
+
+
+class PriceStore:
+    """Read-only, memory-mapped price store shared across processes.
+
+    Arrays are opened with `mmap_mode='r'`, so every worker that opens the
+    same store maps the same page-cache pages instead of holding its own
+    copy. Pickling only carries the path. `tickers=` projects columns;
+    a contiguous run of columns stays a view, other subsets are copied.
+
+    """
+
+    def __init__(self, path, tickers=None):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / 'meta.json').read_text())
+        self.tickers = list(self.meta['tickers'])
+        self.dates = pd.DatetimeIndex(self.meta['dates'])
+        cols = slice(None)
+        if tickers is not None:
+            idx = [self.tickers.index(t) for t in tickers]
+            contiguous = idx == list(range(idx[0], idx[0] + len(idx)))
+            cols = slice(idx[0], idx[-1] + 1) if contiguous else idx
+            self.tickers = list(tickers)
+        self._cols = cols
+        for name, fname in FILES.items():
+            arr = np.load(self.path / fname, mmap_mode='r')
+            setattr(self, name, arr[:, cols])
+
+    def frame(self):
+        return pd.DataFrame(
+            np.asarray(self.prices), index=self.dates, columns=self.tickers
+        )
+
+    def __getstate__(self):
+        tickers = None if self._cols == slice(None) else self.tickers
+        return {'path': str(self.path), 'tickers': tickers}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['tickers'])
+
+
+def frame_from_price_cache(root, tickers=None):
+    """Wide frame from the per-ticker Parquet cache in `utils.data`."""
+
+    tickers = tickers or sorted(
+        d for d in os.listdir(root) if os.path.isdir(os.path.join(root, d))
+    )
+    cols = []
+    for t in tickers:
+        parts = sorted(glob.glob(os.path.join(root, t, '*.parquet')))
+        close = pd.concat([pd.read_parquet(p) for p in parts])['close']
+        cols.append(close.rename(t))
+    return pd.concat(cols, axis=1).dropna()
+
+
+def frame_from_parquet(path):
+    """Wide frame from a legacy `prices_<hash>.parquet` cache file."""
+
+    return pd.read_parquet(path).dropna()
+
+
+def frame_from_csv(path):
+    """Wide frame from a seed CSV such as `data/seed/spy_qqq_tlt_gld.csv`."""
+
+    return pd.read_csv(path, index_col=0, parse_dates=True).dropna()
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--out', type=Path, required=True)
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument('--from-cache', type=Path)
+    src.add_argument('--from-parquet', type=Path)
+    src.add_argument('--from-csv', type=Path)
+    parser.add_argument('--tickers', nargs='*')
+    args = parser.parse_args()
+    if args.from_cache:
+        frame = frame_from_price_cache(args.from_cache, args.tickers)
+    elif args.from_parquet:
+        frame = frame_from_parquet(args.from_parquet)
+    else:
+        frame = frame_from_csv(args.from_csv)
+    if args.tickers and not args.from_cache:
+        frame = frame[args.tickers]
+    source = str(args.from_cache or args.from_parquet or args.from_csv)
+    store = write_price_store(args.out, frame, source=source)
+    print(
+        f'{args.out}: {len(store.dates)} rows x {len(store.tickers)} tickers'
+    )
@@ -0,0 +1,190 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from contextlib import contextmanager
+import functools
+import json
+import os
+from pathlib import Path
+import threading
+import time
+
+
+class LatencyStat:
+    """Call count, total and a log2 histogram of durations in ns."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = [0] * 64
+
+    def add(self, dur):
+        self.count += 1
+        self.total += dur
+        self.max = max(self.max, dur)
+        self.buckets[dur.bit_length()] += 1
+
+    def quantile(self, q):
+        # upper edge of the bucket holding the q-th call
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.buckets):
+            seen += c
+            if c and seen >= rank:
+                return min(2**i, self.max)
+        return self.max
+
+    def to_dict(self, name):
+        return {
+            'name': name,
+            'count': self.count,
+            'total_ms': self.total / 1e6,
+            'mean_us': self.total / max(self.count, 1) / 1e3,
+            'p50_us': self.quantile(0.5) / 1e3,
+            'p99_us': self.quantile(0.99) / 1e3,
+            'max_us': self.max / 1e3,
+            'log2_ns_buckets': {i: c for i, c in enumerate(self.buckets) if c},
+        }
+
+
+class Profiler:
+    """Process-wide latency histograms, counters and sampled trace spans.
+
+    Disabled by default; instrumented code then only pays a flag check.
+    Every `trace_every`-th call of each name is also kept as a Chrome
+    trace span, up to `max_events`.
+
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.configure()
+
+    def configure(
+        self,
+        enabled=False,
+        out_dir='profiles',
+        trace_every=100,
+        max_events=100_000,
+        cprofile_every=0,
+        tracemalloc_every=0,
+    ):
+        self.enabled = enabled
+        self.out_dir = Path(out_dir)
+        self.trace_every = trace_every
+        self.max_events = max_events
+        self.cprofile_every = cprofile_every
+        self.tracemalloc_every = tracemalloc_every
+        self.stats = {}
+        self.counters = {}
+        self.events = []
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def record(self, name, start, dur):
+        with self._lock:
+            stat = self.stats.get(name)
+            if stat is None:
+                stat = self.stats[name] = LatencyStat()
+            stat.add(dur)
+            if (
+                self.trace_every
+                and (stat.count - 1) % self.trace_every == 0
+                and len(self.events) < self.max_events
+            ):
+                self.events.append(
+                    {
+                        'name': name,
+                        'ph': 'X',
+                        'ts': (start - self._t0) / 1e3,
+                        'dur': dur / 1e3,
+                        'pid': os.getpid(),
+                        'tid': threading.get_ident(),
+                    }
+                )
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def span(self, name):
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, t0, time.perf_counter_ns() - t0)
+
+    def export(self, prefix='run'):
+        """Write `<prefix>.jsonl` stats and a `<prefix>.trace.json`."""
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        stats = self.out_dir / f'{prefix}.jsonl'
+        with open(stats, 'w') as f:
+            f.writelines(
+                json.dumps(stat.to_dict(name)) + '\n'
+                for name, stat in sorted(self.stats.items())
+            )
+            f.writelines(
+                json.dumps({'name': name, 'counter': n}) + '\n'
+                for name, n in sorted(self.counters.items())
+            )
+        trace = self.out_dir / f'{prefix}.trace.json'
+        trace.write_text(
+            json.dumps({'traceEvents': self.events, 'displayTimeUnit': 'ms'})
+        )
+        return stats, trace
+
+
+PROFILER = Profiler()
+
+
+def profiled(name=None):
+    """Record every call of the decorated function while profiling is on."""
+
+    def wrap(fn):
+        key = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not PROFILER.enabled:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                PROFILER.record(key, t0, time.perf_counter_ns() - t0)
+
+        return inner
+
+    return wrap
+
+
+def configure_from_cfg(cfg):
+    """Enable `PROFILER` from an experiment's `[profile]` table, if any."""
+
+    table = dict(cfg.get('profile', {}))
+    if not table.get('enabled', False):
+        return None
+    return PROFILER.configure(**table)
@@ -0,0 +1,226 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from argparse import ArgumentParser
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from eval.accumulators import QuantileSketch
+
+
+def _hhmm(s):
+    h, m = s.split(':')
+    return int(h) * 60 + int(m)
+
+
+def iter_bars(path, columns, chunksize=500_000):
+    """Stream a CSV or Parquet minute-bar file in chunks of `columns`."""
+
+    path = Path(path)
+    if path.suffix == '.parquet':
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(path)
+        for batch in pf.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+
+
+def bucket_daily_volume(
+    paths,
+    steps=50,
+    open_='09:30',
+    close='16:00',
+    ts_col='timestamp',
+    vol_col='volume',
+    ticker_col=None,
+    ticker=None,
+    chunksize=500_000,
+):
+    """Sum minute-bar volume into `steps` time-of-day bins per day.
+
+    Returns {ticker: {date: (steps,) volume}}. Files are streamed in chunks
+    and only the per-day bin totals are kept, so memory is O(days * steps)
+    however long the bar history is. Timestamps are exchange-local.
+
+    """
+
+    t0, t1 = _hhmm(open_), _hhmm(close)
+    session = t1 - t0
+    columns = [ts_col, vol_col] + ([ticker_col] if ticker_col else [])
+    out = {}
+    for path in paths:
+        name = ticker or Path(path).stem
+        for chunk in iter_bars(path, columns, chunksize):
+            ts = pd.to_datetime(chunk[ts_col])
+            minute = (ts.dt.hour * 60 + ts.dt.minute).to_numpy() - t0
+            keep = (minute >= 0) & (minute < session)
+            bins = minute[keep] * steps // session
+            vol = chunk[vol_col].to_numpy(dtype=np.float64)[keep]
+            days = ts.dt.normalize().to_numpy()[keep]
+            names = (
+                chunk[ticker_col].to_numpy()[keep]
+                if ticker_col
+                else np.full(keep.sum(), name, dtype=object)
+            )
+            keys = pd.MultiIndex.from_arrays([names, days])
+            codes, uniq = pd.factorize(keys)
+            sums = np.bincount(
+                codes * steps + bins, weights=vol, minlength=len(uniq) * steps
+            ).reshape(len(uniq), steps)
+            for (tk, day), row in zip(uniq, sums, strict=True):
+                per_day = out.setdefault(tk, {})
+                d = pd.Timestamp(day).strftime('%Y-%m-%d')
+                if d in per_day:
+                    per_day[d] += row
+                else:
+                    per_day[d] = row
+    return out
+
+
+class VolumeProfileIndex:
+    """On-disk per-ticker intraday volume profiles.
+
+    For each ticker `<root>/<ticker>/sketch.json` holds one
+    `QuantileSketch` of daily volume fractions per bin plus the dates
+    folded into them, so its size does not grow with the history beyond
+    the date list. `profile.npy` caches the (n_quantiles, steps) table of
+    per-bin quantiles, each within `alpha` of the exact one. `update`
+    only adds days not seen before; `profile` is an in-memory lookup.
+    Feed a profile to `vwap_schedule` for a VWAP baseline.
+
+    """
+
+    def __init__(
+        self,
+        root='data/volume',
+        steps=50,
+        quantiles=(0.1, 0.25, 0.5, 0.75, 0.9),
+        alpha=0.005,
+    ):
+        self.root = Path(root)
+        self.steps = steps
+        self.quantiles = tuple(quantiles)
+        self.alpha = alpha
+        self._tables = {}
+
+    def _dir(self, ticker):
+        d = self.root / ticker
+        d.mkdir(parents=True, exist_ok=True)
+        return d
+
+    def _state(self, ticker):
+        path = self._dir(ticker) / 'sketch.json'
+        if not path.exists():
+            return {'dates': [], 'bins': None}
+        return json.loads(path.read_text())
+
+    def dates(self, ticker):
+        return self._state(ticker)['dates']
+
+    def sketches(self, ticker, state=None):
+        """The (steps,) per-bin `QuantileSketch`es of a ticker."""
+
+        bins = (state or self._state(ticker))['bins']
+        if bins is None:
+            return [QuantileSketch(self.alpha) for _ in range(self.steps)]
+        return [QuantileSketch.from_state(b) for b in bins]
+
+    def _save(self, path, arr):
+        tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp.npy')
+        np.save(tmp, arr)
+        os.replace(tmp, path)
+
+    def update(self, daily):
+        """Merge `{ticker: {date: bin volumes}}` from `bucket_daily_volume`.
+
+        Days already in the index are never revisited, so feed whole days.
+        Each new day is normalized to fractions summing to 1 and pushed
+        into the per-bin sketches; days with no volume are dropped.
+
+        """
+
+        for ticker, per_day in daily.items():
+            d = self._dir(ticker)
+            state = self._state(ticker)
+            known = state['dates']
+            seen = set(known)
+            new = sorted(k for k, v in per_day.items() if k not in seen)
+            new = [k for k in new if per_day[k].sum() > 0]
+            if not new:
+                continue
+            rows = np.stack([per_day[k] for k in new])
+            if rows.shape[1] != self.steps:
+                raise ValueError(f'expected {self.steps} bins per day')
+            rows = rows / rows.sum(axis=1, keepdims=True)
+            sketches = self.sketches(ticker, state)
+            for sketch, col in zip(sketches, rows.T, strict=True):
+                sketch.push(col)
+            table = np.array(
+                [[sk.quantile(q) for sk in sketches] for q in self.quantiles]
+            )
+            self._save(d / 'profile.npy', table)
+            # dates and sketches are replaced together and last, so a
+            # re-ingest after a crash never counts a day twice
+            state = {
+                'dates': known + new,
+                'bins': [sk.state() for sk in sketches],
+            }
+            tmp = d / f'.sketch.{os.getpid()}.tmp'
+            tmp.write_text(json.dumps(state))
+            os.replace(tmp, d / 'sketch.json')
+            self._tables.pop(ticker, None)
+
+    def ingest(self, paths, **kwargs):
+        """Stream bar files and fold any new days into the index."""
+
+        self.update(bucket_daily_volume(paths, steps=self.steps, **kwargs))
+
+    def profile(self, ticker, q=0.5):
+        """(steps,) volume profile at quantile `q`, normalized to sum 1."""
+
+        if ticker not in self._tables:
+            table = np.load(self._dir(ticker) / 'profile.npy')
+            table = table / table.sum(axis=1, keepdims=True)
+            self._tables[ticker] = table
+        return self._tables[ticker][self.quantiles.index(q)]
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('files', nargs='+', type=Path)
+    parser.add_argument('--root', type=Path, default=Path('data/volume'))
+    parser.add_argument('--steps', type=int, default=50)
+    parser.add_argument('--ticker')
+    parser.add_argument('--ticker-col')
+    parser.add_argument('--ts-col', default='timestamp')
+    parser.add_argument('--vol-col', default='volume')
+    args = parser.parse_args()
+    VolumeProfileIndex(args.root, args.steps).ingest(
+        args.files,
+        ticker=args.ticker,
+        ticker_col=args.ticker_col,
+        ts_col=args.ts_col,
+        vol_col=args.vol_col,
+    )
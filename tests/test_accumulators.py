@@ -0,0 +1,80 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import itertools
+
+import numpy as np
+import pytest
+
+from eval.accumulators import Drawdown, Moments, QuantileSketch
+from eval.metrics import max_drawdown
+
+SPLITS = [(0, 1, 500, 2000), (0, 1000, 1001, 2000), (0, 2000, 2000, 2000)]
+
+
+def _stream(seed=0, n=2000):
+    rng = np.random.default_rng(seed)
+    return rng.standard_t(3, n) * 0.01 + 0.0002
+
+
+def _merged(cls, x, cuts, **kwargs):
+    parts = [cls(**kwargs).push(x[a:b]) for a, b in itertools.pairwise(cuts)]
+    acc = parts[0]
+    for part in parts[1:]:
+        acc.merge(part)
+    return acc
+
+
+@pytest.mark.parametrize('cuts', SPLITS)
+def test_moments_merge_matches_single_pass(cuts):
+    x = _stream()
+    whole = Moments()
+    for v in x:
+        whole.push(v)
+    merged = _merged(Moments, x, cuts)
+    assert merged.n == whole.n == x.size
+    np.testing.assert_allclose(merged.mean, x.mean(), rtol=1e-12)
+    np.testing.assert_allclose(merged.var, x.var(), rtol=1e-12)
+    np.testing.assert_allclose(whole.var, x.var(), rtol=1e-12)
+
+
+@pytest.mark.parametrize('cuts', SPLITS)
+def test_drawdown_merge_matches_max_drawdown(cuts):
+    x = _stream(1)
+    equity = np.exp(np.concatenate([[0.0], np.cumsum(x)]))
+    expected = max_drawdown(equity)
+    merged = _merged(Drawdown, x, cuts)
+    np.testing.assert_allclose(merged.value, expected, rtol=1e-12)
+    np.testing.assert_allclose(Drawdown().push(x).value, expected)
+
+
+@pytest.mark.parametrize('cuts', SPLITS)
+def test_quantile_sketch_merge_within_alpha(cuts):
+    alpha = 0.01
+    x = _stream(2)
+    x[::97] = 0.0
+    whole = QuantileSketch(alpha).push(x)
+    merged = _merged(QuantileSketch, x, cuts, alpha=alpha)
+    assert merged.pos == whole.pos and merged.neg == whole.neg
+    assert merged.zeros == whole.zeros and merged.n == whole.n
+    ranked = np.sort(x)
+    for q in (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99):
+        exact = ranked[int(q * (x.size - 1))]
+        got = merged.quantile(q)
+        assert abs(got - exact) <= alpha * abs(exact)
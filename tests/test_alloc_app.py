@@ -0,0 +1,68 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import numpy as np
+
+from apps.sb3_sac_alloc import eval_env_fn, evaluate, ew_rewards
+from envs.alloc_env import AllocationEnv
+from eval.runner import episode_seeds
+
+
+def _env(n_days=400, n_assets=4, seed=0):
+    rng = np.random.default_rng(seed)
+    log_ret = rng.normal(2e-4, 1e-2, size=(n_days, n_assets))
+    prices = 100.0 * np.exp(np.cumsum(log_ret, axis=0))
+    env_kwargs = {
+        'features': None,
+        'window': 20,
+        'rebalance_every': 5,
+        'cost_bps': 2.0,
+        'reward_cfg': None,
+    }
+    return AllocationEnv, prices, np.diff(np.log(prices), axis=0), env_kwargs
+
+
+def _cfg(**eval_cfg):
+    return {'seed': 123, 'eval': {'n_episodes': 8, **eval_cfg}}
+
+
+def test_eval_episodes_differ():
+    fn, n = eval_env_fn(_cfg(episode_len=10), _env())
+    assert n == 8
+    starts = []
+    for s in episode_seeds(123, n):
+        env = fn()
+        env.reset(seed=int(s))
+        starts.append(env.t)
+    assert len(set(starts)) == n
+    rewards = ew_rewards(fn, episode_seeds(123, n))
+    assert all(len(r) == 10 for r in rewards)
+    assert len({r.tobytes() for r in rewards}) == n
+
+
+def test_deterministic_eval_runs_one_episode():
+    from stable_baselines3 import PPO
+
+    env = _env()
+    fn, n = eval_env_fn(_cfg(), env, n_episodes=50)
+    assert n == 1
+    model = PPO('MlpPolicy', fn(), seed=0, device='cpu')
+    stats = evaluate(model, _cfg(), env, n_episodes=50)
+    assert stats['n_episodes'] == 1
+    assert stats['Sharpe_lo'] <= stats['Sharpe_hi']
@@ -0,0 +1,59 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import numpy as np
+import pytest
+
+from baselines.almgren_chriss import (
+    ac_cost,
+    almgren_chriss_exact,
+    env_ac_params,
+)
+from eval.schedule_cost import schedule_cost
+
+ENV_CFG = {
+    'steps': 50,
+    'init_inventory': 1000,
+    'fee_per_share': 1e-4,
+    'impact_coeff': 2e-3,
+    'gbm_sigma': 0.02,
+}
+
+
+@pytest.mark.parametrize('lam', [0.0, 1e-6, 1e-4])
+def test_ac_cost_matches_env_schedule_cost(lam):
+    # lam = 0 is TWAP
+    p = env_ac_params(ENV_CFG)
+    args = (p['T'], p['q0'], lam, p['sigma'], p['eta'], p['gamma'])
+    E, V = ac_cost(*args, fee=p['fee'], tau=p['tau'])
+    schedule = almgren_chriss_exact(*args, tau=p['tau'])
+    if lam == 0.0:
+        np.testing.assert_allclose(schedule, 20.0)
+    env = schedule_cost(schedule, ENV_CFG)
+    assert E > p['fee'] * p['q0']  # impact is a cost in both
+    np.testing.assert_allclose(env['E'][0], E, rtol=1e-9)
+    # GBM mids vs AC's arithmetic random walk
+    np.testing.assert_allclose(env['V'][0], V, rtol=1e-2)
+
+
+def test_frontier_trades_cost_for_variance():
+    p = env_ac_params(ENV_CFG)
+    lam = np.array([0.0, 1e-6, 1e-5, 1e-4])
+    E, V = ac_cost(p['T'], p['q0'], lam, p['sigma'], p['eta'], fee=p['fee'])
+    assert np.all(np.diff(E) > 0) and np.all(np.diff(V) < 0)
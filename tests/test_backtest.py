@@ -0,0 +1,119 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+
+from functools import partial
+
+import numpy as np
+import pytest
+
+from baselines.bh_mom_rev import momentum_signal, reverse_signal
+from envs.alloc_env import AllocationEnv
+from eval.backtest import (
+    SIGNALS,
+    backtest,
+    momentum_weights,
+    rebalance_times,
+    reversal_weights,
+    summarize,
+    sweep,
+)
+
+WINDOW, K = 60, 5
+
+
+def _prices(n_days=400, n_assets=4, seed=0):
+    rng = np.random.default_rng(seed)
+    log_ret = rng.normal(2e-4, 1e-2, size=(n_days, n_assets))
+    return 100.0 * np.exp(np.cumsum(log_ret, axis=0))
+
+
+def _env_run(prices, weights, dtype):
+    env = AllocationEnv(prices, window=WINDOW, rebalance_every=K)
+    equity, turnover, done = [], [], False
+    for w in weights:
+        assert not done
+        _, _, done, _, info = env.step(w.astype(dtype))
+        equity.append(env.equity)
+        turnover.append(info['turnover'])
+    assert done
+    return np.array(equity), np.array(turnover)
+
+
+@pytest.mark.parametrize(
+    'signal',
+    [
+        SIGNALS['EW'],
+        partial(momentum_weights, lookback=20),
+        partial(reversal_weights, lookback=5),
+    ],
+)
+def test_backtest_matches_allocation_env(signal):
+    prices = _prices()
+    returns = np.log(prices[1:] / prices[:-1])
+    res = backtest(returns, signal, WINDOW, K, cost_bps=2.0)
+    weights = np.asarray(signal(returns, res['times'])).reshape(-1, 4)
+    # float64 actions: the same accounting up to rounding
+    equity, turnover = _env_run(prices, weights, np.float64)
+    expected = res['equity'].ravel()[1:]
+    np.testing.assert_allclose(expected, equity, rtol=1e-12)
+    np.testing.assert_allclose(res['turnover'].ravel(), turnover, atol=1e-12)
+    # the float32 actions a policy emits only move it by rounding
+    equity32, _ = _env_run(prices, weights, np.float32)
+    np.testing.assert_allclose(expected, equity32, rtol=1e-6)
+
+
+def test_signals_match_bh_mom_rev():
+    returns = np.log(_prices()[1:] / _prices()[:-1])
+    times = rebalance_times(len(returns), WINDOW, K)
+    mom = momentum_weights(returns, times, lookback=[20, 60])
+    rev = reversal_weights(returns, times, lookback=5)
+    for i, t in enumerate(times):
+        for j, lb in enumerate((20, 60)):
+            np.testing.assert_allclose(
+                mom[j, i], momentum_signal(returns[:t], lb), atol=1e-12
+            )
+        np.testing.assert_allclose(
+            rev[0, i], reverse_signal(returns[:t], 5), atol=1e-12
+        )
+
+
+def test_sweep_grid_matches_single_runs():
+    returns = np.log(_prices()[1:] / _prices()[:-1])
+    costs = (0.0, 2.0, 10.0)
+    table = sweep(
+        returns,
+        lookbacks={'MOM': [20, 60], 'REV': [5, 10]},
+        cost_bps=costs,
+        window=WINDOW,
+        rebalance_every=K,
+    )
+    assert len(table) == (1 + 1 + 2 + 2) * len(costs)
+    for row in table.itertuples():
+        signal = SIGNALS[row.baseline]
+        if row.baseline in ('MOM', 'REV'):
+            signal = partial(signal, lookback=int(row.lookback))
+        single = summarize(
+            backtest(returns, signal, WINDOW, K, cost_bps=row.cost_bps)
+        )
+        for k in ('Sharpe', 'MaxDD', 'final', 'turnover'):
+            assert getattr(row, k) == pytest.approx(single[k].item())
+    # costs only ever take from a strategy that trades
+    mom = table[(table.baseline == 'MOM') & (table.lookback == 20)]
+    assert np.all(np.diff(mom.sort_values('cost_bps')['final']) < 0)
@@ -0,0 +1,94 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+
+import numpy as np
+import pytest
+import torch
+
+from agents.custom_policy import TemporalConvExtractor, resolve_policy_kwargs
+from envs.alloc_env import AllocationEnv
+from utils.features import FeatureStore
+
+WINDOW = 30
+
+
+def _env(n_assets, cov=None, seed=0):
+    rng = np.random.default_rng(seed)
+    log_ret = rng.normal(2e-4, 1e-2, size=(200, n_assets))
+    prices = 100.0 * np.exp(np.cumsum(log_ret, axis=0))
+    features = None
+    if cov is not None:
+        returns = np.log(prices[1:] / prices[:-1])
+        features = FeatureStore.build(returns, cov=cov)
+    return AllocationEnv(prices, window=WINDOW, features=features)
+
+
+def _n_params(module):
+    return sum(p.numel() for p in module.parameters())
+
+
+@pytest.mark.parametrize('cov', [None, False, True])
+def test_temporal_conv_size_does_not_depend_on_n(cov):
+    sizes = []
+    for n_assets in (3, 8, 20):
+        env = _env(n_assets, cov)
+        ext = TemporalConvExtractor(
+            env.observation_space, window=WINDOW, out_dim=4
+        )
+        obs = np.stack([env.reset(seed=s)[0] for s in range(2)])
+        out = ext(torch.as_tensor(obs))
+        assert out.shape == (2, ext.features_dim) == (2, 4 * n_assets)
+        assert torch.isfinite(out).all()
+        sizes.append(_n_params(ext))
+    assert len(set(sizes)) == 1
+
+
+def test_temporal_conv_uses_feature_rows():
+    env = _env(5, cov=True)
+    ext = TemporalConvExtractor(env.observation_space, window=WINDOW)
+    obs = torch.as_tensor(env.reset()[0]).unsqueeze(0)
+    bumped = obs.clone()
+    bumped[:, WINDOW + 2] += 1.0  # the vol row
+    assert not torch.allclose(ext(obs), ext(bumped))
+
+
+def test_temporal_conv_needs_the_window():
+    space = _env(5, cov=True).observation_space
+    with pytest.raises(ValueError, match='needs the env window'):
+        TemporalConvExtractor(space)
+    # a wrong window would read feature rows as returns
+    with pytest.raises(ValueError, match='rows past window'):
+        TemporalConvExtractor(space, window=WINDOW - 1)
+
+
+def test_resolve_policy_kwargs_fills_window():
+    kwargs = resolve_policy_kwargs(
+        {'features_extractor_class': 'TemporalConvExtractor'}, WINDOW
+    )
+    assert kwargs['features_extractor_class'] is TemporalConvExtractor
+    assert kwargs['features_extractor_kwargs'] == {'window': WINDOW}
+    kwargs = resolve_policy_kwargs(
+        {
+            'features_extractor_class': 'TemporalConvExtractor',
+            'features_extractor_kwargs': {'window': 20, 'patch': 4},
+        },
+        WINDOW,
+    )
+    assert kwargs['features_extractor_kwargs'] == {'window': 20, 'patch': 4}
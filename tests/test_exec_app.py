@@ -0,0 +1,51 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+
+import pytest
+
+from apps.sb3_ppo_exec import baselines
+
+ENV = {'steps': 10, 'init_inventory': 1000, 'gbm_sigma': 0.02}
+
+
+def _cfg(names):
+    return {'env': ENV, 'eval': {'baselines': names}}
+
+
+def test_vwap_without_volume_ticker_warns():
+    with pytest.warns(UserWarning, match='skipping VWAP'):
+        rows = baselines(_cfg(['TWAP', 'VWAP', 'AC']), n_paths=200)
+    assert [r['baseline'] for r in rows] == ['TWAP', 'AC']
+    assert all(r['IS_mean'] > 0 for r in rows)
+
+
+def test_no_buildable_baseline_raises():
+    with pytest.raises(ValueError, match='no execution baselines'):
+        baselines(_cfg([]), n_paths=200)
+    with (
+        pytest.warns(UserWarning, match='skipping VWAP'),
+        pytest.raises(ValueError, match='no execution baselines'),
+    ):
+        baselines(_cfg(['VWAP']), n_paths=200)
+
+
+def test_unknown_baseline_raises():
+    with pytest.raises(ValueError, match="unknown execution baseline 'POV'"):
+        baselines(_cfg(['TWAP', 'POV']), n_paths=200)
@@ -0,0 +1,85 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import numpy as np
+import pytest
+
+from envs.exec_env import ExecutionEnv
+
+# flat mids isolate the impact and fee terms
+FLAT = {'steps': 10, 'init_inventory': 1000, 'gbm_sigma': 0.0}
+
+
+def _episode(cfg, action):
+    env = ExecutionEnv(cfg)
+    env.reset(seed=0)
+    done = False
+    while not done:
+        _, reward, done, _, _ = env.step(action)
+    return env, reward
+
+
+def _reference(cfg, action):
+    # hand loop of the buy program: q shares at mid * (1 + impact * q / q0)
+    q0, impact, fee = cfg['init_inventory'], cfg['impact_coeff'], 0.0001
+    inv, paid = q0, 0.0
+    for _ in range(cfg['steps']):
+        q = min(
+            inv, int(np.round(ExecutionEnv(cfg).action_fracs[action] * inv))
+        )
+        paid += q * (100.0 * (1 + impact * q / q0) + fee)
+        inv -= q
+        if inv == 0:
+            break
+    paid += inv * (100.0 * (1 + impact * inv / q0) + fee)
+    return paid - 100.0 * q0
+
+
+@pytest.mark.parametrize('action', [0, 2, 4])
+def test_impact_is_a_cost_of_buying(action):
+    shortfalls = []
+    for impact in (0.0, 2e-3, 1e-2):
+        cfg = {**FLAT, 'impact_coeff': impact}
+        env, reward = _episode(cfg, action)
+        ishort = -env.cash - env.mid_hist[0] * env.init_inventory
+        assert reward == pytest.approx(-ishort)
+        assert ishort == pytest.approx(_reference(cfg, action))
+        shortfalls.append(ishort)
+    # fees alone cost q0 * fee; impact only ever adds to it
+    assert shortfalls[0] == pytest.approx(1000 * 0.0001)
+    assert shortfalls[0] < shortfalls[1] < shortfalls[2]
+
+
+def test_inventory_penalty_runs_every_step():
+    cfg = {**FLAT, 'impact_coeff': 2e-3}
+    pen = {'type': 'is_plus_inv_pen', 'inv_penalty': 1e-4}
+    plain = ExecutionEnv(cfg)
+    penalised = ExecutionEnv({**cfg, 'reward': pen})
+    plain.reset(seed=0)
+    penalised.reset(seed=0)
+    done = False
+    while not done:
+        # shares still to buy after this step's child order, including
+        # the ones the horizon buys at the last step
+        held = penalised.inv - int(np.round(0.05 * penalised.inv))
+        _, r0, done, _, _ = plain.step(1)
+        _, r1, _, _, _ = penalised.step(1)
+        assert held > 0
+        assert r1 == pytest.approx(r0 - 1e-4 * held**2)
+    assert penalised.cash == plain.cash
@@ -0,0 +1,100 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+
+import numpy as np
+import pytest
+
+from baselines.bh_mom_rev import momentum_signal, reverse_signal
+from utils.features import FeatureStore, ewma_cov, rolling_mean, rolling_std
+
+
+def _returns(T=300, N=4, seed=0):
+    return np.random.default_rng(seed).normal(0, 1e-2, size=(T, N))
+
+
+@pytest.mark.parametrize('lookback', [1, 5, 20])
+def test_rolling_stats_match_trailing_windows(lookback):
+    x = _returns(60)
+    mean, std = rolling_mean(x, lookback), rolling_std(x, lookback)
+    for t in range(len(x)):
+        window = x[max(0, t + 1 - lookback) : t + 1]
+        np.testing.assert_allclose(mean[t], window.mean(axis=0), atol=1e-15)
+        np.testing.assert_allclose(std[t], window.std(axis=0), atol=1e-9)
+
+
+@pytest.mark.parametrize('lam', [0.94, 0.5])
+def test_ewma_cov_matches_recursion(lam):
+    x = _returns()
+    cov = np.outer(x[0], x[0])
+    expected = []
+    for row in x:
+        cov = lam * cov + (1 - lam) * np.outer(row, row)
+        expected.append(cov)
+    np.testing.assert_allclose(ewma_cov(x, lam), expected, rtol=1e-9)
+    into = np.empty((len(x), x.shape[1], x.shape[1]), dtype=np.float32)
+    ewma_cov(x, lam, out=into)
+    np.testing.assert_allclose(into, expected, rtol=1e-5)
+
+
+def test_store_rows_hold_fields_and_cov():
+    x = _returns()
+    store = FeatureStore.build(x)
+    assert store.rows.dtype == np.float32
+    assert store.rows.shape == (len(x), 5 + x.shape[1], x.shape[1])
+    t = 100
+    obs = store.observation(t)
+    np.testing.assert_allclose(obs[5:], ewma_cov(x)[t - 1], rtol=1e-5)
+    np.testing.assert_allclose(
+        store.momentum[t - 1], momentum_signal(x[:t]), rtol=1e-5
+    )
+    np.testing.assert_allclose(
+        store.reversal[t - 1], reverse_signal(x[:t]), rtol=1e-5
+    )
+    lean = FeatureStore.build(x, cov=False)
+    assert lean.rows.shape == (len(x), 5, x.shape[1])
+    np.testing.assert_array_equal(lean.rows, store.rows[:, :5])
+
+
+def test_cache_keys_resolved_params(tmp_path, monkeypatch):
+    x = _returns()
+    built = []
+    build = FeatureStore.build.__func__
+
+    def counting(cls, returns, **params):
+        built.append(params)
+        return build(cls, returns, **params)
+
+    monkeypatch.setattr(FeatureStore, 'build', classmethod(counting))
+    first = FeatureStore.load_or_build(x, cache_dir=tmp_path)
+    # spelling out a default is the same store
+    again = FeatureStore.load_or_build(
+        x, cache_dir=tmp_path, mom_lookback=60, cov=True
+    )
+    assert len(built) == 1
+    np.testing.assert_array_equal(first.rows, again.rows)
+    assert again.params == FeatureStore.DEFAULTS
+
+    other = FeatureStore.load_or_build(x, cache_dir=tmp_path, vol_lookback=10)
+    assert len(built) == 2
+    assert not np.array_equal(other.vol, first.vol)
+    assert len(list(tmp_path.glob('features_*.npz'))) == 2
+
+    with pytest.raises(TypeError, match='unknown feature params'):
+        FeatureStore.load_or_build(x, cache_dir=tmp_path, vol_window=10)
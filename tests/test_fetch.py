@@ -0,0 +1,170 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data import PriceCache
+from utils.fetch import (
+    FetchError,
+    HttpClient,
+    RateLimiter,
+    StooqSource,
+    fetch_many,
+)
+
+DATES = pd.bdate_range('2020-01-01', '2020-12-31')
+CLOSES = {
+    t: 100.0 + np.arange(len(DATES)) * (i + 1)
+    for i, t in enumerate(['AAA', 'BBB', 'FLAKY'])
+}
+
+
+class StooqStub(BaseHTTPRequestHandler):
+    """Serves Stooq CSVs; FLAKY answers 429 twice, BROKEN 503."""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive, so reuse is observable
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body):
+        body = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/csv')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        q = parse_qs(urlsplit(self.path).query)
+        ticker = q['s'][0].upper()
+        with server.lock:
+            server.hits[ticker] += 1
+            server.peers.add(self.client_address)
+            hits = server.hits[ticker]
+        if ticker == 'BROKEN' or (ticker == 'FLAKY' and hits <= 2):
+            return self._send(503 if ticker == 'BROKEN' else 429, '')
+        if ticker not in CLOSES:
+            # Stooq answers unknown symbols with a 200 and no CSV
+            return self._send(200, 'No data')
+        # both ends of Stooq's range are inclusive
+        lo, hi = pd.Timestamp(q['d1'][0]), pd.Timestamp(q['d2'][0])
+        keep = (DATES >= lo) & (DATES <= hi)
+        rows = [
+            f'{d:%Y-%m-%d},{c},{c},{c},{c},1000'
+            for d, c in zip(DATES[keep], CLOSES[ticker][keep])
+        ]
+        body = 'Date,Open,High,Low,Close,Volume\n' + '\n'.join(rows)
+        self._send(200, body)
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), StooqStub)
+    srv.hits = Counter()
+    srv.peers = set()
+    srv.lock = threading.Lock()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def source(server):
+    host, port = server.server_address
+    src = StooqSource(
+        base_url=f'http://{host}:{port}/q/d/l/',
+        client=HttpClient(timeout=5.0),
+    )
+    yield src
+    src.client.close()
+
+
+def _fetch(source, tickers, **kwargs):
+    return fetch_many(
+        source,
+        tickers,
+        '2020-03-01',
+        '2020-06-01',
+        backoff=0.01,
+        rate_limiter=RateLimiter(rate=1e9, burst=8),
+        **kwargs,
+    )
+
+
+def test_stooq_source_parses_csv(source):
+    close = source('BBB', '2020-03-01', '2020-06-01')
+    keep = (DATES >= '2020-03-01') & (DATES <= '2020-06-01')
+    np.testing.assert_array_equal(close.to_numpy(), CLOSES['BBB'][keep])
+    assert list(close.index) == list(DATES[keep])
+
+
+def test_retries_and_partial_failure(server, source):
+    tickers = ['AAA', 'FLAKY', 'MISSING', 'BROKEN']
+    ok, failed = _fetch(source, tickers, max_retries=4)
+    assert sorted(ok) == ['AAA', 'FLAKY']
+    assert sorted(failed) == ['BROKEN', 'MISSING']
+    assert 'no data for MISSING' in failed['MISSING']
+    assert 'HTTP 503' in failed['BROKEN']
+    # 429s are retried until they clear; empty answers are not retried
+    assert server.hits['FLAKY'] == 3
+    assert server.hits['MISSING'] == 1
+    assert server.hits['BROKEN'] == 4
+
+
+def test_connection_is_reused_across_tickers(server, source):
+    ok, failed = _fetch(source, ['AAA', 'BBB', 'FLAKY'], max_workers=1)
+    assert not failed and len(ok) == 3
+    assert sum(server.hits.values()) == 5
+    assert len(server.peers) == 1
+
+
+def test_price_cache_reports_failed_tickers(tmp_path, server, source):
+    cache = PriceCache(
+        root=str(tmp_path),
+        downloader=source,
+        max_retries=3,
+        backoff=0.01,
+        rate_limiter=RateLimiter(rate=1e9, burst=8),
+    )
+    with pytest.raises(FetchError) as exc:
+        cache.load(['AAA', 'MISSING', 'BROKEN'], '2020-03-01', '2020-06-01')
+    assert not isinstance(exc.value, RuntimeError)
+    assert sorted(exc.value.failed) == ['BROKEN', 'MISSING']
+    assert 'failed to fetch 2 ticker(s)' in str(exc.value)
+    assert 'MISSING: ValueError: no data for MISSING' in str(exc.value)
+
+    # the ticker that arrived is cached; a rerun only asks for the others
+    server.hits.clear()
+    with pytest.raises(FetchError):
+        cache.load(['AAA', 'MISSING'], '2020-03-01', '2020-06-01')
+    assert server.hits == Counter({'MISSING': 1})
+    frame = cache.load(['AAA'], '2020-03-01', '2020-06-01')
+    assert len(frame) == 65
+    assert server.hits['AAA'] == 0
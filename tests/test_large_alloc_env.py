@@ -0,0 +1,77 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import numpy as np
+
+from envs.large_alloc_env import LargeUniverseAllocationEnv
+from utils.features import FeatureStore
+
+
+def _prices(n_days=400, n_assets=30, seed=0):
+    rng = np.random.default_rng(seed)
+    # a common factor so the top principal component is well separated
+    common = rng.normal(0, 1e-2, size=(n_days, 1))
+    log_ret = common + rng.normal(0, 5e-3, size=(n_days, n_assets))
+    return 100.0 * np.exp(np.cumsum(log_ret, axis=0))
+
+
+def test_sliding_stats_match_window():
+    env = LargeUniverseAllocationEnv(_prices(), n_factors=4)
+    env.reset()
+    for _ in range(30):
+        obs, *_ = env.step(np.ones(env.N, dtype=np.float32))
+    block = env.returns[env.t - env.window : env.t]
+    np.testing.assert_allclose(obs[:, 0], block.mean(axis=0), atol=1e-7)
+    np.testing.assert_allclose(obs[:, 1], block.std(axis=0), rtol=1e-5)
+    np.testing.assert_allclose(obs[:, 3], block.sum(axis=0), rtol=1e-5)
+
+    # top factor against the dense shrinkage covariance
+    cov = np.cov(block, rowvar=False, bias=True)
+    shrunk = 0.9 * cov + 0.1 * np.diag(np.diag(cov))
+    top = np.linalg.eigh(shrunk)[1][:, -1]
+    assert abs(top @ env._vecs[:, 0]) > 0.99
+
+
+def test_features_are_appended_per_asset():
+    prices = _prices()
+    returns = np.log(prices[1:] / prices[:-1])
+    features = FeatureStore.build(returns)
+    env = LargeUniverseAllocationEnv(prices, n_factors=4, features=features)
+    obs, _ = env.reset()
+    n_fields = len(FeatureStore.FIELDS)
+    assert obs.shape == env.observation_space.shape == (env.N, 8 + n_fields)
+    np.testing.assert_array_equal(
+        obs[:, 8:], features.observation(env.t)[:n_fields].T
+    )
+
+
+def test_asset_set_extractor_size_does_not_depend_on_n():
+    import torch
+    from gymnasium import spaces
+
+    from agents.custom_policy import AssetSetExtractor
+
+    sizes = []
+    for n_assets in (10, 500):
+        space = spaces.Box(-np.inf, np.inf, shape=(n_assets, 12))
+        ext = AssetSetExtractor(space, out_dim=8)
+        out = ext(torch.zeros(3, n_assets, 12))
+        assert out.shape == (3, ext.features_dim) == (3, 16)
+        sizes.append(sum(p.numel() for p in ext.parameters()))
+    assert sizes[0] == sizes[1]
@@ -0,0 +1,129 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import numpy as np
+import pytest
+
+from baselines.twap_vwap import twap_schedule
+from envs.lob_env import LOBExecutionEnv, OrderBook, OrderFlow
+
+# no background flow: the book only changes through the agent's orders
+STATIC = {'events': 0, 'cancel_prob': 0.0}
+
+
+def _book(depth=100, n_levels=10):
+    book = OrderBook(100.0, 0.01, 256)
+    book.seed_book(depth, n_levels)
+    return book
+
+
+def test_market_orders_walk_the_book():
+    book = _book()
+    c = book.center
+    assert book.mid == pytest.approx(100.0)
+    filled, notional = book.market_buy(250)
+    assert filled == 250
+    # 100 @ 100.01, 100 @ 100.02, 50 @ 100.03
+    assert notional == pytest.approx(100 * 100.01 + 100 * 100.02 + 50 * 100.03)
+    assert book.best_ask == c + 3 and book.ask[c + 3] == 50
+    filled, notional = book.market_sell(100)
+    assert filled == 100 and notional == pytest.approx(100 * 99.99)
+    assert book.best_bid == c - 2
+    # more than the side holds fills what is there
+    filled, _ = book.market_buy(10_000)
+    assert filled == 750 and book.best_ask == book.n_levels
+
+
+def test_limit_orders_and_cancels_move_the_touch():
+    book = _book()
+    c = book.center
+    book.add_bids(np.array([c, c, c + 5]), 10)
+    # c + 5 would cross the ask at c + 1 and is dropped
+    assert book.best_bid == c and book.bid[c] == 20
+    assert book.bid[c + 5] == 0
+    book.add_asks(np.array([c]), 10)
+    assert book.ask[c] == 0
+    n = book.cancel(np.random.default_rng(0), 1.0, 10)
+    assert n == 2 + 10 * 10 + 10 * 10
+    assert book.best_bid == -1 and book.best_ask == book.n_levels
+
+
+def test_background_flow_moves_the_mid():
+    rng = np.random.default_rng(0)
+    book = _book(depth=100, n_levels=50)
+    flow = OrderFlow(rng)
+    mids = []
+    for _ in range(500):
+        flow.apply(book)
+        mids.append(book.mid)
+    steps = np.diff(mids)
+    # the touch depletes often enough for the mid to walk many ticks
+    assert np.mean(steps != 0) > 0.3
+    assert np.ptp(mids) > 0.2
+    assert book.best_bid >= 0 and book.best_ask < book.n_levels
+
+
+def test_env_last_ret_is_not_constant():
+    env = LOBExecutionEnv({'steps': 200, 'seed': 1})
+    rets = []
+    done = False
+    while not done:
+        obs, _, done, _, _ = env.step(0)
+        rets.append(obs[2])
+    assert np.std(rets) > 1e-5
+
+
+def test_twap_run_schedule_is_matches_hand_computation():
+    cfg = {
+        'steps': 10,
+        'init_inventory': 1000,
+        'init_depth': 100,
+        'init_levels': 20,
+        'flow': STATIC,
+    }
+    env = LOBExecutionEnv(cfg)
+    out = env.run_schedule(twap_schedule(10, 1000), seed=0)
+    # a static book: the ten child orders sweep the first ten ask levels
+    levels = 100.0 + 0.01 * np.arange(1, 11)
+    paid = 100 * levels.sum() + 1000 * env.fee
+    assert out['unfilled'] == 0
+    assert out['paid'] == pytest.approx(paid)
+    assert out['IS'] == pytest.approx(paid - 100.0 * 1000)
+
+
+def test_unfilled_inventory_is_charged():
+    cfg = {
+        'steps': 5,
+        'init_inventory': 1000,
+        'init_depth': 100,
+        'init_levels': 3,
+        'unfilled_cost_bps': 100.0,
+        'flow': STATIC,
+    }
+    env = LOBExecutionEnv(cfg)
+    env.reset(seed=0)
+    done = False
+    while not done:
+        _, reward, done, _, info = env.step(0)
+    # 300 shares on the book, 700 bought at the mid plus 1%
+    assert info['unfilled'] == 700 and env.inv == 0
+    book_cost = 100 * (100.01 + 100.02 + 100.03)
+    extra = 700 * (env.mid * 1.01)
+    paid = book_cost + extra + 1000 * env.fee
+    assert reward == pytest.approx(-(paid - 100.0 * 1000))
@@ -0,0 +1,157 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import numpy as np
+import pytest
+
+from envs.multi_exec_env import MultiAssetExecutionEnv, impact_matrix
+
+
+def test_impact_matrix_from_config_array():
+    m = impact_matrix(2e-3, 0.3, 3)
+    env = MultiAssetExecutionEnv({'n_assets': 3, 'impact_matrix': m})
+    np.testing.assert_array_equal(env.temp_impact, m)
+
+
+def test_impact_matrix_shape_is_checked():
+    with pytest.raises(ValueError):
+        MultiAssetExecutionEnv({'n_assets': 3, 'impact_matrix': np.eye(2)})
+
+
+CFG = {
+    'n_assets': 3,
+    'steps': 8,
+    'init_inventory': [1000, 500, 200],
+    'fee_per_share': 0.0001,
+    'impact_coeff': [2e-3, 4e-3, 1e-3],
+    'perm_impact_coeff': 1e-3,
+    'cross_impact': 0.3,
+    'gbm_sigma': [0.01, 0.02, 0.03],
+    'gbm_corr': 0.5,
+}
+
+
+def _reference_episode(cfg, fracs, seed):
+    """Hand loop over assets of the buy program, same normals as the env."""
+
+    env = MultiAssetExecutionEnv(cfg)
+    L, G, chol = env.temp_impact, env.perm_impact, env.chol
+    n, q0, fee = env.n_assets, env.init_inventory, env.fee
+    rng = np.random.default_rng(seed)
+    inv, mid = [int(v) for v in q0], [100.0] * n
+    cash, rewards = [0.0] * n, []
+
+    def trade(qty):
+        x = [qty[j] / q0[j] for j in range(n)]
+        for i in range(n):
+            impact = sum(L[i, j] * x[j] for j in range(n))
+            cash[i] -= qty[i] * (mid[i] * (1 + impact) + fee[i])
+            inv[i] -= qty[i]
+        return x
+
+    for t, frac in enumerate(fracs):
+        qty = [min(inv[i], int(np.round(frac[i] * inv[i]))) for i in range(n)]
+        x = trade(qty)
+        z = rng.standard_normal(n)
+        for i in range(n):
+            shock = sum(chol[i, j] * z[j] for j in range(n))
+            log_ret = -0.5 * env.sigma[i] ** 2 + shock
+            perm = sum(G[i, j] * x[j] for j in range(n))
+            mid[i] *= np.exp(log_ret) * (1 + perm)
+        if t + 1 == env.steps or not any(inv):
+            trade(list(inv))
+            ishort = [-cash[i] - 100.0 * q0[i] for i in range(n)]
+            rewards.append(-sum(ishort))
+            return rewards, np.array(ishort)
+        rewards.append(0.0)
+    raise AssertionError('episode did not end')
+
+
+@pytest.mark.parametrize('action_type', ['discrete', 'continuous'])
+def test_step_matches_per_asset_reference(action_type):
+    cfg = {**CFG, 'action_type': action_type}
+    env = MultiAssetExecutionEnv(cfg)
+    env.action_space.seed(0)
+    actions = [env.action_space.sample() for _ in range(env.steps)]
+    if action_type == 'discrete':
+        fracs = [env.action_fracs[a] for a in actions]
+    else:
+        fracs = [np.clip(a.astype(np.float64), 0, 1) for a in actions]
+    expected, ishort = _reference_episode(cfg, fracs, seed=5)
+    env.reset(seed=5)
+    rewards, info = [], {}
+    for a in actions:
+        _, r, done, _, info = env.step(a)
+        rewards.append(r)
+        if done:
+            break
+    np.testing.assert_allclose(rewards, expected, rtol=1e-10)
+    np.testing.assert_allclose(info['IS'], ishort, rtol=1e-10)
+    assert not env.inv.any()
+
+
+def test_uncoupled_assets_match_execution_env():
+    from envs.exec_env import ExecutionEnv
+
+    cfg = {'n_assets': 3, 'steps': 10, 'gbm_sigma': 0.0, 'cross_impact': 0.0}
+    env = MultiAssetExecutionEnv(cfg)
+    env.reset(seed=0)
+    actions = [(0, 2, 4)] * 10
+    for a in actions:
+        _, _, done, _, info = env.step(a)
+    assert done
+    for i in range(3):
+        single = ExecutionEnv({'steps': 10, 'gbm_sigma': 0.0})
+        single.reset(seed=0)
+        for a in actions:
+            _, r_i, done_i, _, _ = single.step(a[i])
+            if done_i:
+                break
+        assert info['IS'][i] == pytest.approx(-r_i)
+
+
+def test_twap_schedule_shortfall_by_hand():
+    # flat mids: IS is impact and fees only, with permanent impact and
+    # cross-impact carried from step to step
+    cfg = {
+        'n_assets': 2,
+        'steps': 4,
+        'init_inventory': [1000, 400],
+        'fee_per_share': 0.01,
+        'impact_coeff': [1e-2, 2e-2],
+        'perm_impact_coeff': 5e-3,
+        'cross_impact': 0.5,
+        'gbm_sigma': 0.0,
+    }
+    env = MultiAssetExecutionEnv(cfg)
+    schedule = np.tile([250.0, 100.0], (4, 1))
+    ishort = env.run_schedule(schedule, seed=0)
+
+    # every child order is a quarter of each inventory, x = 0.25 each
+    c = 0.5 * np.sqrt(1e-2 * 2e-2)
+    temp = [1e-2 * 0.25 + c * 0.25, 2e-2 * 0.25 + c * 0.25]
+    perm = [5e-3 * 0.25 + 5e-3 * 0.5 * 0.25] * 2
+    expected = []
+    for i, q in enumerate((250, 100)):
+        mid, paid = 100.0, 0.0
+        for _ in range(4):
+            paid += q * (mid * (1 + temp[i]) + 0.01)
+            mid *= 1 + perm[i]
+        expected.append(paid - 100.0 * 4 * q)
+    np.testing.assert_allclose(ishort, expected, rtol=1e-12)
@@ -0,0 +1,90 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from functools import partial
+
+import numpy as np
+import pytest
+
+from agents.numpy_policy import NumpyPolicy, export_policy
+from envs.alloc_env import AllocationEnv
+from envs.exec_env import ExecutionEnv
+
+SMALL = {'net_arch': [16, 16]}
+
+
+def _prices(n_days=200, n_assets=3, seed=0):
+    rng = np.random.default_rng(seed)
+    log_ret = rng.normal(2e-4, 1e-2, size=(n_days, n_assets))
+    return 100.0 * np.exp(np.cumsum(log_ret, axis=0))
+
+
+def _model(algo):
+    from stable_baselines3 import PPO, SAC
+
+    if algo == 'ppo_discrete':
+        env_fn = partial(ExecutionEnv, {'steps': 20, 'seed': 0})
+        Algo = PPO
+    else:
+        env_fn = partial(AllocationEnv, _prices(), window=10)
+        Algo = SAC if algo == 'sac' else PPO
+    return Algo('MlpPolicy', env_fn(), policy_kwargs=SMALL, seed=0), env_fn
+
+
+def _vec_normalize(env_fn, seed=0):
+    from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+
+    norm = VecNormalize(DummyVecEnv([env_fn]), norm_reward=False)
+    norm.seed(seed)
+    norm.reset()
+    for _ in range(50):
+        norm.step(np.array([norm.action_space.sample()]))
+    return norm
+
+
+@pytest.mark.parametrize('normalize', [False, True])
+@pytest.mark.parametrize('algo', ['ppo_discrete', 'ppo_box', 'sac'])
+def test_numpy_policy_matches_predict(algo, normalize, tmp_path):
+    model, env_fn = _model(algo)
+    norm = _vec_normalize(env_fn) if normalize else None
+    path = export_policy(model, tmp_path / 'policy.npz', norm)
+    policy = NumpyPolicy(path, max_batch=8)
+
+    rng = np.random.default_rng(1)
+    obs = rng.normal(size=(64, *policy.obs_shape)).astype(np.float32)
+    ref = obs if norm is None else norm.normalize_obs(obs)
+    expected, _ = model.predict(ref, deterministic=True)
+    # a batch larger than `max_batch` and single observations
+    got, _ = policy.predict(obs)
+    single = np.stack([policy.predict(o)[0] for o in obs[:4]])
+    if algo == 'ppo_discrete':
+        np.testing.assert_array_equal(got, expected)
+        np.testing.assert_array_equal(single, expected[:4])
+    else:
+        np.testing.assert_allclose(got, expected, atol=1e-5)
+        np.testing.assert_allclose(single, expected[:4], atol=1e-5)
+
+
+def test_unsupported_layer_is_a_type_error():
+    from torch import nn
+
+    from agents.numpy_policy import _layers
+
+    with pytest.raises(TypeError, match='Sigmoid'):
+        _layers([nn.Linear(2, 2), nn.Sigmoid()])
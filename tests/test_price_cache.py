@@ -0,0 +1,168 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data import PriceCache
+from utils.fetch import FetchError, RateLimiter
+from utils.price_store import PriceStore, write_price_store
+
+TICKERS = ['AAA', 'BBB', 'CCC']
+
+
+@pytest.fixture(scope='module')
+def frame():
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range('2014-01-01', '2018-12-31')
+    log_ret = rng.normal(2e-4, 1e-2, size=(len(dates), len(TICKERS)))
+    return pd.DataFrame(
+        100.0 * np.exp(np.cumsum(log_ret, axis=0)),
+        index=dates,
+        columns=TICKERS,
+    )
+
+
+class FakeSource:
+    """Local stand-in for Yahoo that records every request."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = []
+
+    def __call__(self, ticker, start, end):
+        self.calls.append((ticker, start, end))
+        close = self.frame[ticker]
+        return close[(close.index >= start) & (close.index < end)]
+
+
+def _cache(root, downloader):
+    limiter = RateLimiter(rate=1e9, burst=len(TICKERS))
+    return PriceCache(
+        root=str(root), downloader=downloader, rate_limiter=limiter
+    )
+
+
+def _expected(frame, tickers, start, end):
+    out = frame.loc[(frame.index >= start) & (frame.index < end), tickers]
+    return out.rename_axis(None)
+
+
+def _assert_frame(got, expected):
+    pd.testing.assert_frame_equal(
+        got.rename_axis(None), expected, check_freq=False
+    )
+
+
+def test_cold_fill(tmp_path, frame):
+    source = FakeSource(frame)
+    got = _cache(tmp_path, source).load(
+        TICKERS[:2], '2015-01-01', '2017-01-01'
+    )
+    _assert_frame(
+        got, _expected(frame, TICKERS[:2], '2015-01-01', '2017-01-01')
+    )
+    assert sorted(source.calls) == [
+        ('AAA', '2015-01-01', '2017-01-01'),
+        ('BBB', '2015-01-01', '2017-01-01'),
+    ]
+    assert sorted(p.name for p in (tmp_path / 'AAA').glob('*.parquet')) == [
+        '2015.parquet',
+        '2016.parquet',
+    ]
+    cov = json.loads((tmp_path / 'AAA' / '_coverage.json').read_text())
+    assert cov == [['2015-01-01', '2017-01-01']]
+
+
+def test_incremental_extend(tmp_path, frame):
+    source = FakeSource(frame)
+    cache = _cache(tmp_path, source)
+    cache.load(TICKERS[:2], '2015-01-01', '2017-01-01')
+    source.calls.clear()
+    got = cache.load(TICKERS, '2014-06-01', '2018-01-01')
+    _assert_frame(got, _expected(frame, TICKERS, '2014-06-01', '2018-01-01'))
+    # cached tickers only fetch the uncovered ends, the new one everything
+    assert sorted(source.calls) == [
+        ('AAA', '2014-06-01', '2015-01-01'),
+        ('AAA', '2017-01-01', '2018-01-01'),
+        ('BBB', '2014-06-01', '2015-01-01'),
+        ('BBB', '2017-01-01', '2018-01-01'),
+        ('CCC', '2014-06-01', '2018-01-01'),
+    ]
+    source.calls.clear()
+    cache.load(TICKERS, '2015-01-01', '2016-01-01')
+    assert source.calls == []
+
+
+def test_reload_offline_into_memmapped_store(tmp_path, frame):
+    _cache(tmp_path / 'cache', FakeSource(frame)).load(
+        TICKERS, '2015-01-01', '2017-01-01'
+    )
+
+    def offline(ticker, start, end):
+        raise AssertionError(f'unexpected download of {ticker}')
+
+    got = _cache(tmp_path / 'cache', offline).load(
+        TICKERS, '2015-01-01', '2017-01-01'
+    )
+    expected = _expected(frame, TICKERS, '2015-01-01', '2017-01-01')
+    _assert_frame(got, expected)
+
+    write_price_store(tmp_path / 'store', got)
+    store = PriceStore(tmp_path / 'store')
+    assert isinstance(store.prices, np.memmap)
+    np.testing.assert_array_equal(store.prices, expected.to_numpy())
+    assert store.tickers == TICKERS
+    assert list(store.dates) == list(expected.index)
+
+
+@pytest.mark.parametrize('damage', ['corrupt', 'missing'])
+def test_bad_coverage_sidecar_refetches(tmp_path, frame, damage):
+    source = FakeSource(frame)
+    cache = _cache(tmp_path, source)
+    cache.load(['AAA'], '2015-01-01', '2016-01-01')
+    sidecar = tmp_path / 'AAA' / '_coverage.json'
+    if damage == 'corrupt':
+        sidecar.write_text('[["2015-01-01", "2016-')
+    else:
+        sidecar.unlink()
+    source.calls.clear()
+    got = cache.load(['AAA'], '2015-01-01', '2016-01-01')
+    _assert_frame(got, _expected(frame, ['AAA'], '2015-01-01', '2016-01-01'))
+    assert source.calls == [('AAA', '2015-01-01', '2016-01-01')]
+    assert json.loads(sidecar.read_text()) == [['2015-01-01', '2016-01-01']]
+
+
+def test_failed_ticker_keeps_the_others(tmp_path, frame):
+    source = FakeSource(frame)
+
+    def flaky(ticker, start, end):
+        if ticker == 'BBB':
+            raise KeyError(ticker)
+        return source(ticker, start, end)
+
+    with pytest.raises(FetchError) as exc:
+        _cache(tmp_path, flaky).load(TICKERS, '2015-01-01', '2016-01-01')
+    assert list(exc.value.failed) == ['BBB']
+    source.calls.clear()
+    _cache(tmp_path, source).load(TICKERS, '2015-01-01', '2016-01-01')
+    assert source.calls == [('BBB', '2015-01-01', '2016-01-01')]
@@ -0,0 +1,81 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from functools import partial
+
+import numpy as np
+import pytest
+
+from envs.alloc_env import AllocationEnv
+from envs.exec_env import ExecutionEnv
+from envs.recorder import TrajectoryRecorder, load_trajectories
+from eval.runner import run_episodes
+
+
+def _prices(n_days=200, n_assets=3, seed=0):
+    rng = np.random.default_rng(seed)
+    log_ret = rng.normal(2e-4, 1e-2, size=(n_days, n_assets))
+    return 100.0 * np.exp(np.cumsum(log_ret, axis=0))
+
+
+@pytest.mark.parametrize('suffix', ['.arrow', '.parquet'])
+def test_round_trip_across_chunks(suffix, tmp_path):
+    path = tmp_path / f'exec{suffix}'
+    # 20-step episodes in chunks of 7 rows: flushes land mid-episode
+    env = TrajectoryRecorder(ExecutionEnv({'steps': 20}), path, chunk_size=7)
+    rewards = []
+    for ep in range(3):
+        env.reset(seed=ep)
+        done = False
+        while not done:
+            _, r, done, _, _ = env.step(ep % 2 + 1)
+            rewards.append(r)
+    env.close()
+
+    df = load_trajectories(path).collect()
+    lengths = df.group_by('episode', maintain_order=True).len()['len']
+    assert df['episode'].to_list() == np.repeat([0, 1, 2], lengths).tolist()
+    assert df['step'].to_list() == [s for n in lengths for s in range(n)]
+    np.testing.assert_array_equal(df['reward'].to_numpy(), rewards)
+    assert env.rows == len(df) == len(rewards)
+    assert df['inventory'][-1] == 0
+
+
+def test_run_episodes_records_one_file_per_chunk(tmp_path):
+    from stable_baselines3 import PPO
+
+    env_fn = partial(
+        AllocationEnv, _prices(), random_start=True, episode_len=6
+    )
+    model = PPO('MlpPolicy', env_fn(), seed=0, device='cpu')
+    record = tmp_path / 'runs'
+    # 5 episodes in chunks of 2: the last chunk holds one episode
+    res = run_episodes(model, env_fn, 'alloc', 5, batch_size=2, record=record)
+    assert sorted(p.name for p in record.iterdir()) == [
+        'chunk_00000.arrow',
+        'chunk_00001.arrow',
+        'chunk_00002.arrow',
+    ]
+
+    df = load_trajectories(record).sort('episode', 'step').collect()
+    assert df['episode'].to_list() == np.repeat(range(5), 6).tolist()
+    assert df['step'].to_list() == list(range(6)) * 5
+    for ep, r in enumerate(res):
+        rewards = df.filter(df['episode'] == ep)['reward'].to_numpy()
+        np.testing.assert_allclose(rewards, r.episodes[0])
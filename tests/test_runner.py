@@ -0,0 +1,113 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+from functools import partial
+
+import numpy as np
+import pytest
+
+from envs.alloc_env import AllocationEnv
+from envs.exec_env import ExecutionEnv
+from envs.scenarios import PathBank
+from eval.runner import (
+    _merge,
+    episode_seeds,
+    evaluate_alloc_parallel,
+    evaluate_exec_parallel,
+    run_episodes,
+)
+
+EXEC_CFG = {'steps': 20, 'init_inventory': 1000, 'seed': 0}
+
+
+def _prices(n_days=400, n_assets=4, seed=0):
+    rng = np.random.default_rng(seed)
+    log_ret = rng.normal(2e-4, 1e-2, size=(n_days, n_assets))
+    return 100.0 * np.exp(np.cumsum(log_ret, axis=0))
+
+
+def _setup(kind, tmp_path):
+    if kind == 'exec':
+        # bank paths make the episodes depend on their reset seeds
+        bank = tmp_path / 'bank.npy'
+        PathBank.write(bank, 'gbm', 256, EXEC_CFG['steps'])
+        env_fn = partial(ExecutionEnv, {**EXEC_CFG, 'path_bank': str(bank)})
+    else:
+        env_fn = partial(
+            AllocationEnv, _prices(), random_start=True, episode_len=10
+        )
+    return env_fn
+
+
+@pytest.mark.parametrize('kind', ['exec', 'alloc'])
+def test_results_do_not_depend_on_n_workers(kind, tmp_path):
+    from stable_baselines3 import PPO
+
+    env_fn = _setup(kind, tmp_path)
+    model = PPO('MlpPolicy', env_fn(), seed=0, device='cpu')
+    # 7 episodes in chunks of 3: two full chunks and a short one
+    runs = {
+        n: run_episodes(model, env_fn, kind, 7, n_workers=n, batch_size=3)
+        for n in (1, 2)
+    }
+    assert len(runs[1]) == len(runs[2]) == 7
+    assert len({str(r.result()) for r in runs[1]}) == 7
+    for a, b in zip(runs[1], runs[2]):
+        assert a.result() == b.result()
+    assert _merge(runs[1]) == _merge(runs[2])
+
+
+def test_exec_ci_and_paired_twap(tmp_path):
+    from stable_baselines3 import PPO
+
+    from apps.sb3_ppo_exec import twap_shortfalls
+
+    env_fn = _setup('exec', tmp_path)
+    cfg = {'env': env_fn.args[0]}
+    model = PPO('MlpPolicy', env_fn(), seed=0, device='cpu')
+    seeds = episode_seeds(123, 6)
+    twap = twap_shortfalls(cfg, seeds)
+    stats = evaluate_exec_parallel(model, env_fn, 6, baseline=twap)
+    assert stats['IS_mean_lo'] <= stats['IS_mean'] <= stats['IS_mean_hi']
+    diff = stats['IS_mean'] - twap.mean()
+    np.testing.assert_allclose(stats['IS_diff'], diff, rtol=1e-9)
+    assert stats['IS_diff_lo'] <= stats['IS_diff'] <= stats['IS_diff_hi']
+    assert 0.0 <= stats['IS_p_value'] <= 1.0
+
+
+def test_alloc_cis_and_paired_ew(tmp_path):
+    from stable_baselines3 import PPO
+
+    from apps.sb3_sac_alloc import ew_rewards
+
+    env_fn = _setup('alloc', tmp_path)
+    model = PPO('MlpPolicy', env_fn(), seed=0, device='cpu')
+    res = run_episodes(model, env_fn, 'alloc', 4)
+    assert [len(r.episodes[0]) for r in res] == [10] * 4
+    ew = ew_rewards(env_fn, episode_seeds(123, 4))
+    stats = evaluate_alloc_parallel(model, env_fn, 4, baseline=ew)
+    for name in ('Sharpe', 'MaxDD'):
+        assert stats[f'{name}_lo'] <= stats[f'{name}_hi']
+    assert stats['MaxDD_hi'] <= 0.0
+    assert stats['Sharpe_diff_lo'] <= stats['Sharpe_diff_hi']
+    # an agent paired with itself differs by exactly zero
+    series = [r.episodes[0] for r in res]
+    same = evaluate_alloc_parallel(model, env_fn, 4, baseline=series)
+    assert same['Sharpe_diff'] == same['Sharpe_diff_lo'] == 0.0
+    assert same['Sharpe_p_value'] == 1.0
@@ -0,0 +1,64 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import shutil
+
+import numpy as np
+import pytest
+
+from envs.exec_env import ExecutionEnv
+from envs.scenarios import PathBank, generate_paths
+
+
+def test_exec_env_moves_mid_without_bank():
+    cfg = {'steps': 20, 'gbm_sigma': 0.02, 'seed': 0}
+    env = ExecutionEnv(cfg)
+    log_ret = []
+    for s in range(200):
+        env.reset(seed=s)
+        done = False
+        while not done:
+            mid = env.mid
+            _, _, done, _, _ = env.step(0)
+            log_ret.append(np.log(env.mid / mid))
+    np.testing.assert_allclose(np.std(log_ret), 0.02, rtol=0.1)
+    # a reset seed fixes the whole path
+    env.reset(seed=5)
+    path = env.path.copy()
+    env.reset(seed=6)
+    assert not np.array_equal(env.path, path)
+    env.reset(seed=5)
+    np.testing.assert_array_equal(env.path, path)
+
+
+def test_path_bank_round_trip(tmp_path):
+    bank = PathBank.write(tmp_path / 'bank.npy', 'gbm', 50, 10, seed=3)
+    np.testing.assert_array_equal(
+        bank.paths, generate_paths('gbm', 50, 10, seed=3)
+    )
+    assert bank.meta['n_paths'] == 50 and bank.steps == 10
+
+
+def test_path_bank_rejects_stale_meta(tmp_path):
+    PathBank.write(tmp_path / 'a.npy', 'gbm', 50, 10, seed=1)
+    PathBank.write(tmp_path / 'b.npy', 'gbm', 50, 10, seed=2)
+    # a reader between the two renames of a rewrite: new meta, old array
+    shutil.copy(tmp_path / 'b.json', tmp_path / 'a.json')
+    with pytest.raises(ValueError, match='does not match its meta'):
+        PathBank(tmp_path / 'a.npy', retries=2)
@@ -0,0 +1,77 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+
+import copy
+from pathlib import Path
+import tomllib
+
+import numpy as np
+
+from apps.sb3_ppo_exec import env_config, env_fn
+from apps.sweep import expand, set_key
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _points(sweep_path):
+    with (ROOT / sweep_path).open('rb') as f:
+        sweep = tomllib.load(f)
+    with (ROOT / sweep['base']).open('rb') as f:
+        base = tomllib.load(f)
+    cfgs = []
+    for point in expand(sweep):
+        cfg = copy.deepcopy(base)
+        for k, v in point.items():
+            set_key(cfg, k, v)
+        cfgs.append(cfg)
+    return cfgs
+
+
+def _return(cfg, seed=0):
+    env = env_fn(cfg)()
+    env.reset(seed=seed)
+    total, done = 0.0, False
+    while not done:
+        _, r, done, _, _ = env.step(1)
+        total += r
+    return total
+
+
+def test_exec_sweep_points_reach_the_env():
+    cfgs = _points('experiments/sweeps/exec_ablation.toml')
+    assert len(cfgs) == 18
+    env_cfgs = [env_config(cfg) for cfg in cfgs]
+    keys = {
+        (c['reward']['type'], c['gbm_sigma'], c['impact_coeff'])
+        for c in env_cfgs
+    }
+    assert len(keys) == len(cfgs)
+    # same actions and seed: every point changes the episode's return
+    returns = [_return(cfg) for cfg in cfgs]
+    assert len(np.unique(np.round(returns, 6))) == len(cfgs)
+
+
+def test_inventory_penalty_changes_exec_results():
+    cfgs = _points('experiments/sweeps/exec_ablation.toml')
+    plain, penalised = cfgs[0], cfgs[9]
+    assert plain['reward']['type'] == 'is_only'
+    assert penalised['reward']['type'] == 'is_plus_inv_pen'
+    assert plain['env'] == penalised['env']
+    assert _return(penalised) < _return(plain)
@@ -0,0 +1,157 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+import numpy as np
+import pytest
+
+from envs.alloc_env import AllocationEnv
+from envs.exec_env import ExecutionEnv
+from envs.scenarios import PathBank
+from envs.vec_alloc_env import VecAllocationEnv
+from envs.vec_exec_env import VecExecutionEnv
+
+EXEC_CFG = {'steps': 20, 'init_inventory': 1000, 'seed': 7}
+
+
+def _exec_episodes(cfg, n_envs, actions, seed=None):
+    """Per-lane episode returns of the vec env and of scalar envs.
+
+    Both sides see the same action sequence per lane; scalar env `i` has
+    the seed of lane `i` and is reset when that lane auto-resets.
+
+    """
+
+    venv = VecExecutionEnv(cfg, n_envs=n_envs)
+    envs = [
+        ExecutionEnv({**cfg, 'seed': cfg['seed'] + i}) for i in range(n_envs)
+    ]
+    if seed is not None:
+        venv.seed(seed)
+    venv.reset()
+    obs = np.stack(
+        [
+            env.reset(seed=None if seed is None else seed + i)[0]
+            for i, env in enumerate(envs)
+        ]
+    )
+    np.testing.assert_allclose(venv._observe(), obs)
+    vec_ret = [[] for _ in range(n_envs)]
+    ref_ret = [[] for _ in range(n_envs)]
+    vec_sum, ref_sum = np.zeros(n_envs), np.zeros(n_envs)
+    for a in actions:
+        _, rewards, dones, _ = venv.step(a)
+        for i, env in enumerate(envs):
+            _, r, done, _, _ = env.step(a[i])
+            assert done == dones[i]
+            vec_sum[i] += rewards[i]
+            ref_sum[i] += r
+            if done:
+                vec_ret[i].append(vec_sum[i])
+                ref_ret[i].append(ref_sum[i])
+                vec_sum[i] = ref_sum[i] = 0.0
+                env.reset()
+    return vec_ret, ref_ret
+
+
+def test_vec_exec_matches_scalar_per_lane():
+    n_envs = 8
+    actions = np.random.default_rng(0).integers(5, size=(200, n_envs))
+    vec_ret, ref_ret = _exec_episodes(EXEC_CFG, n_envs, actions)
+    for got, expected in zip(vec_ret, ref_ret):
+        assert len(got) == len(expected) > 0
+        np.testing.assert_allclose(got, expected, rtol=1e-5, atol=1e-3)
+
+
+def test_vec_exec_matches_scalar_with_inventory_penalty():
+    pen = {'type': 'is_plus_inv_pen', 'inv_penalty': 1e-4}
+    n_envs = 4
+    actions = np.random.default_rng(2).integers(5, size=(100, n_envs))
+    vec_ret, ref_ret = _exec_episodes(
+        {**EXEC_CFG, 'reward': pen}, n_envs, actions
+    )
+    plain, _ = _exec_episodes(EXEC_CFG, n_envs, actions)
+    for got, expected, base in zip(vec_ret, ref_ret, plain):
+        np.testing.assert_allclose(got, expected, rtol=1e-5, atol=1e-3)
+        assert all(np.less(got, base))
+
+
+@pytest.mark.parametrize('seed', [None, 11])
+def test_vec_exec_matches_scalar_on_path_bank(seed, tmp_path):
+    # every lane draws bank paths from its own seeded stream, like the env
+    PathBank.write(tmp_path / 'bank.npy', 'gbm', 64, EXEC_CFG['steps'])
+    cfg = {**EXEC_CFG, 'path_bank': str(tmp_path / 'bank.npy')}
+    n_envs = 4
+    actions = np.random.default_rng(1).integers(5, size=(300, n_envs))
+    vec_ret, ref_ret = _exec_episodes(cfg, n_envs, actions, seed)
+    for got, expected in zip(vec_ret, ref_ret):
+        assert len(expected) > 5
+        np.testing.assert_allclose(got, expected, rtol=1e-5, atol=1e-3)
+    # lanes see different paths
+    assert len({round(float(r[0]), 6) for r in ref_ret}) == n_envs
+
+
+def _prices(n_days=600, n_assets=5, seed=0):
+    rng = np.random.default_rng(seed)
+    log_ret = rng.normal(2e-4, 1e-2, size=(n_days, n_assets))
+    return 100.0 * np.exp(np.cumsum(log_ret, axis=0))
+
+
+def test_vec_alloc_matches_scalar_per_lane():
+    prices = _prices()
+    n_envs, episode_len = 6, 20
+    venv = VecAllocationEnv(
+        prices, n_envs=n_envs, episode_len=episode_len, seed=3
+    )
+    envs = [
+        AllocationEnv(prices, episode_len=episode_len) for _ in range(n_envs)
+    ]
+
+    def start(i):
+        # put scalar env i on the start date vec lane i drew
+        envs[i].reset()
+        envs[i].t = int(venv.t[i])
+        envs[i].t_end = envs[i].t + venv.k * episode_len
+        return envs[i]._observe()
+
+    obs = venv.reset()
+    np.testing.assert_array_equal(obs, [start(i) for i in range(n_envs)])
+    rng = np.random.default_rng(0)
+    n_episodes = 0
+    for _ in range(3 * episode_len):
+        a = rng.random((n_envs, prices.shape[1])).astype(np.float32)
+        obs, rewards, dones, infos = venv.step(a)
+        for i, env in enumerate(envs):
+            _, r, done, _, info = env.step(a[i].copy())
+            assert done == dones[i]
+            np.testing.assert_allclose(rewards[i], r, rtol=1e-5, atol=1e-7)
+            np.testing.assert_allclose(
+                infos[i]['turnover'], info['turnover'], rtol=1e-6
+            )
+            if done:
+                n_episodes += 1
+                np.testing.assert_array_equal(
+                    infos[i]['terminal_observation'], env._observe()
+                )
+                np.testing.assert_array_equal(obs[i], start(i))
+            else:
+                np.testing.assert_allclose(
+                    venv.equity[i], env.equity, rtol=1e-6
+                )
+                np.testing.assert_array_equal(obs[i], env._observe())
+    assert n_episodes == 3 * n_envs
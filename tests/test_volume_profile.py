@@ -0,0 +1,107 @@
+# ==============================================================================
+# rl-finlab: Reinforcement Learning Finance Experimentation
+# ==============================================================================
+# Copyright (C) 2025  Harish Naik
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU LesserGeneral Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/lgpl-3.0.html>.
+# ==============================================================================
+
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.volume_profile import VolumeProfileIndex, bucket_daily_volume
+
+STEPS = 13  # 30-minute bins over the 390-minute session
+
+
+def _bars(path, days, seed=0):
+    """Minute bars from 09:00 to 16:29, so some fall outside the session."""
+
+    rng = np.random.default_rng(seed)
+    frames = []
+    for day in days:
+        ts = pd.date_range(f'{day} 09:00', f'{day} 16:29', freq='min')
+        frames.append(
+            pd.DataFrame(
+                {'timestamp': ts, 'volume': rng.integers(1, 100, len(ts))}
+            )
+        )
+    bars = pd.concat(frames, ignore_index=True)
+    bars.to_csv(path, index=False)
+    return bars
+
+
+def _expected(bars, day):
+    ts = bars['timestamp']
+    minute = ts.dt.hour * 60 + ts.dt.minute - 570
+    keep = (ts.dt.normalize() == day) & (minute >= 0) & (minute < 390)
+    return np.bincount(
+        minute[keep] // 30, weights=bars['volume'][keep], minlength=STEPS
+    )
+
+
+def test_bucketing_sums_session_minutes(tmp_path):
+    days = ['2024-01-02', '2024-01-03']
+    bars = _bars(tmp_path / 'AAA.csv', days)
+    # small chunks split days across chunks
+    daily = bucket_daily_volume(
+        [tmp_path / 'AAA.csv'], steps=STEPS, chunksize=97
+    )
+    assert sorted(daily) == ['AAA']
+    assert sorted(daily['AAA']) == days
+    for day in days:
+        np.testing.assert_allclose(daily['AAA'][day], _expected(bars, day))
+
+
+def test_profiles_are_normalized_quantiles(tmp_path):
+    days = [
+        d.strftime('%Y-%m-%d')
+        for d in pd.bdate_range('2024-01-02', periods=40)
+    ]
+    bars = _bars(tmp_path / 'AAA.csv', days)
+    index = VolumeProfileIndex(tmp_path / 'index', steps=STEPS)
+    index.ingest([tmp_path / 'AAA.csv'], chunksize=5000)
+    rows = np.stack([_expected(bars, d) for d in days])
+    rows /= rows.sum(axis=1, keepdims=True)
+    ranked = np.sort(rows, axis=0)
+    table = np.load(tmp_path / 'index' / 'AAA' / 'profile.npy')
+    for i, q in enumerate(index.quantiles):
+        exact = ranked[int(q * (len(days) - 1))]
+        np.testing.assert_allclose(table[i], exact, rtol=index.alpha)
+        profile = index.profile('AAA', q)
+        assert profile.shape == (STEPS,)
+        assert profile.sum() == pytest.approx(1.0)
+
+
+def test_reingest_is_idempotent(tmp_path):
+    days = ['2024-01-02', '2024-01-03', '2024-01-04']
+    _bars(tmp_path / 'AAA.csv', days)
+    index = VolumeProfileIndex(tmp_path / 'index', steps=STEPS)
+    index.ingest([tmp_path / 'AAA.csv'])
+    state = (tmp_path / 'index' / 'AAA' / 'sketch.json').read_text()
+    median = index.profile('AAA').copy()
+
+    index.ingest([tmp_path / 'AAA.csv'])
+    fresh = VolumeProfileIndex(tmp_path / 'index', steps=STEPS)
+    assert (tmp_path / 'index' / 'AAA' / 'sketch.json').read_text() == state
+    np.testing.assert_array_equal(fresh.profile('AAA'), median)
+    assert all(sk.n == 3 for sk in fresh.sketches('AAA'))
+
+    # a new day is added on top of the old ones
+    _bars(tmp_path / 'AAA.csv', ['2024-01-05'], seed=1)
+    fresh.ingest([tmp_path / 'AAA.csv'])
+    assert fresh.dates('AAA') == days + ['2024-01-05']
+    assert all(sk.n == 4 for sk in fresh.sketches('AAA'))